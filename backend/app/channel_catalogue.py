@@ -0,0 +1,190 @@
+"""
+Local catalogue of channel uploads seen by highlight discovery.
+
+Every video the RSS poller and the uploads-playlist scans come across is stored
+in channel_videos, not only the ones that matched the fixture being searched
+for. Re-matching (a match that finished late, a renamed team, the missing
+highlights retries) then starts with find_catalogued_highlights(), a local
+query on the published_at and title trigram indexes, and only goes to YouTube
+when the catalogue has nothing.
+"""
+import unicodedata
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import is_postgres
+from .highlight_store import highlight_row, insert_highlights, parse_published_at
+
+
+HIGHLIGHT_KEYWORDS = ('highlight', 'extended', 'recap', 'goals', 'summary', 'resumen', 'résumé', 'zusammenfassung')
+
+# Highlights are uploaded from kick-off day up to a few days later
+MATCH_WINDOW_DAYS = 3
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase and strip accents, the same way YouTubeService matches team names"""
+    decomposed = unicodedata.normalize('NFD', (title or '').lower())
+    return ''.join(c for c in decomposed if unicodedata.category(c) != 'Mn')
+
+
+def _catalogue_row(video: Dict, source: str) -> Optional[Dict]:
+    video_id = video.get('youtube_video_id') or video.get('video_id')
+    if not video_id or not video.get('title'):
+        return None
+    return {
+        'youtube_video_id': video_id,
+        'channel_id': video.get('channel_id'),
+        'channel_title': video.get('channel_title'),
+        'title': video['title'][:500],
+        'normalized_title': normalize_title(video['title'])[:500],
+        'description': video.get('description'),
+        'thumbnail_url': video.get('thumbnail_url'),
+        'published_at': parse_published_at(video.get('published_at')),
+        'duration': video.get('duration'),
+        'blocked_countries': video.get('blocked_countries'),
+        'allowed_countries': video.get('allowed_countries'),
+        'source': source,
+    }
+
+
+def record_channel_videos(db: Session, videos: Iterable[Dict], source: str) -> int:
+    """
+    Upsert feed or playlist entries into channel_videos.
+
+    Accepts both the RSS shape (youtube_video_id) and the YouTubeService shape
+    (video_id). Fields missing from this sighting (e.g. duration, which only
+    enriched results carry) keep their stored values. Returns rows written.
+    """
+    rows = {}
+    for video in videos:
+        row = _catalogue_row(video, source)
+        if row:
+            rows[row['youtube_video_id']] = row
+    if not rows:
+        return 0
+
+    if is_postgres(db):
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    table = models.ChannelVideo.__table__
+    statement = insert(table).values(list(rows.values()))
+    keep_existing = ('channel_id', 'channel_title', 'description', 'thumbnail_url', 'published_at',
+                     'duration', 'blocked_countries', 'allowed_countries')
+    statement = statement.on_conflict_do_update(
+        index_elements=['youtube_video_id'],
+        set_={
+            'title': statement.excluded.title,
+            'normalized_title': statement.excluded.normalized_title,
+            'updated_at': func.now(),
+            **{
+                column: func.coalesce(getattr(statement.excluded, column), table.c[column])
+                for column in keep_existing
+            },
+        },
+    )
+    db.execute(statement)
+    db.commit()
+    return len(rows)
+
+
+def catalogue_videos(videos: Iterable[Dict], source: str):
+    """record_channel_videos() with its own session, for services that don't hold one"""
+    from .database import SessionLocal
+    db = SessionLocal()
+    try:
+        record_channel_videos(db, videos, source)
+    except Exception as e:
+        db.rollback()
+        print(f"[Catalogue] Could not store {source} videos: {e}")
+    finally:
+        db.close()
+
+
+def find_catalogued_highlights(
+    db: Session,
+    home_team: str,
+    away_team: str,
+    match_date: date,
+    limit: int = 5,
+) -> List[Dict]:
+    """
+    Highlight videos for a match from the local catalogue, newest first, in the
+    same shape as YouTubeService.search_highlights results.
+
+    Candidates are uploads from match day to MATCH_WINDOW_DAYS later whose title
+    mentions any accepted spelling of either team (trigram-indexed LIKE on Postgres);
+    they are then held to the same strict both-teams check as playlist scans.
+    """
+    from .youtube_service import get_youtube_service
+    youtube_service = get_youtube_service()
+
+    home_unique = youtube_service._get_unique_team_identifier(home_team)
+    away_unique = youtube_service._get_unique_team_identifier(away_team)
+    window_start = datetime.combine(match_date, datetime.min.time())
+
+    # Every spelling _team_matches_title accepts (full name, alternates, unique
+    # identifier), so the prefilter never drops a title the strict check would pass
+    terms = (youtube_service.title_terms(home_team, home_unique)
+             + youtube_service.title_terms(away_team, away_unique))
+    candidates = db.query(models.ChannelVideo).filter(
+        models.ChannelVideo.published_at >= window_start,
+        models.ChannelVideo.published_at < window_start + timedelta(days=MATCH_WINDOW_DAYS),
+        or_(*(models.ChannelVideo.normalized_title.like(f"%{term}%") for term in terms)),
+    ).order_by(models.ChannelVideo.published_at.desc()).limit(200).all()
+
+    videos = []
+    for row in candidates:
+        if not any(keyword in row.normalized_title for keyword in HIGHLIGHT_KEYWORDS):
+            continue
+        if not (youtube_service._team_matches_title(home_team, home_unique, row.normalized_title)
+                and youtube_service._team_matches_title(away_team, away_unique, row.normalized_title)):
+            continue
+        videos.append({
+            'video_id': row.youtube_video_id,
+            'title': row.title,
+            'description': row.description or '',
+            'thumbnail_url': row.thumbnail_url,
+            'channel_title': row.channel_title,
+            'published_at': row.published_at,
+            'view_count': None,
+            'duration': row.duration,
+            'is_geo_blocked': bool(row.blocked_countries or row.allowed_countries),
+            'blocked_countries': row.blocked_countries or [],
+            'allowed_countries': row.allowed_countries or [],
+        })
+        if len(videos) >= limit:
+            break
+    return videos
+
+
+def rematch_highlights_from_catalogue(db: Session, days: int = 7) -> Dict:
+    """
+    Attach catalogued highlights to finished matches from the last `days` days
+    that have none. Purely local: no quota or network is used.
+    """
+    since = date.today() - timedelta(days=days)
+    matches = db.query(models.Match).filter(
+        models.Match.match_date >= since,
+        models.Match.status == 'finished',
+        models.Match.highlight_count == 0
+    ).all()
+
+    rows, added = [], []
+    for match in matches:
+        videos = find_catalogued_highlights(db, match.home_team, match.away_team, match.match_date, limit=1)
+        if not videos:
+            continue
+        video = videos[0]
+        rows.append(highlight_row(match.id, video))
+        added.append({"match_id": match.id, "video_id": video['video_id'], "title": video['title']})
+    insert_highlights(db, rows)
+
+    print(f"[Catalogue] Re-matched {len(added)}/{len(matches)} matches without highlights")
+    return {"matches_checked": len(matches), "highlights_added": len(added), "details": added}
@@ -18,14 +18,32 @@ class Settings(BaseSettings):
     smtp_user: str = ""  # Your email address
     smtp_password: str = ""  # App password (not regular password)
     notification_email: str = ""  # Email to receive notifications
+    smtp_security: str = "starttls"  # 'starttls', 'ssl', or 'none' for a local stand-in such as aiosmtpd
+    
+    # WebSub push for YouTube channel uploads; RSS polling is the fallback.
+    # Public URL of /api/websub/callback - leave empty to disable.
+    websub_callback_url: str = ""
+    websub_hub_url: str = "https://pubsubhubbub.appspot.com/subscribe"
+    
+    # Expo push service for the mobile app; point at a local stub to test
+    expo_push_url: str = "https://exp.host/--/api/v2/push/send"
+    expo_receipts_url: str = "https://exp.host/--/api/v2/push/getReceipts"
+    expo_access_token: str = ""  # Only needed if enhanced push security is enabled
     
     def get_youtube_keys_list(self) -> List[str]:
         """Parse comma-separated YouTube API keys"""
         return [key.strip() for key in self.youtube_api_keys.split(',') if key.strip()]
     
+    def websub_enabled(self) -> bool:
+        return bool(self.websub_callback_url)
+    
     def email_configured(self) -> bool:
         """Check if email notifications are properly configured"""
         return bool(self.smtp_user and self.smtp_password and self.notification_email)
+    
+    def smtp_configured(self) -> bool:
+        """Check if user notification emails can be sent (no admin recipient needed)"""
+        return bool(self.smtp_user and (self.smtp_password or self.smtp_security == "none"))
 
 
 # Teams of interest by league - only fetch highlights for matches involving these teams
@@ -82,6 +100,35 @@ CUP_TO_LEAGUE_MAPPING: Dict[str, str] = {
     "Coppa Italia": "Serie A",
 }
 
+# Other names the data sources use for a team, by canonical name (see app/teams.py).
+# Case, accents and punctuation are ignored when matching, so only list real variants.
+TEAM_ALIASES: Dict[str, Set[str]] = {
+    "Arsenal": {"Arsenal FC"},
+    "Chelsea": {"Chelsea FC"},
+    "Liverpool": {"Liverpool FC"},
+    "Manchester City": {"Man City", "Manchester City FC"},
+    "Manchester United": {"Man United", "Man Utd", "Manchester Utd", "Manchester United FC"},
+    "Tottenham Hotspur": {"Tottenham", "Spurs", "Tottenham Hotspur FC"},
+    "Newcastle United": {"Newcastle", "Newcastle United FC"},
+    "West Ham United": {"West Ham", "West Ham United FC"},
+    "Wolverhampton Wanderers": {"Wolves", "Wolverhampton"},
+    "Brighton & Hove Albion": {"Brighton", "Brighton and Hove Albion"},
+    "Nottingham Forest": {"Nott'm Forest", "Nottm Forest"},
+    "Real Madrid": {"Real Madrid CF"},
+    "Barcelona": {"FC Barcelona", "Barça"},
+    "Atlético Madrid": {"Atlético de Madrid", "Club Atlético de Madrid", "Atleti"},
+    "Villarreal": {"Villarreal CF"},
+    "Paris Saint-Germain": {"PSG", "Paris SG", "Paris Saint-Germain FC"},
+    "Bayern Munich": {"Bayern München", "FC Bayern München", "Bayern"},
+    "Borussia Dortmund": {"Dortmund", "BVB"},
+    "Bayer Leverkusen": {"Bayer 04 Leverkusen", "Leverkusen"},
+    "Juventus": {"Juventus FC", "Juve"},
+    "Inter Milan": {"Internazionale", "Inter", "FC Internazionale Milano"},
+    "AC Milan": {"Milan"},
+    "AS Roma": {"Roma"},
+    "Napoli": {"SSC Napoli"},
+}
+
 # DEV MODE: Set to True to only process configured leagues (block all others)
 DEV_MODE_STRICT = False
 
@@ -1,7 +1,8 @@
-import httpx
 from datetime import date, datetime, timedelta
 from typing import List, Dict, Optional
 
+from .upstream_guard import guarded_client
+
 
 class CricketAPI:
     """
@@ -19,7 +20,7 @@ class CricketAPI:
     async def get_ipl_matches(self, target_date: Optional[date] = None) -> List[Dict]:
         """Fetch IPL matches for a specific date or upcoming matches"""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with guarded_client(timeout=30.0) as client:
                 # Get upcoming matches
                 url = f"{self.BASE_URL}/matches"
                 params = {
@@ -46,7 +47,7 @@ class CricketAPI:
     async def get_ipl_match_details(self, match_id: str) -> Optional[Dict]:
         """Fetch detailed information about a specific IPL match"""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with guarded_client(timeout=30.0) as client:
                 url = f"{self.BASE_URL}/match_info"
                 params = {
                     "apikey": self.api_key,
@@ -25,6 +25,11 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def is_postgres(db) -> bool:
+    """Whether a session is bound to PostgreSQL (as opposed to local SQLite)"""
+    return db.get_bind().dialect.name == "postgresql"
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -0,0 +1,179 @@
+"""
+Pooled SMTP delivery for the task worker.
+
+email_service opens a new blocking SMTP connection per email, which is fine for
+the daily admin alert but not for user notifications. EmailSender keeps one
+authenticated connection open for the life of the worker process and sends
+whole batches over it. smtplib calls run in a worker thread behind a lock, so
+async jobs never block the event loop and the connection is never used by two
+batches at once.
+
+Failures are classified the way SMTP reports them:
+
+- 4xx replies, dropped connections and socket errors are transient: the
+  message is retried with backoff, up to max_attempts, on a new connection if
+  the old one dropped;
+- 5xx replies (unknown mailbox, rejected sender) are permanent and not retried.
+
+Set SMTP_SECURITY=none with SMTP_HOST/SMTP_PORT pointing at a local stand-in
+(e.g. `python -m aiosmtpd -n -l localhost:8025`) to exercise it end to end.
+"""
+import asyncio
+import smtplib
+import threading
+import time
+from email.message import Message
+from typing import Dict, Hashable, Optional, Tuple
+
+from .config import get_settings
+
+RETRY_BASE_SECONDS = 2.0
+# Reconnect rather than reuse a connection idle for longer than servers usually keep them
+IDLE_RECONNECT_SECONDS = 60
+
+
+class TransientEmailError(Exception):
+    pass
+
+
+class PermanentEmailError(Exception):
+    pass
+
+
+def _classify(error: Exception) -> Exception:
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        if codes and all(500 <= code < 600 for code in codes):
+            return PermanentEmailError(str(error))
+        return TransientEmailError(str(error))
+    if isinstance(error, smtplib.SMTPResponseException) and 500 <= error.smtp_code < 600:
+        return PermanentEmailError(f"{error.smtp_code} {error.smtp_error!r}")
+    return TransientEmailError(str(error))
+
+
+class EmailSender:
+    """One persistent SMTP connection shared by every delivery in the process"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str = "",
+        password: str = "",
+        security: str = "starttls",
+        timeout: float = 30,
+        max_attempts: int = 3,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.security = security
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._server_lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.security == "ssl":
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.security == "starttls":
+                server.starttls()
+        if self.user and self.password:
+            server.login(self.user, self.password)
+        return server
+
+    def _reset(self):
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                server.close()
+
+    def _send_batch_sync(self, messages: Dict[Hashable, Message]) -> Dict[Hashable, Optional[Exception]]:
+        """Send over the shared connection. Returns key -> None (sent) or the classified error."""
+        results = {}
+        with self._server_lock:
+            if self._server is not None and time.monotonic() - self._last_used > IDLE_RECONNECT_SECONDS:
+                self._reset()
+            for key, message in messages.items():
+                try:
+                    if self._server is None:
+                        self._server = self._connect()
+                    self._server.send_message(message)
+                    results[key] = None
+                except Exception as e:
+                    results[key] = _classify(e)
+                    if self._server is not None and isinstance(
+                        e, (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException)
+                    ):
+                        # The server answered: abandon this transaction, keep the connection
+                        try:
+                            self._server.rset()
+                            continue
+                        except Exception:
+                            pass
+                    # The connection may be unusable; open a new one for the next message
+                    self._reset()
+            self._last_used = time.monotonic()
+        return results
+
+    async def send_batch(self, messages: Dict[Hashable, Message]) -> Tuple[list, Dict[Hashable, Exception]]:
+        """
+        Send messages keyed by caller ids (e.g. notification ids), retrying
+        transient failures with backoff. Returns (sent keys, key -> error).
+        """
+        sent = []
+        failed: Dict[Hashable, Exception] = {}
+        pending = dict(messages)
+        for attempt in range(1, self.max_attempts + 1):
+            results = await asyncio.to_thread(self._send_batch_sync, pending)
+
+            retry = {}
+            for key, error in results.items():
+                if error is None:
+                    sent.append(key)
+                    failed.pop(key, None)
+                else:
+                    failed[key] = error
+                    if isinstance(error, TransientEmailError):
+                        retry[key] = pending[key]
+            if not retry or attempt == self.max_attempts:
+                break
+            delay = RETRY_BASE_SECONDS * (2 ** (attempt - 1))
+            print(f"[Email] {len(retry)} messages failed transiently, retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            pending = retry
+        return sent, failed
+
+    async def send(self, message: Message):
+        """Send one message, raising TransientEmailError / PermanentEmailError on failure"""
+        _, failed = await self.send_batch({0: message})
+        if failed:
+            raise failed[0]
+
+    def close(self):
+        with self._server_lock:
+            self._reset()
+
+
+_email_sender: Optional[EmailSender] = None
+
+
+def get_email_sender() -> EmailSender:
+    """Get the process-wide sender, configured from settings"""
+    global _email_sender
+    if _email_sender is None:
+        settings = get_settings()
+        _email_sender = EmailSender(
+            settings.smtp_host,
+            settings.smtp_port,
+            user=settings.smtp_user,
+            password=settings.smtp_password,
+            security=settings.smtp_security,
+        )
+    return _email_sender
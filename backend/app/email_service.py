@@ -1,5 +1,5 @@
 """
-Email notification service for missing highlights alerts.
+Email notification service for missing highlights alerts and user notifications.
 """
 import smtplib
 from email.mime.text import MIMEText
@@ -11,6 +11,22 @@ from .config import get_settings
 settings = get_settings()
 
 
+def _send_message(msg):
+    """Send one message over a fresh SMTP connection"""
+    try:
+        # Try TLS on port 587 first
+        with smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=30) as server:
+            server.starttls()
+            server.login(settings.smtp_user, settings.smtp_password)
+            server.send_message(msg)
+    except Exception as e:
+        # Fallback to SSL on port 465
+        print(f"[Email] TLS failed ({e}), trying SSL...")
+        with smtplib.SMTP_SSL(settings.smtp_host, 465, timeout=30) as server:
+            server.login(settings.smtp_user, settings.smtp_password)
+            server.send_message(msg)
+
+
 def send_missing_highlights_notification(missing_matches: List[Dict]) -> bool:
     """
     Send email notification about matches missing highlights.
@@ -107,19 +123,7 @@ VALUES (&lt;match_id&gt;, '&lt;video_id&gt;', '&lt;title&gt;', '&lt;channel&gt;'
         msg.attach(MIMEText(text_body, 'plain'))
         msg.attach(MIMEText(html_body, 'html'))
         
-        # Send email
-        try:
-            # Try TLS on port 587 first
-            with smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=30) as server:
-                server.starttls()
-                server.login(settings.smtp_user, settings.smtp_password)
-                server.send_message(msg)
-        except Exception as e:
-            # Fallback to SSL on port 465
-            print(f"[Email] TLS failed ({e}), trying SSL...")
-            with smtplib.SMTP_SSL(settings.smtp_host, 465, timeout=30) as server:
-                server.login(settings.smtp_user, settings.smtp_password)
-                server.send_message(msg)
+        _send_message(msg)
         
         print(f"[Email] Sent missing highlights notification for {len(missing_matches)} matches")
         return True
@@ -127,3 +131,12 @@ VALUES (&lt;match_id&gt;, '&lt;video_id&gt;', '&lt;title&gt;', '&lt;channel&gt;'
     except Exception as e:
         print(f"[Email] Failed to send notification: {e}")
         return False
+
+
+def build_notification_email(to_address: str, subject: str, text_body: str) -> MIMEText:
+    """Plain text email for a user notification, sent by app.email_delivery"""
+    msg = MIMEText(text_body, 'plain')
+    msg['Subject'] = subject
+    msg['From'] = settings.smtp_user
+    msg['To'] = to_address
+    return msg
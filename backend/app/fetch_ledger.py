@@ -0,0 +1,109 @@
+"""
+Per-(league, date) fetch ledger and freshness policy for ESPN scoreboards.
+
+Every scoreboard fetch records when it happened, the response's ETag,
+Last-Modified and body hash (for conditional requests) and whether all of its
+events were final. Callers ask stale_league_slugs() which league-days are
+worth re-fetching instead of re-fetching every league for a date: finished
+league-days are never fetched again, and the rest are refreshed on an age
+limit that tightens as the date gets closer (so a cup tie ESPN publishes late
+is still picked up within hours).
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .football_api import Scoreboard
+
+# Days ahead (including today) the prefetch_matches task keeps fresh
+PREFETCH_DAYS = 7
+
+
+def max_age(fetch_date: date, today: date, entry: models.LeagueFetch) -> Optional[timedelta]:
+    """How long a ledger entry stays fresh; None means it never goes stale"""
+    if entry.all_final and fetch_date < today:
+        return None
+    if fetch_date < today:
+        # Past league-day still showing unfinished events (late or postponed)
+        return timedelta(hours=1)
+    if fetch_date == today:
+        return timedelta(minutes=30)
+    if fetch_date <= today + timedelta(days=2):
+        return timedelta(hours=3)
+    return timedelta(hours=12)
+
+
+def ledger_entries(db: Session, fetch_date: date, league_slugs: Iterable[str]) -> Dict[str, models.LeagueFetch]:
+    """Ledger rows for a date by league slug (also the `previous` validators for get_scoreboards)"""
+    return {
+        entry.league_slug: entry
+        for entry in db.query(models.LeagueFetch).filter(
+            models.LeagueFetch.fetch_date == fetch_date,
+            models.LeagueFetch.league_slug.in_(list(league_slugs))
+        )
+    }
+
+
+def stale_league_slugs(
+    db: Session,
+    fetch_date: date,
+    league_slugs: Iterable[str],
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """ESPN league slugs whose scoreboard for fetch_date should be (re)fetched"""
+    now = now or datetime.utcnow()
+    today = date.today()
+    league_slugs = list(league_slugs)
+    entries = ledger_entries(db, fetch_date, league_slugs)
+
+    stale = []
+    for slug in league_slugs:
+        entry = entries.get(slug)
+        if entry is None:
+            stale.append(slug)
+            continue
+        limit = max_age(fetch_date, today, entry)
+        if limit is not None and now - entry.fetched_at >= limit:
+            stale.append(slug)
+    return stale
+
+
+def record_league_fetch(
+    db: Session,
+    league_slug: str,
+    fetch_date: date,
+    scoreboard: Scoreboard,
+    entry: Optional[models.LeagueFetch] = None,
+) -> models.LeagueFetch:
+    """
+    Upsert the ledger entry after a successful scoreboard fetch (caller commits).
+
+    An unchanged scoreboard only refreshes fetched_at and the validators.
+    """
+    if entry is None:
+        entry = db.query(models.LeagueFetch).filter(
+            models.LeagueFetch.league_slug == league_slug,
+            models.LeagueFetch.fetch_date == fetch_date
+        ).first()
+    if entry is None:
+        entry = models.LeagueFetch(league_slug=league_slug, fetch_date=fetch_date)
+        db.add(entry)
+
+    entry.fetched_at = datetime.utcnow()
+    entry.etag = scoreboard.etag
+    entry.last_modified = scoreboard.last_modified
+    entry.payload_hash = scoreboard.payload_hash
+    if not scoreboard.not_modified:
+        matches = scoreboard.matches
+        entry.event_count = len(matches)
+        # Failed requests are never recorded, so an empty scoreboard is a real
+        # "no matches" and counts as final once the date has passed
+        entry.all_final = all(m["status"] == "finished" for m in matches)
+    return entry
+
+
+def prune_ledger(db: Session, before: date) -> int:
+    """Delete ledger entries for dates before `before` (caller commits)"""
+    return db.query(models.LeagueFetch).filter(models.LeagueFetch.fetch_date < before).delete()
@@ -1,6 +1,30 @@
+import hashlib
 import httpx
 from datetime import date, datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, List, Optional
+
+from .upstream_guard import guarded_client
+
+
+class Scoreboard:
+    """
+    One league's scoreboard for a date.
+    
+    matches is None when the scoreboard is unchanged since the previous fetch
+    (HTTP 304 or an identical body); etag, last_modified and payload_hash are
+    the validators to send with the next request.
+    """
+    
+    def __init__(self, matches: Optional[List[Dict]], etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, payload_hash: Optional[str] = None):
+        self.matches = matches
+        self.etag = etag
+        self.last_modified = last_modified
+        self.payload_hash = payload_hash
+    
+    @property
+    def not_modified(self) -> bool:
+        return self.matches is None
 
 
 class ESPNFootballAPI:
@@ -42,40 +66,100 @@ class ESPNFootballAPI:
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"
         }
     
-    async def get_matches_for_date(self, target_date: date) -> Dict[str, List[Dict]]:
-        """Fetch all matches for a specific date across all major leagues"""
-        date_str = target_date.strftime("%Y%m%d")
-        all_fixtures = {}
+    async def get_matches_for_date(self, target_date: date, league_slugs: Optional[Iterable[str]] = None) -> Dict[str, List[Dict]]:
+        """Fetch all matches for a specific date across all major leagues (or only league_slugs)"""
+        scoreboards = await self.get_scoreboards(target_date, league_slugs)
+        return {
+            self.LEAGUES[league_slug]: scoreboard.matches
+            for league_slug, scoreboard in scoreboards.items()
+            if scoreboard and scoreboard.matches
+        }
+    
+    async def get_scoreboards(
+        self,
+        target_date: date,
+        league_slugs: Optional[Iterable[str]] = None,
+        previous: Optional[Dict[str, object]] = None,
+    ) -> Dict[str, Optional["Scoreboard"]]:
+        """
+        Fetch league scoreboards for a date, keyed by ESPN league slug.
+        
+        Args:
+            target_date: Date to fetch
+            league_slugs: ESPN league slugs (default: all LEAGUES)
+            previous: Per-slug result of the last fetch (anything with etag,
+                last_modified and payload_hash, e.g. a fetch ledger row). Used
+                for conditional requests; unchanged scoreboards come back with
+                not_modified set and are not parsed.
+        
+        Returns:
+            A Scoreboard per league, or None when the request failed - callers
+            must not treat a failure as "no matches".
+        """
+        previous = previous or {}
+        scoreboards = {}
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for league_slug, league_name in self.LEAGUES.items():
+        async with guarded_client(timeout=30.0) as client:
+            for league_slug in (league_slugs if league_slugs is not None else self.LEAGUES):
                 try:
-                    response = await client.get(
-                        f"{self.BASE_URL}/{league_slug}/scoreboard",
-                        headers=self.headers,
-                        params={"dates": date_str}
+                    scoreboards[league_slug] = await self._fetch_scoreboard(
+                        client, league_slug, target_date, previous.get(league_slug)
                     )
-                    
-                    if response.status_code != 200:
-                        continue
-                    
-                    data = response.json()
-                    events = data.get("events", [])
-                    
-                    if events:
-                        matches = []
-                        for event in events:
-                            parsed = self._parse_espn_event(event, target_date)
-                            if parsed:
-                                matches.append(parsed)
-                        if matches:
-                            all_fixtures[league_name] = matches
-                
                 except Exception as e:
-                    print(f"ESPN API error for {league_name}: {e}")
-                    continue
+                    print(f"ESPN API error for {self.LEAGUES.get(league_slug, league_slug)}: {e}")
+                    scoreboards[league_slug] = None
         
-        return all_fixtures
+        return scoreboards
+    
+    @classmethod
+    def league_slug_for(cls, league_name: str) -> Optional[str]:
+        """ESPN slug for one of our league names, or None if it isn't tracked here"""
+        return next((slug for slug, name in cls.LEAGUES.items() if name == league_name), None)
+    
+    async def _fetch_scoreboard(
+        self,
+        client: httpx.AsyncClient,
+        league_slug: str,
+        target_date: date,
+        previous: Optional[object] = None,
+    ) -> Optional["Scoreboard"]:
+        headers = dict(self.headers)
+        if previous is not None:
+            if getattr(previous, "etag", None):
+                headers["If-None-Match"] = previous.etag
+            if getattr(previous, "last_modified", None):
+                headers["If-Modified-Since"] = previous.last_modified
+        
+        response = await client.get(
+            f"{self.BASE_URL}/{league_slug}/scoreboard",
+            headers=headers,
+            params={"dates": target_date.strftime("%Y%m%d")}
+        )
+        
+        if response.status_code == 304 and previous is not None:
+            return Scoreboard(
+                None,
+                etag=response.headers.get("etag") or previous.etag,
+                last_modified=response.headers.get("last-modified") or previous.last_modified,
+                payload_hash=previous.payload_hash,
+            )
+        
+        if response.status_code != 200:
+            return None
+        
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        # Most polls return byte-identical JSON: skip parsing when the body is unchanged
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if previous is not None and content_hash == getattr(previous, "payload_hash", None):
+            return Scoreboard(None, etag=etag, last_modified=last_modified, payload_hash=content_hash)
+        
+        matches = []
+        for event in response.json().get("events", []):
+            parsed = self._parse_espn_event(event, target_date)
+            if parsed:
+                matches.append(parsed)
+        return Scoreboard(matches, etag=etag, last_modified=last_modified, payload_hash=content_hash)
     
     async def get_matches_for_date_range(self, start_date: date, days: int = 4) -> Dict[date, Dict[str, List[Dict]]]:
         """Fetch matches for a range of dates"""
@@ -162,7 +246,7 @@ class ESPNFootballAPI:
     async def get_standings(self, league_slug: str) -> Optional[Dict]:
         """Fetch standings for a specific league"""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            async with guarded_client(timeout=30.0) as client:
                 response = await client.get(
                     f"https://site.api.espn.com/apis/v2/sports/soccer/{league_slug}/standings",
                     headers=self.headers
@@ -3,7 +3,7 @@ Geo-location service for detecting user's country from IP address.
 Uses a simple IP-to-country mapping without requiring external databases.
 """
 from typing import Optional
-import httpx
+from .upstream_guard import guarded_client
 
 
 class GeoService:
@@ -33,7 +33,7 @@ class GeoService:
         
         try:
             # Use ip-api.com free service (no API key required, 45 req/min limit)
-            async with httpx.AsyncClient(timeout=2.0) as client:
+            async with guarded_client(timeout=2.0) as client:
                 response = await client.get(
                     f"http://ip-api.com/json/{ip_address}",
                     params={"fields": "countryCode,status"}
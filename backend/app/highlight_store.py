@@ -0,0 +1,127 @@
+"""
+Bulk highlight writes.
+
+highlights has a unique index on (match_id, youtube_video_id), so discovery
+jobs collect the videos they find and store them with one insert_highlights()
+call per batch: INSERT ... ON CONFLICT DO NOTHING skips videos a match already
+has, including ones a concurrent job stored a moment earlier, without a
+separate existence query per video.
+
+It also keeps the denormalised matches.highlight_count / latest_highlight_at
+columns in step, in the same transaction as the write: inserts increment them
+by what RETURNING reports, deletes recompute them. Reads that only need to know
+whether (or since when) a match has highlights use those columns and their
+partial indexes instead of querying highlights. Inserted highlights are fanned
+out to followers' feeds and notifications by queued tasks (see user_feed and
+notifications).
+"""
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import is_postgres
+from .notifications import queue_highlight_notifications
+from .user_feed import queue_feed_updates
+
+
+def parse_published_at(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    except (ValueError, AttributeError):
+        return None
+
+
+def highlight_row(match_id: int, video: Dict) -> Dict:
+    """
+    Insert row for a discovered video. Accepts YouTubeService results
+    (video_id) as well as RSS / WebSub entries (youtube_video_id).
+    """
+    return {
+        'match_id': match_id,
+        'youtube_video_id': video.get('video_id') or video['youtube_video_id'],
+        'title': video['title'],
+        'description': video.get('description'),
+        'thumbnail_url': video.get('thumbnail_url'),
+        'channel_title': video.get('channel_title'),
+        'published_at': parse_published_at(video.get('published_at')),
+        'view_count': video.get('view_count'),
+        'duration': video.get('duration'),
+    }
+
+
+def insert_highlights(db: Session, rows: Iterable[Dict]) -> List:
+    """
+    Insert highlight rows, skipping (match_id, youtube_video_id) pairs that
+    already exist, and commit. Returns the inserted rows as (id, match_id).
+    """
+    rows = list({(row['match_id'], row['youtube_video_id']): row for row in rows}.values())
+    if not rows:
+        return []
+
+    if is_postgres(db):
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    table = models.Highlight.__table__
+    statement = insert(table).values(rows).on_conflict_do_nothing(
+        index_elements=['match_id', 'youtube_video_id']
+    ).returning(table.c.id, table.c.match_id)
+    inserted = db.execute(statement).fetchall()
+    _count_inserted(db, inserted)
+    db.commit()
+    
+    if inserted:
+        match_ids = {row.match_id for row in inserted}
+        try:
+            queue_feed_updates(db, match_ids)
+        except Exception as e:
+            # The highlights are stored; feeds catch up on the user's next rebuild
+            db.rollback()
+            print(f"[Highlights] Failed to queue feed fan-out: {e}")
+        try:
+            queue_highlight_notifications(db, match_ids)
+        except Exception as e:
+            db.rollback()
+            print(f"[Highlights] Failed to queue notifications: {e}")
+    return inserted
+
+
+def _count_inserted(db: Session, inserted: List):
+    """Increment the counters of matches that gained highlights, one UPDATE per distinct increment"""
+    by_increment = defaultdict(list)
+    for match_id, added in Counter(row.match_id for row in inserted).items():
+        by_increment[added].append(match_id)
+    
+    for added, match_ids in by_increment.items():
+        db.query(models.Match).filter(models.Match.id.in_(match_ids)).update({
+            models.Match.highlight_count: models.Match.highlight_count + added,
+            models.Match.latest_highlight_at: func.now(),
+        }, synchronize_session=False)
+
+
+def refresh_highlight_counters(db: Session, match_ids: Iterable[int]):
+    """
+    Recompute the counters of matches after their highlights were deleted.
+    Flushes pending ORM deletes first; the caller commits.
+    """
+    match_ids = set(match_ids)
+    if not match_ids:
+        return
+    db.flush()
+    
+    highlight = models.Highlight
+    db.query(models.Match).filter(models.Match.id.in_(match_ids)).update({
+        models.Match.highlight_count: select(func.count(highlight.id)).where(
+            highlight.match_id == models.Match.id
+        ).scalar_subquery(),
+        models.Match.latest_highlight_at: select(func.max(highlight.created_at)).where(
+            highlight.match_id == models.Match.id
+        ).scalar_subquery(),
+    }, synchronize_session=False)
@@ -0,0 +1,76 @@
+"""
+Planner for adaptive live-score polling.
+
+Decides which leagues need a scoreboard refresh right now from each match's
+kick-off time (match_date + match_time, which ESPN reports in UTC) and status:
+leagues with a match in play are polled every minute, leagues with a match
+about to start (or past kick-off but not yet reported live) every two
+minutes, and everything else not at all.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+LIVE_POLL_SECONDS = 60
+PREMATCH_POLL_SECONDS = 120
+
+# Start polling this long before kick-off to catch the switch to live
+PREMATCH_WINDOW = timedelta(minutes=10)
+# Stop waiting for a scheduled match to go live this long after kick-off
+# (postponed or abandoned matches otherwise keep a league polled all day)
+OVERDUE_WINDOW = timedelta(hours=3)
+
+LeagueDate = Tuple[str, date]
+
+
+def kickoff_time(match_date: date, match_time: Optional[str]) -> Optional[datetime]:
+    """Kick-off as a naive UTC datetime, or None if the time is unknown"""
+    if not match_time:
+        return None
+    try:
+        hour, minute = (int(part) for part in match_time.split(":")[:2])
+    except ValueError:
+        return None
+    return datetime.combine(match_date, datetime.min.time()).replace(hour=hour, minute=minute)
+
+
+def poll_interval(status: str, kickoff: Optional[datetime], now: datetime) -> Optional[int]:
+    """Seconds between polls for one match, or None if it doesn't need polling"""
+    if status == "live":
+        return LIVE_POLL_SECONDS
+    if status != "scheduled" or kickoff is None:
+        return None
+    if kickoff - PREMATCH_WINDOW <= now <= kickoff + OVERDUE_WINDOW:
+        return PREMATCH_POLL_SECONDS
+    return None
+
+
+def plan_live_polls(matches: Iterable, now: datetime) -> Dict[LeagueDate, int]:
+    """
+    Map (league name, match date) to the polling interval it needs right now.
+
+    Args:
+        matches: Match rows with league_name, match_date, match_time and status
+        now: Current UTC time
+
+    Returns:
+        The shortest interval across each league's matches; leagues with
+        nothing live or about to start are left out.
+    """
+    plan: Dict[LeagueDate, int] = {}
+    for match in matches:
+        interval = poll_interval(match.status, kickoff_time(match.match_date, match.match_time), now)
+        if interval is None:
+            continue
+        key = (match.league_name, match.match_date)
+        plan[key] = min(interval, plan.get(key, interval))
+    return plan
+
+
+def due_polls(plan: Dict[LeagueDate, int], last_polled: Dict[LeagueDate, datetime], now: datetime) -> list:
+    """Leagues in the plan whose interval has elapsed since their last poll"""
+    # A little slack so a 60s interval isn't skipped by a job that fires at 59.9s
+    slack = timedelta(seconds=5)
+    return [
+        key for key, interval in plan.items()
+        if key not in last_polled or now - last_polled[key] + slack >= timedelta(seconds=interval)
+    ]
@@ -1,14 +1,23 @@
+import time
+
+_startup_began = time.perf_counter()
+
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
-from .routers import leagues, matches, highlights, admin, audio, teams, auth, music, playlists, entertainment, favorites, standings, user_songs, sample_playlists
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from .database import engine
+from .routers import leagues, matches, highlights, admin, audio, teams, auth, music, playlists, entertainment, favorites, standings, user_songs, sample_playlists, search, tasks, websub, me
 from .config import get_settings
 from .scheduler import start_scheduler, shutdown_scheduler
+from .suggest_index import build_suggest_index, get_suggest_index
 
 settings = get_settings()
 
-Base.metadata.create_all(bind=engine)
+# Schema is created and migrated by init_db.py (the deploy's pre-deploy step),
+# not at import time, so each worker starts without DDL round-trips.
 
 
 @asynccontextmanager
@@ -16,6 +25,9 @@ async def lifespan(app: FastAPI):
     """Manage application lifecycle - start/stop scheduler"""
     # Startup
     start_scheduler()
+    # Build the typeahead index off the event loop so startup isn't blocked
+    asyncio.get_running_loop().run_in_executor(None, build_suggest_index)
+    print(f"[Startup] Ready to serve in {time.perf_counter() - _startup_began:.2f}s")
     yield
     # Shutdown
     shutdown_scheduler()
@@ -52,6 +64,10 @@ app.include_router(favorites.router)
 app.include_router(standings.router)
 app.include_router(user_songs.router)
 app.include_router(sample_playlists.router)
+app.include_router(search.router)
+app.include_router(tasks.router)
+app.include_router(websub.router)
+app.include_router(me.router)
 
 
 @app.get("/")
@@ -66,4 +82,25 @@ def root():
 @app.get("/api/health")
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "version": "1.0.0"}
+    """
+    Readiness probe: reports database connectivity and cache warm-up.
+    
+    Returns 503 while the database is unreachable. Caches still warming up are
+    reported but do not fail the probe, since their endpoints degrade gracefully.
+    """
+    checks = {}
+    
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        checks["database"] = "ok"
+    except Exception as e:
+        checks["database"] = f"error: {e.__class__.__name__}"
+    
+    checks["suggest_index"] = "ready" if get_suggest_index().ready else "warming"
+    
+    healthy = checks["database"] == "ok"
+    return JSONResponse(
+        status_code=200 if healthy else 503,
+        content={"status": "healthy" if healthy else "unavailable", "version": "1.0.0", "checks": checks}
+    )
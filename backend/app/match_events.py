@@ -0,0 +1,143 @@
+"""
+"Match finished" events and event-driven highlight discovery.
+
+Matches are upserted from many ingestion paths (scheduler jobs, admin and
+scrape endpoints), so a status change to "finished" is detected from ORM
+session events rather than at each call site. Once the transaction commits,
+a highlight discovery task is queued for the match; the task re-queues itself
+on the backoff curve in DISCOVERY_BACKOFF_MINUTES until highlights are found
+or the curve runs out, so discovery work scales with the matches that still
+need highlights instead of rescanning every finished match. Only matches
+passing match_has_team_of_interest are queued.
+
+The scheduled scans (reconciliation, yesterday's sweep) are a fallback for
+matches that never emitted the event: see queue_missed_discovery.
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import match_has_team_of_interest
+from .database import SessionLocal
+
+# Delay before each discovery attempt, measured from the previous one
+DISCOVERY_BACKOFF_MINUTES = [15, 30, 60, 120, 240, 480, 720, 1440]
+
+# Discovery tasks older than this no longer matter to the fallback scans
+DISCOVERY_LOOKBACK_DAYS = 3
+
+_FINISHING_KEY = "finishing_matches"
+_PENDING_KEY = "finished_match_ids"
+
+
+def schedule_highlight_discovery(db: Session, match_id: int, attempt: int = 0) -> Optional[models.QueuedTask]:
+    """
+    Queue discovery attempt number `attempt` for a match.
+
+    Returns the queued task, or None once the backoff curve is exhausted.
+    """
+    from .task_queue import enqueue_task
+
+    if attempt >= len(DISCOVERY_BACKOFF_MINUTES):
+        return None
+    run_after = datetime.utcnow() + timedelta(minutes=DISCOVERY_BACKOFF_MINUTES[attempt])
+    return enqueue_task(
+        db,
+        "discover_match_highlights",
+        {"match_id": match_id, "attempt": attempt},
+        run_after=run_after,
+        max_attempts=1,
+    )
+
+
+def is_of_interest(match: models.Match) -> bool:
+    league_name = match.league.name if match.league else "Unknown"
+    return match_has_team_of_interest(match.home_team, match.away_team, league_name)
+
+
+def discovered_match_ids(db: Session, match_ids: Iterable[int]) -> Set[int]:
+    """The matches among match_ids that event-driven discovery has already picked up"""
+    match_ids = set(match_ids)
+    if not match_ids:
+        return set()
+    payloads = db.query(models.QueuedTask.payload).filter(
+        models.QueuedTask.task_type == "discover_match_highlights",
+        models.QueuedTask.created_at >= datetime.utcnow() - timedelta(days=DISCOVERY_LOOKBACK_DAYS)
+    ).all()
+    return {payload["match_id"] for payload, in payloads if payload and payload.get("match_id") in match_ids}
+
+
+def queue_missed_discovery(db: Session, matches: List[models.Match]) -> int:
+    """
+    Start discovery for finished matches of interest that are still without
+    highlights and never emitted the "finished" event. Returns matches queued.
+    """
+    candidates = [match for match in matches if not match.highlight_count and is_of_interest(match)]
+    discovered = discovered_match_ids(db, (match.id for match in candidates))
+    queued = 0
+    for match in candidates:
+        if match.id not in discovered:
+            schedule_highlight_discovery(db, match.id)
+            queued += 1
+    return queued
+
+
+@event.listens_for(models.Match.status, "set", active_history=True)
+def _load_previous_status(target, value, oldvalue, initiator):
+    # Registered for active_history: the committed status is loaded before it
+    # is overwritten, so re-saving an already finished match isn't a new event
+    pass
+
+
+def _became_finished(match: models.Match) -> bool:
+    history = inspect(match).attrs.status.history
+    return "finished" in history.added and "finished" not in history.deleted
+
+
+@event.listens_for(Session, "before_flush")
+def _detect_finished_matches(session, flush_context, instances):
+    finishing = session.info.setdefault(_FINISHING_KEY, [])
+    for obj in session.new:
+        if isinstance(obj, models.Match) and obj.status == "finished":
+            finishing.append(obj)
+    for obj in session.dirty:
+        if isinstance(obj, models.Match) and _became_finished(obj):
+            finishing.append(obj)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_finished_matches(session, flush_context):
+    # New rows have their primary keys once flushed
+    finishing = session.info.pop(_FINISHING_KEY, None)
+    if finishing:
+        session.info.setdefault(_PENDING_KEY, set()).update(match.id for match in finishing)
+
+
+@event.listens_for(Session, "after_commit")
+def _emit_match_finished(session):
+    match_ids = session.info.pop(_PENDING_KEY, None)
+    if not match_ids:
+        return
+    # The committing session can't run SQL from inside after_commit
+    db = SessionLocal()
+    try:
+        matches = db.query(models.Match).filter(models.Match.id.in_(match_ids)).order_by(models.Match.id).all()
+        matches = [match for match in matches if is_of_interest(match)]
+        for match in matches:
+            schedule_highlight_discovery(db, match.id)
+        if matches:
+            print(f"[Events] Match finished: queued highlight discovery for {len(matches)} matches")
+    except Exception as e:
+        print(f"[Events] Failed to queue highlight discovery: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_finished_matches(session, previous_transaction):
+    session.info.pop(_FINISHING_KEY, None)
+    session.info.pop(_PENDING_KEY, None)
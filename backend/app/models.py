@@ -1,10 +1,11 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Boolean
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Text, Boolean, JSON, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
 
 # Import user-related models
-from .models_users import User, UserFavoriteTeam, NotificationPreference, Notification
+from .models_users import User, UserFavoriteTeam, UserFeedItem, NotificationPreference, Notification
 
 
 class League(Base):
@@ -21,6 +22,29 @@ class League(Base):
     matches = relationship("Match", back_populates="league")
 
 
+class Team(Base):
+    """Canonical team; matches and favourites reference it by id (see app/teams.py)"""
+    __tablename__ = "teams"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(200), nullable=False, unique=True)
+    created_at = Column(DateTime, server_default=func.now())
+    
+    aliases = relationship("TeamAlias", back_populates="team", cascade="all, delete-orphan")
+
+
+class TeamAlias(Base):
+    """Normalised name a data source uses for a team, including the canonical name itself"""
+    __tablename__ = "team_aliases"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False, index=True)
+    alias = Column(String(200), nullable=False, unique=True)
+    created_at = Column(DateTime, server_default=func.now())
+    
+    team = relationship("Team", back_populates="aliases")
+
+
 class Match(Base):
     __tablename__ = "matches"
     
@@ -28,6 +52,9 @@ class Match(Base):
     league_id = Column(Integer, ForeignKey("leagues.id"), nullable=False)
     home_team = Column(String(200), nullable=False)
     away_team = Column(String(200), nullable=False)
+    # Resolved from the names above on flush (app/teams.py)
+    home_team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
+    away_team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
     home_score = Column(Integer, nullable=True)
     away_score = Column(Integer, nullable=True)
     match_date = Column(Date, nullable=False, index=True)
@@ -36,11 +63,27 @@ class Match(Base):
     espn_event_id = Column(String(100), nullable=True, unique=True)
     highlight_fetch_attempts = Column(Integer, default=0)  # Track retry attempts
     last_highlight_fetch_attempt = Column(DateTime, nullable=True)  # Last attempt timestamp
+    # Denormalised from highlights, kept in step by app/highlight_store.py
+    highlight_count = Column(Integer, nullable=False, default=0, server_default="0")
+    latest_highlight_at = Column(DateTime, nullable=True)  # When the newest highlight was stored
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     league = relationship("League", back_populates="matches")
     highlights = relationship("Highlight", back_populates="match")
+    
+    __table_args__ = (
+        # Team filters and personalised feeds
+        Index("ix_matches_home_team_date", "home_team_id", "match_date"),
+        Index("ix_matches_away_team_date", "away_team_id", "match_date"),
+        # Feeds: matches with highlights in a date range / league
+        Index("ix_matches_with_highlights", "match_date", "league_id",
+              postgresql_where=text("highlight_count > 0"), sqlite_where=text("highlight_count > 0")),
+        # Scheduler: finished matches still waiting for highlights
+        Index("ix_matches_awaiting_highlights", "match_date",
+              postgresql_where=text("highlight_count = 0 AND status = 'finished'"),
+              sqlite_where=text("highlight_count = 0 AND status = 'finished'")),
+    )
 
 
 class Highlight(Base):
@@ -59,10 +102,15 @@ class Highlight(Base):
     created_at = Column(DateTime, server_default=func.now())
     
     match = relationship("Match", back_populates="highlights")
+    
+    __table_args__ = (
+        # Conflict target for insert_highlights(): a video is stored once per match
+        Index("ux_highlights_match_video", "match_id", "youtube_video_id", unique=True),
+    )
 
 
 class FetchedDate(Base):
-    """Track which dates have been fetched from ESPN API"""
+    """Track which dates have been fetched from ESPN API (legacy: superseded by LeagueFetch)"""
     __tablename__ = "fetched_dates"
     
     id = Column(Integer, primary_key=True, index=True)
@@ -70,6 +118,93 @@ class FetchedDate(Base):
     fetched_at = Column(DateTime, server_default=func.now())
 
 
+class LeagueFetch(Base):
+    """Fetch ledger: when each ESPN league scoreboard was last fetched for a date"""
+    __tablename__ = "league_fetch_ledger"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    league_slug = Column(String(100), nullable=False)  # ESPN slug, e.g. "eng.1"
+    fetch_date = Column(Date, nullable=False)
+    fetched_at = Column(DateTime, nullable=False)
+    payload_hash = Column(String(64), nullable=True)  # sha256 of the response body
+    etag = Column(String(200), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+    event_count = Column(Integer, nullable=False, default=0)
+    all_final = Column(Boolean, nullable=False, default=False)  # No unfinished events
+    
+    __table_args__ = (
+        Index("ix_league_fetch_ledger_league_date", "league_slug", "fetch_date", unique=True),
+    )
+
+
+class QueuedTask(Base):
+    """Durable background task, claimed by run_worker.py with SKIP LOCKED"""
+    __tablename__ = "task_queue"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    task_type = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=True)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, succeeded, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = Column(String(100), nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_task_queue_status_run_after", "status", "run_after"),
+    )
+
+
+class ChannelVideo(Base):
+    """Upload seen on a highlights channel (RSS feed or uploads playlist), kept for local re-matching"""
+    __tablename__ = "channel_videos"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    youtube_video_id = Column(String(50), nullable=False, unique=True)
+    channel_id = Column(String(50), nullable=True)
+    channel_title = Column(String(200), nullable=True)
+    title = Column(String(500), nullable=False)
+    normalized_title = Column(String(500), nullable=False)  # Lowercase, accents stripped
+    description = Column(Text, nullable=True)
+    thumbnail_url = Column(String(500), nullable=True)
+    published_at = Column(DateTime, nullable=True)
+    duration = Column(String(20), nullable=True)
+    # none_as_null: a missing value is SQL NULL, not JSON 'null', so the upsert's
+    # COALESCE keeps countries stored by an earlier, enriched sighting
+    blocked_countries = Column(JSON(none_as_null=True), nullable=True)
+    allowed_countries = Column(JSON(none_as_null=True), nullable=True)
+    source = Column(String(20), nullable=False)  # rss, playlist, websub
+    first_seen_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now())
+    
+    __table_args__ = (
+        # The title trigram index is Postgres-only: see migrations/add_channel_videos.sql
+        Index("ix_channel_videos_published_at", "published_at"),
+    )
+
+
+class WebSubSubscription(Base):
+    """WebSub (PubSubHubbub) subscription to one YouTube channel's uploads feed"""
+    __tablename__ = "websub_subscriptions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    channel_id = Column(String(50), nullable=False, unique=True)
+    topic_url = Column(String(300), nullable=False)
+    secret = Column(String(64), nullable=False)  # HMAC key for X-Hub-Signature
+    status = Column(String(20), nullable=False, default="pending")  # pending, verified, denied, failed
+    requested_at = Column(DateTime, nullable=True)
+    verified_at = Column(DateTime, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    last_notification_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+
 class SamplePlaylist(Base):
     """Sample playlists for curating songs before adding to main playlist"""
     __tablename__ = "sample_playlists"
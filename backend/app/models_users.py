@@ -23,6 +23,7 @@ class User(Base):
     notification_preferences = relationship("NotificationPreference", back_populates="user", cascade="all, delete-orphan")
     notifications = relationship("Notification", back_populates="user", cascade="all, delete-orphan")
     playlists = relationship("UserPlaylist", back_populates="user", cascade="all, delete-orphan")
+    push_devices = relationship("PushDevice", back_populates="user", cascade="all, delete-orphan")
 
 
 class UserFavoriteTeam(Base):
@@ -31,6 +32,7 @@ class UserFavoriteTeam(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     team_name = Column(String(100), nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)  # Resolved from team_name on flush
     league_id = Column(Integer, ForeignKey("leagues.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -39,7 +41,10 @@ class UserFavoriteTeam(Base):
     league = relationship("League")
     
     # Constraints
-    __table_args__ = (UniqueConstraint("user_id", "team_name", name="unique_user_team"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "team_name", name="unique_user_team"),
+        Index("ix_user_favorite_teams_team_user", "team_id", "user_id"),
+    )
 
 
 class NotificationPreference(Base):
@@ -69,10 +74,52 @@ class Notification(Base):
     sent_at = Column(DateTime(timezone=True), server_default=func.now())
     read_at = Column(DateTime(timezone=True))
     email_sent = Column(Boolean, default=False)
+    email_error = Column(String(300), nullable=True)  # Permanent SMTP rejection (5xx); never retried
     push_sent = Column(Boolean, default=False)
+    push_error = Column(String(300), nullable=True)  # Expo ticket error a retry won't fix; never retried
     
     # Relationships
     user = relationship("User", back_populates="notifications")
+    
+    __table_args__ = (
+        # One notification of each type per user and match (see app/notifications.py)
+        Index("ux_notifications_user_match_type", "user_id", "match_id", "type", unique=True),
+    )
+
+
+class PushDevice(Base):
+    """An Expo push token for one install of the mobile app (see app/push_delivery.py)"""
+    __tablename__ = "push_devices"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token = Column(String(255), unique=True, nullable=False)  # ExponentPushToken[...]
+    platform = Column(String(20))  # 'ios', 'android'
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_seen_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    user = relationship("User", back_populates="push_devices")
+
+
+class UserFeedItem(Base):
+    """One match in a user's "my teams" timeline, written on fan-out (see app/user_feed.py)"""
+    __tablename__ = "user_feed_items"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    match_id = Column(Integer, ForeignKey("matches.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(20), nullable=False)  # 'upcoming', 'highlights'
+    sort_at = Column(DateTime, nullable=False)  # Kick-off, or when highlights landed (naive UTC, like matches)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    match = relationship("Match")
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "match_id", name="unique_user_feed_match"),
+        Index("ix_user_feed_items_user_kind_sort", "user_id", "kind", "sort_at", "id"),
+    )
 
 
 class UserPlaylist(Base):
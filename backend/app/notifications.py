@@ -0,0 +1,173 @@
+"""
+User notifications, fanned out when highlights land.
+
+insert_highlights() queues a notify_highlights task for matches someone
+follows, so ingestion never waits on followers. The worker then:
+
+- reads the followers of either team and their notification preferences in
+  one join over favourites (team_id, user_id index) and preferences;
+- bulk-inserts 'highlights_available' rows NOTIFY_CHUNK at a time. The unique
+  (user_id, match_id, type) index makes this idempotent: a second highlight
+  for the same match, or a retried task, notifies nobody twice;
+- queues deliver_notifications (email) and deliver_push_notifications tasks
+  of DELIVERY_BATCH ids for the users that want each channel, in the same
+  transaction as the rows, so a retry never finds rows without deliveries.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from sqlalchemy.orm import Session, joinedload
+
+from . import models
+from .database import is_postgres
+from .models_users import Notification, NotificationPreference, UserFavoriteTeam
+from .user_feed import followed_match_ids
+
+NOTIFY_CHUNK = 1000
+DELIVERY_BATCH = 200
+
+HIGHLIGHTS_AVAILABLE = 'highlights_available'
+
+# Users without a preferences row get the column defaults
+DEFAULT_EMAIL_HIGHLIGHTS = True
+DEFAULT_PUSH_NOTIFICATIONS = False
+
+
+def _highlights_notification(match: models.Match) -> Dict:
+    if match.home_score is not None and match.away_score is not None:
+        result = f"{match.home_team} {match.home_score}-{match.away_score} {match.away_team}"
+    else:
+        result = f"{match.home_team} vs {match.away_team}"
+    return {
+        'type': HIGHLIGHTS_AVAILABLE,
+        'match_id': match.id,
+        'title': f"Highlights: {match.home_team} vs {match.away_team}"[:200],
+        'message': f"Highlights of {result} are ready to watch.",
+    }
+
+
+def _insert_notifications(db: Session, rows: List[Dict]) -> List:
+    """Insert rows, skipping ones the user already has. Returns inserted (id, user_id)."""
+    if not rows:
+        return []
+    if is_postgres(db):
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    table = Notification.__table__
+    statement = insert(table).values(rows).on_conflict_do_nothing(
+        index_elements=['user_id', 'match_id', 'type']
+    ).returning(table.c.id, table.c.user_id)
+    return db.execute(statement).fetchall()
+
+
+def notify_highlights_available(db: Session, match_ids: Iterable[int]) -> Dict:
+    """
+    Create a 'highlights_available' notification for every follower of the
+    matches and queue email and push deliveries. Commits rows and deliveries
+    together.
+    """
+    matches = db.query(models.Match).filter(
+        models.Match.id.in_(list(match_ids)),
+        models.Match.highlight_count > 0
+    ).all()
+    matches_by_team = defaultdict(list)
+    for match in matches:
+        for team_id in {match.home_team_id, match.away_team_id} - {None}:
+            matches_by_team[team_id].append(match)
+    if not matches_by_team:
+        return {"notifications": 0, "email_deliveries": 0, "push_deliveries": 0}
+    templates = {match.id: _highlights_notification(match) for match in matches}
+
+    followers = db.query(
+        UserFavoriteTeam.team_id,
+        UserFavoriteTeam.user_id,
+        NotificationPreference.email_highlights,
+        NotificationPreference.push_notifications
+    ).outerjoin(
+        NotificationPreference, NotificationPreference.user_id == UserFavoriteTeam.user_id
+    ).filter(
+        UserFavoriteTeam.team_id.in_(list(matches_by_team))
+    ).yield_per(NOTIFY_CHUNK)
+
+    created = 0
+    wants = {}  # user_id -> (email, push)
+    email_ids, push_ids = [], []
+
+    def flush_chunk(chunk):
+        nonlocal created
+        inserted = _insert_notifications(db, list(chunk.values()))
+        created += len(inserted)
+        email_ids.extend(row.id for row in inserted if wants[row.user_id][0])
+        push_ids.extend(row.id for row in inserted if wants[row.user_id][1])
+
+    chunk = {}
+    for team_id, user_id, email_highlights, push_notifications in followers:
+        wants[user_id] = (
+            DEFAULT_EMAIL_HIGHLIGHTS if email_highlights is None else email_highlights,
+            DEFAULT_PUSH_NOTIFICATIONS if push_notifications is None else push_notifications,
+        )
+        for match in matches_by_team[team_id]:
+            # Keyed so a user following both teams gets one row
+            chunk[(user_id, match.id)] = {'user_id': user_id, **templates[match.id]}
+        if len(chunk) >= NOTIFY_CHUNK:
+            flush_chunk(chunk)
+            chunk = {}
+    flush_chunk(chunk)
+
+    queue_deliveries(db, "deliver_notifications", email_ids)
+    queue_deliveries(db, "deliver_push_notifications", push_ids)
+    db.commit()
+    return {"notifications": created, "email_deliveries": len(email_ids), "push_deliveries": len(push_ids)}
+
+
+def queue_deliveries(db: Session, task_type: str, notification_ids: List[int]) -> int:
+    """Queue delivery tasks of DELIVERY_BATCH ids (caller commits). Returns tasks queued."""
+    from .task_queue import add_task
+
+    batches = 0
+    for start in range(0, len(notification_ids), DELIVERY_BATCH):
+        add_task(db, task_type, {
+            "notification_ids": notification_ids[start:start + DELIVERY_BATCH]
+        })
+        batches += 1
+    return batches
+
+
+def queue_highlight_notifications(db: Session, match_ids: Iterable[int]):
+    """Queue a notification fan-out for matches that have at least one follower"""
+    from .task_queue import enqueue_task
+
+    followed = followed_match_ids(db, match_ids)
+    if not followed:
+        return None
+    return enqueue_task(db, "notify_highlights", {"match_ids": followed})
+
+
+def pending_email_notifications(db: Session, notification_ids: Iterable[int]) -> List[Notification]:
+    """Notifications among the ids still waiting for their email (and not rejected), with users loaded"""
+    return db.query(Notification).options(
+        joinedload(Notification.user, innerjoin=True)
+    ).filter(
+        Notification.id.in_(list(notification_ids)),
+        Notification.email_sent.isnot(True),
+        Notification.email_error.is_(None)
+    ).order_by(Notification.id).all()
+
+
+def mark_emails_rejected(db: Session, errors: Dict[int, Exception]):
+    """Record permanent rejections so the emails are not retried (caller commits)"""
+    for notification_id, error in errors.items():
+        db.query(Notification).filter(Notification.id == notification_id).update(
+            {Notification.email_error: str(error)[:300]}, synchronize_session=False
+        )
+
+
+def mark_emails_sent(db: Session, notification_ids: Iterable[int]):
+    notification_ids = list(notification_ids)
+    if notification_ids:
+        db.query(Notification).filter(Notification.id.in_(notification_ids)).update(
+            {Notification.email_sent: True}, synchronize_session=False
+        )
+    db.commit()
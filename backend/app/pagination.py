@@ -0,0 +1,53 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token wrapping the sort key of the last row on
+a page, e.g. ``(id,)`` for songs or ``(created_at, id)`` for entertainment.
+The next page is then fetched with ``WHERE (sort key) < (cursor values)``,
+which stays fast on deep pages and does not shift when new rows are inserted.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page into a cursor token"""
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> List[Any]:
+    """
+    Decode a cursor token back into its sort key values.
+
+    Raises ValueError if the token is malformed or has the wrong number of values.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+    if not isinstance(payload, list) or len(payload) != size:
+        raise ValueError("Invalid cursor")
+
+    values = []
+    for value in payload:
+        if isinstance(value, dict) and "dt" in value:
+            value = datetime.fromisoformat(value["dt"])
+        values.append(value)
+    return values
+
+
+def next_cursor(rows: list, limit: int, *key_attrs: str) -> Optional[str]:
+    """Build the cursor for the following page, or None when this was the last page"""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(*(getattr(last, attr) for attr in key_attrs))
@@ -0,0 +1,221 @@
+"""
+Expo push notifications for the mobile app.
+
+The app registers its ExponentPushToken with POST /api/me/devices. When
+notifications are created for users with push_notifications enabled, a
+deliver_push_notifications task sends one message per registered device:
+
+- messages go to Expo EXPO_BATCH_SIZE (its maximum, 100) per request, through
+  the expo-push upstream's rate limit and circuit breaker;
+- tickets rejected with DeviceNotRegistered drop the token straight away;
+  accepted tickets are checked by a check_push_receipts task queued
+  RECEIPT_DELAY_MINUTES later, which drops tokens the receipts report as
+  unregistered;
+- a notification gets push_sent (one UPDATE per batch) once every one of its
+  messages has been accepted or rejected for an unregistered device; one with
+  a ticket error a retry won't fix (e.g. MessageTooBig) gets push_error instead
+  and is never retried;
+- notifications left pending by a failed request or a retryable ticket error
+  (RETRYABLE_TICKET_ERRORS) fail the task with TransientPushError, so the task
+  queue retries them.
+
+expo_push_url / expo_receipts_url can point at a local stub of the push API.
+"""
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from .config import get_settings
+from .database import is_postgres
+from .models_users import Notification, PushDevice
+from .upstream_guard import guarded_client
+
+EXPO_BATCH_SIZE = 100
+# Ticket errors that may succeed on a later attempt; any other error is recorded
+RETRYABLE_TICKET_ERRORS = {"MessageRateExceeded"}
+EXPO_RECEIPTS_BATCH = 1000
+# Expo recommends waiting before fetching receipts; they are kept for a day
+RECEIPT_DELAY_MINUTES = 15
+
+_EXPO_TOKEN = re.compile(r"^Expo(nent)?PushToken\[[^\]]+\]$")
+
+
+class TransientPushError(Exception):
+    pass
+
+
+def is_expo_token(token: str) -> bool:
+    return bool(_EXPO_TOKEN.match(token or ""))
+
+
+def register_device(db: Session, user_id: int, token: str, platform: Optional[str] = None) -> PushDevice:
+    """
+    Register (or re-register) a device token for a user and commit. A token
+    seen before moves to the user now signed in on that device.
+    """
+    if is_postgres(db):
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    statement = insert(PushDevice.__table__).values(user_id=user_id, token=token, platform=platform)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=['token'],
+        set_={
+            'user_id': statement.excluded.user_id,
+            'platform': func.coalesce(statement.excluded.platform, PushDevice.__table__.c.platform),
+            'last_seen_at': func.now(),
+        },
+    ))
+    db.commit()
+    return db.query(PushDevice).filter(PushDevice.token == token).one()
+
+
+def unregister_device(db: Session, user_id: int, token: str) -> bool:
+    deleted = db.query(PushDevice).filter(
+        PushDevice.user_id == user_id,
+        PushDevice.token == token
+    ).delete(synchronize_session=False)
+    db.commit()
+    return bool(deleted)
+
+
+def prune_tokens(db: Session, tokens: Iterable[str]) -> int:
+    """Forget tokens Expo reported as no longer registered"""
+    tokens = list(set(tokens))
+    if not tokens:
+        return 0
+    return db.query(PushDevice).filter(PushDevice.token.in_(tokens)).delete(synchronize_session=False)
+
+
+def _headers() -> Dict[str, str]:
+    headers = {"Accept": "application/json", "Content-Type": "application/json"}
+    access_token = get_settings().expo_access_token
+    if access_token:
+        headers["Authorization"] = f"Bearer {access_token}"
+    return headers
+
+
+async def send_push_batch(client, messages: List[Dict]) -> List[Dict]:
+    """POST up to EXPO_BATCH_SIZE messages. Returns one ticket per message, in order."""
+    response = await client.post(get_settings().expo_push_url, json=messages)
+    response.raise_for_status()
+    return response.json()["data"]
+
+
+def _ticket_error(ticket: Dict) -> Optional[str]:
+    return (ticket.get("details") or {}).get("error") or ticket.get("message")
+
+
+async def dispatch_push_notifications(db: Session, notification_ids: Iterable[int]) -> Dict:
+    """
+    Push notifications not sent yet to every device of their user, record
+    push_sent and prune unregistered tokens. Commits.
+    """
+    pending = db.query(Notification.id, Notification.title, Notification.message,
+                       Notification.match_id, PushDevice.token).join(
+        PushDevice, PushDevice.user_id == Notification.user_id
+    ).filter(
+        Notification.id.in_(list(notification_ids)),
+        Notification.push_sent.isnot(True),
+        Notification.push_error.is_(None)
+    ).order_by(Notification.id).all()
+    if not pending:
+        return {"messages": 0, "accepted": 0, "rejected": 0, "tokens_pruned": 0}
+
+    messages = [
+        {
+            "to": row.token,
+            "title": row.title,
+            "body": row.message or "",
+            "sound": "default",
+            "data": {"notification_id": row.id, "match_id": row.match_id},
+        }
+        for row in pending
+    ]
+
+    accepted = 0
+    receipts: Dict[str, str] = {}  # receipt id -> token
+    pruned = 0
+    # Messages of each notification not answered yet; rows are ordered by
+    # notification, so only one can straddle a batch boundary
+    unanswered = Counter(row.id for row in pending)
+    errors: Dict[int, str] = {}  # notification id -> ticket error a retry won't fix
+    retry = set()
+    try:
+        # Each batch is recorded before the next goes out, so a failed request
+        # only leaves later notifications for the task's retry
+        async with guarded_client(timeout=15.0, headers=_headers()) as client:
+            for start in range(0, len(messages), EXPO_BATCH_SIZE):
+                batch = pending[start:start + EXPO_BATCH_SIZE]
+                tickets = await send_push_batch(client, messages[start:start + EXPO_BATCH_SIZE])
+                answered, unregistered = set(), set()
+                for row, ticket in zip(batch, tickets):
+                    error = None if ticket.get("status") == "ok" else _ticket_error(ticket) or "Unknown error"
+                    if error is None:
+                        accepted += 1
+                        receipts[ticket["id"]] = row.token
+                    elif error == "DeviceNotRegistered":
+                        unregistered.add(row.token)
+                    elif error in RETRYABLE_TICKET_ERRORS:
+                        retry.add(row.id)
+                        continue
+                    else:
+                        print(f"[Push] Notification {row.id} rejected: {error}")
+                        errors.setdefault(row.id, error)
+                    unanswered[row.id] -= 1
+                    answered.add(row.id)
+                done = {notification_id for notification_id in answered if not unanswered[notification_id]}
+                
+                pruned += prune_tokens(db, unregistered)
+                sent = done - set(errors)
+                if sent:
+                    db.query(Notification).filter(Notification.id.in_(sent)).update(
+                        {Notification.push_sent: True}, synchronize_session=False
+                    )
+                for notification_id in done & set(errors):
+                    db.query(Notification).filter(Notification.id == notification_id).update(
+                        {Notification.push_error: errors[notification_id][:300]}, synchronize_session=False
+                    )
+                db.commit()
+        if retry:
+            raise TransientPushError(f"{len(retry)} notifications hit retryable ticket errors, will retry")
+    finally:
+        if receipts:
+            from .task_queue import enqueue_task
+            enqueue_task(db, "check_push_receipts", {"receipts": receipts},
+                         run_after=datetime.utcnow() + timedelta(minutes=RECEIPT_DELAY_MINUTES))
+    return {"messages": len(messages), "accepted": accepted, "rejected": len(errors), "tokens_pruned": pruned}
+
+
+async def check_receipts(db: Session, receipts: Dict[str, str]) -> Dict:
+    """
+    Fetch receipts for accepted tickets (receipt id -> token) and prune the
+    tokens of devices the platform says are no longer registered. Commits.
+    """
+    settings = get_settings()
+    receipt_ids = list(receipts)
+    unregistered = set()
+    errors = 0
+    async with guarded_client(timeout=15.0, headers=_headers()) as client:
+        for start in range(0, len(receipt_ids), EXPO_RECEIPTS_BATCH):
+            response = await client.post(settings.expo_receipts_url, json={
+                "ids": receipt_ids[start:start + EXPO_RECEIPTS_BATCH]
+            })
+            response.raise_for_status()
+            for receipt_id, receipt in response.json()["data"].items():
+                if receipt.get("status") == "ok":
+                    continue
+                errors += 1
+                if _ticket_error(receipt) == "DeviceNotRegistered" and receipt_id in receipts:
+                    unregistered.add(receipts[receipt_id])
+                else:
+                    print(f"[Push] Receipt {receipt_id} failed: {_ticket_error(receipt)}")
+
+    pruned = prune_tokens(db, unregistered)
+    db.commit()
+    return {"receipts": len(receipt_ids), "errors": errors, "tokens_pruned": pruned}
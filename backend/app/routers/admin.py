@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Form
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Form
 from sqlalchemy.orm import Session
 from typing import Dict, Any
 from datetime import date, timedelta
 from ..database import get_db
 from .. import models
-from ..scheduler import fetch_highlights_for_yesterday, fetch_highlights_for_today, refresh_today_scores, reconcile_todays_matches, fetch_highlights_for_matches_missing_them
+from ..suggest_index import get_suggest_index
+from ..task_queue import enqueue_task
+from ..upstream_guard import UPSTREAMS, upstream_states
+from ..channel_catalogue import rematch_highlights_from_catalogue
+from ..highlight_store import highlight_row, insert_highlights, refresh_highlight_counters
+from ..teams import backfill_team_ids
+from ..websub import renew_subscriptions, subscription_states
+from ..config import get_settings
+from ..scheduler import fetch_highlights_for_yesterday, fetch_highlights_for_today, refresh_today_scores
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -21,7 +30,8 @@ def fix_data_integrity(db: Session = Depends(get_db)) -> Dict[str, Any]:
     
     # Find scheduled/live matches that incorrectly have highlights
     scheduled_matches = db.query(models.Match).filter(
-        models.Match.status.in_(["scheduled", "live"])
+        models.Match.status.in_(["scheduled", "live"]),
+        models.Match.highlight_count > 0
     ).all()
     
     for match in scheduled_matches:
@@ -43,6 +53,7 @@ def fix_data_integrity(db: Session = Depends(get_db)) -> Dict[str, Any]:
             result["scheduled_matches_cleaned"] += 1
             result["details"].append(match_detail)
     
+    refresh_highlight_counters(db, [d["match_id"] for d in result["details"]])
     # Commit changes
     db.commit()
     
@@ -86,7 +97,7 @@ def add_sample_highlights(db: Session = Depends(get_db)) -> Dict[str, Any]:
     
     # Get some recent matches without highlights
     matches_without_highlights = db.query(models.Match).filter(
-        ~models.Match.highlights.any()
+        models.Match.highlight_count == 0
     ).limit(5).all()
     
     sample_highlights_data = [
@@ -110,31 +121,20 @@ def add_sample_highlights(db: Session = Depends(get_db)) -> Dict[str, Any]:
         }
     ]
     
+    rows = []
     for i, match in enumerate(matches_without_highlights):
         if i < len(sample_highlights_data):
             highlight_data = sample_highlights_data[i]
+            title = f"{match.home_team} vs {match.away_team} - {highlight_data['title']}"
             
-            highlight = models.Highlight(
-                match_id=match.id,
-                youtube_video_id=highlight_data["youtube_video_id"],
-                title=f"{match.home_team} vs {match.away_team} - {highlight_data['title']}",
-                description=highlight_data["description"],
-                thumbnail_url=highlight_data["thumbnail_url"],
-                channel_title=highlight_data["channel_title"],
-                view_count=highlight_data["view_count"],
-                duration=highlight_data["duration"],
-                is_official=True
-            )
-            
-            db.add(highlight)
-            result["highlights_created"] += 1
+            rows.append(highlight_row(match.id, dict(highlight_data, title=title)))
             result["details"].append({
                 "match": f"{match.home_team} vs {match.away_team}",
                 "date": str(match.match_date),
-                "highlight_title": highlight.title
+                "highlight_title": title
             })
     
-    db.commit()
+    result["highlights_created"] = len(insert_highlights(db, rows))
     return result
 
 
@@ -236,37 +236,28 @@ def add_highlight_by_video_id(
             db.commit()
             db.refresh(match)
         
-        # Check if match already has this highlight
-        existing = db.query(models.Highlight).filter(
-            models.Highlight.match_id == match.id,
-            models.Highlight.youtube_video_id == video_id
-        ).first()
+        # Add the highlight, unless the match already has this video
+        inserted = insert_highlights(db, [highlight_row(match.id, {
+            "video_id": video_id,
+            "title": f"{match.home_team} vs {match.away_team} Highlights",
+            "description": "",
+            "thumbnail_url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+            "channel_title": "YouTube",
+            "view_count": 0,
+            "duration": ""
+        })])
         
-        if existing:
+        if not inserted:
             return {
                 "success": False,
                 "message": "Highlight already exists for this match"
             }
         
-        # Add the highlight
-        highlight = models.Highlight(
-            match_id=match.id,
-            youtube_video_id=video_id,
-            title=f"{match.home_team} vs {match.away_team} Highlights",
-            description="",
-            thumbnail_url=f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
-            channel_title="YouTube",
-            view_count=0,
-            duration=""
-        )
-        db.add(highlight)
-        db.commit()
-        
         return {
             "success": True,
             "message": f"Highlight added successfully to {match.home_team} vs {match.away_team}",
             "match_id": match.id,
-            "highlight_id": highlight.id,
+            "highlight_id": inserted[0].id,
             "video_url": f"https://www.youtube.com/watch?v={video_id}"
         }
         
@@ -279,7 +270,7 @@ def add_highlight_by_video_id(
 
 
 @router.post("/reconcile-today")
-async def trigger_reconciliation(background_tasks: BackgroundTasks):
+def trigger_reconciliation(db: Session = Depends(get_db)):
     """
     Manually trigger the match reconciliation job.
     
@@ -290,12 +281,15 @@ async def trigger_reconciliation(background_tasks: BackgroundTasks):
     4. Check for and fetch missing highlights
     
     Useful for debugging or recovering from scheduler failures.
+    The job is queued for the task worker; poll /api/tasks/{task_id} for its status.
     """
-    background_tasks.add_task(reconcile_todays_matches)
+    task = enqueue_task(db, "reconcile_today")
     
     return {
         "success": True,
-        "message": "Reconciliation job started in background. Check server logs for details.",
+        "task_id": task.id,
+        "status": task.status,
+        "message": "Reconciliation job queued. Check /api/tasks/{task_id} for status.",
         "note": "This job re-fetches all today's matches from ESPN and ensures DB is up-to-date"
     }
 
@@ -366,7 +360,7 @@ def update_league_display_order(db: Session = Depends(get_db)) -> Dict[str, Any]
     return result
 
 @router.post("/fetch-missing-highlights")
-async def trigger_fetch_missing_highlights(background_tasks: BackgroundTasks):
+def trigger_fetch_missing_highlights(db: Session = Depends(get_db)):
     """
     Manually trigger highlight fetching for all finished matches without highlights.
     
@@ -376,16 +370,34 @@ async def trigger_fetch_missing_highlights(background_tasks: BackgroundTasks):
     3. Add found highlights to the database
     
     Useful after reconciliation adds missing matches or when highlights are delayed.
+    The job is queued for the task worker; poll /api/tasks/{task_id} for its status.
     """
-    background_tasks.add_task(fetch_highlights_for_matches_missing_them)
+    task = enqueue_task(db, "fetch_missing_highlights")
     
     return {
         "success": True,
-        "message": "Highlight fetch job started in background. Check server logs for details.",
+        "task_id": task.id,
+        "status": task.status,
+        "message": "Highlight fetch job queued. Check /api/tasks/{task_id} for status.",
         "note": "This job searches for highlights for all finished matches without highlights"
     }
 
 
+@router.post("/rematch-catalogue")
+def rematch_catalogue(days: int = 7, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Match finished matches without highlights against the local channel_videos
+    catalogue. Runs inline: it is a local query with no YouTube quota or network.
+    """
+    return rematch_highlights_from_catalogue(db, days=days)
+
+
+@router.post("/backfill-teams")
+def backfill_teams(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Resolve team ids for matches and favourites stored before the teams table existed"""
+    return backfill_team_ids(db)
+
+
 @router.get("/debug-youtube-keys")
 def debug_youtube_keys():
     """Debug endpoint to check if YouTube API keys are loaded"""
@@ -394,29 +406,59 @@ def debug_youtube_keys():
     
     settings = get_settings()
     keys = settings.get_youtube_keys_list()
+    youtube_service = get_youtube_service()
     
     return {
         "youtube_api_keys_configured": len(keys) > 0,
         "number_of_keys": len(keys),
+        "active_key_number": youtube_service.current_key_index + 1,
         "keys_preview": [f"{k[:10]}...{k[-5:]}" for k in keys] if keys else [],
         "raw_env_value": settings.youtube_api_keys[:50] + "..." if settings.youtube_api_keys else "NOT SET"
     }
 
 
+@router.get("/upstreams")
+def get_upstream_states() -> Dict[str, Any]:
+    """Rate limiter and circuit breaker state for each third-party API (this process only)"""
+    return {"upstreams": upstream_states()}
+
+
+@router.get("/websub")
+def get_websub_subscriptions(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """WebSub subscription and lease state for each YouTube channel"""
+    return {"enabled": get_settings().websub_enabled(), "subscriptions": subscription_states(db)}
+
+
+@router.post("/websub/renew")
+async def trigger_websub_renewal(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Subscribe missing channels and renew expiring leases now"""
+    return await renew_subscriptions(db)
+
+
+@router.post("/upstreams/{name}/reset")
+def reset_upstream(name: str) -> Dict[str, Any]:
+    """Close an upstream's circuit breaker, e.g. once a known outage is over"""
+    if name not in UPSTREAMS:
+        raise HTTPException(status_code=404, detail=f"Unknown upstream: {name}")
+    upstream = UPSTREAMS[name]
+    upstream.breaker.reset()
+    return upstream.state()
+
+
 @router.post("/prefetch-matches")
-async def trigger_prefetch_matches(background_tasks: BackgroundTasks):
+def trigger_prefetch_matches(db: Session = Depends(get_db)):
     """
     Manually trigger the prefetch_upcoming_matches job.
     This fetches matches from all sports APIs (Football, IPL, NBA, Tennis, NHL, NFL, MLB, FIFA).
-    Runs in background.
+    Queued for the task worker; poll /api/tasks/{task_id} for its status.
     """
-    from ..scheduler import prefetch_upcoming_matches
-    
-    background_tasks.add_task(prefetch_upcoming_matches)
+    task = enqueue_task(db, "prefetch_matches")
     
     return {
         "success": True,
-        "message": "Prefetch job started in background",
+        "task_id": task.id,
+        "status": task.status,
+        "message": "Prefetch job queued",
         "note": "This will fetch matches from all sports APIs (Football, IPL, NBA, Tennis, NHL, NFL, MLB, FIFA)"
     }
 
@@ -555,28 +597,18 @@ def add_fifa_highlight(
         if not match:
             return {"success": False, "error": f"Match not found: {home_team} vs {away_team}"}
         
-        # Check if highlight already exists
-        existing = db.query(models.Highlight).filter(
-            models.Highlight.match_id == match.id,
-            models.Highlight.youtube_video_id == video_id
-        ).first()
+        # Create the highlight, unless the match already has this video
+        inserted = insert_highlights(db, [highlight_row(match.id, {
+            "video_id": video_id,
+            "title": title or f"{home_team} vs {away_team} - Extended Highlights",
+            "description": f"FIFA World Cup 2026: {home_team} vs {away_team}",
+            "thumbnail_url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+            "channel_title": "FOX Sports"
+        })])
         
-        if existing:
+        if not inserted:
             return {"success": False, "error": "Highlight already exists for this match"}
         
-        # Create the highlight
-        highlight = models.Highlight(
-            match_id=match.id,
-            youtube_video_id=video_id,
-            title=title or f"{home_team} vs {away_team} - Extended Highlights",
-            description=f"FIFA World Cup 2026: {home_team} vs {away_team}",
-            thumbnail_url=f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
-            channel_title="FOX Sports"
-        )
-        
-        db.add(highlight)
-        db.commit()
-        
         return {
             "success": True,
             "message": f"Highlight added for {home_team} vs {away_team}",
@@ -589,130 +621,19 @@ def add_fifa_highlight(
 
 
 @router.post("/fetch-fifa-highlights")
-async def fetch_fifa_highlights(background_tasks: BackgroundTasks) -> Dict[str, Any]:
+def fetch_fifa_highlights(db: Session = Depends(get_db)) -> Dict[str, Any]:
     """
     FIFA World Cup highlight fetching - searches ONLY in FOX Sports channel.
-    Fetches matches from ESPN API and searches FOX channel for "{Team1} vs {Team2} Extended Highlights"
+    Searches FOX channel for "{Team1} vs {Team2} Extended Highlights".
+    Queued for the task worker; poll /api/tasks/{task_id} for its status.
     """
-    async def fetch_fifa_highlights_task():
-        try:
-            from ..youtube_service import get_youtube_service, YouTubeQuotaExhaustedError
-            from datetime import datetime, timedelta
-            from googleapiclient.errors import HttpError
-            
-            youtube_service = get_youtube_service()
-            db = next(get_db())
-            
-            # FOX Sports YouTube channel ID
-            FOX_SPORTS_CHANNEL_ID = "UCwNqHDsnBCKT-olwJwIFyfg"
-            
-            # Get all FIFA World Cup matches without highlights
-            fifa_league = db.query(models.League).filter(
-                models.League.slug == "fifa-world-cup"
-            ).first()
-            
-            if not fifa_league:
-                print("[FIFA] FIFA World Cup league not found")
-                return
-            
-            # Get matches from last 60 days that are finished and don't have highlights
-            sixty_days_ago = datetime.utcnow().date() - timedelta(days=60)
-            all_matches = db.query(models.Match).filter(
-                models.Match.league_id == fifa_league.id,
-                models.Match.match_date >= sixty_days_ago,
-                models.Match.status == "finished"
-            ).all()
-            
-            # Filter to only matches without highlights
-            matches_needing_highlights = []
-            for match in all_matches:
-                existing_count = db.query(models.Highlight).filter(
-                    models.Highlight.match_id == match.id
-                ).count()
-                if existing_count == 0:
-                    matches_needing_highlights.append(match)
-            
-            print(f"[FIFA] Found {len(matches_needing_highlights)} finished FIFA matches needing highlights")
-            
-            highlights_found = 0
-            for match in matches_needing_highlights:
-                try:
-                    # Use search().list() with channelId to search WITHIN FOX Sports channel only
-                    # search().list() supports q= parameter - costs 100 units but scoped to 1 channel
-                    query = f"{match.home_team} vs {match.away_team} Extended Highlights"
-                    print(f"[FIFA] Searching FOX Sports channel for: {query}")
-                    
-                    response = youtube_service.youtube.search().list(
-                        part='snippet',
-                        channelId=FOX_SPORTS_CHANNEL_ID,
-                        q=query,
-                        type='video',
-                        maxResults=5,
-                        order='relevance'
-                    ).execute()
-                    
-                    videos_added = 0
-                    
-                    for item in response.get('items', []):
-                        snippet = item['snippet']
-                        video_id = item['id']['videoId']
-                        title = snippet['title']
-                        
-                        # Filter: must contain both team names AND "extended highlights"
-                        title_lower = title.lower()
-                        home_in_title = match.home_team.lower() in title_lower
-                        away_in_title = match.away_team.lower() in title_lower
-                        has_extended = 'extended highlights' in title_lower
-                        
-                        if home_in_title and away_in_title and has_extended:
-                            # Check if already exists
-                            existing = db.query(models.Highlight).filter(
-                                models.Highlight.match_id == match.id,
-                                models.Highlight.youtube_video_id == video_id
-                            ).first()
-                            
-                            if not existing:
-                                new_highlight = models.Highlight(
-                                    match_id=match.id,
-                                    youtube_video_id=video_id,
-                                    title=title,
-                                    description=snippet.get('description', ''),
-                                    thumbnail_url=snippet['thumbnails'].get('high', {}).get('url') or
-                                                  snippet['thumbnails'].get('medium', {}).get('url'),
-                                    channel_title=snippet.get('channelTitle', 'FOX Sports'),
-                                    published_at=snippet.get('publishedAt')
-                                )
-                                db.add(new_highlight)
-                                videos_added += 1
-                                highlights_found += 1
-                                print(f"[FIFA] ✓ Added from FOX Sports: {title[:70]}")
-                    
-                    if videos_added > 0:
-                        db.commit()
-                    else:
-                        print(f"[FIFA] ✗ No highlights found in FOX Sports for {match.home_team} vs {match.away_team}")
-                        
-                except HttpError as e:
-                    if 'quotaExceeded' in str(e):
-                        print(f"[FIFA] YouTube quota exhausted - stopping fetch")
-                        break
-                    else:
-                        print(f"[FIFA] YouTube API error: {e}")
-                        continue
-                except Exception as e:
-                    print(f"[FIFA] Error fetching highlights for {match.home_team} vs {match.away_team}: {e}")
-                    continue
-            
-            print(f"[FIFA] ✅ Highlight fetch complete! Found {highlights_found} new highlights from FOX Sports")
-            
-        except Exception as e:
-            print(f"[FIFA] Error during FIFA highlight fetch: {e}")
-    
-    background_tasks.add_task(fetch_fifa_highlights_task)
+    task = enqueue_task(db, "fetch_fifa_highlights")
     
     return {
         "success": True,
-        "message": "FIFA highlight fetch job started in background",
+        "task_id": task.id,
+        "status": task.status,
+        "message": "FIFA highlight fetch job queued",
         "note": "Searching FOX Sports channel for '{Team1} vs {Team2} Extended Highlights' - zero token waste"
     }
 
@@ -1056,12 +977,12 @@ async def add_sample_matches(db: Session = Depends(get_db), fetch_highlights: bo
             from ..youtube_service import get_youtube_service, YouTubeQuotaExhaustedError
             
             youtube_service = get_youtube_service()
-            highlights_found = 0
+            rows = []
             
             # Get all newly created matches without highlights
             matches_without_highlights = db.query(models.Match).filter(
                 models.Match.status == 'finished',
-                ~models.Match.highlights.any()
+                models.Match.highlight_count == 0
             ).all()
             
             for match in matches_without_highlights:
@@ -1070,7 +991,8 @@ async def add_sample_matches(db: Session = Depends(get_db), fetch_highlights: bo
                 try:
                     print(f"[Admin] Searching highlights: {match.home_team} vs {match.away_team}")
                     
-                    videos = youtube_service.search_highlights(
+                    videos = await asyncio.to_thread(
+                        youtube_service.search_highlights,
                         home_team=match.home_team,
                         away_team=match.away_team,
                         league=league_name,
@@ -1079,21 +1001,7 @@ async def add_sample_matches(db: Session = Depends(get_db), fetch_highlights: bo
                     )
                     
                     if videos:
-                        for video in videos:
-                            highlight = models.Highlight(
-                                match_id=match.id,
-                                youtube_video_id=video['video_id'],
-                                title=video['title'],
-                                description=video.get('description', ''),
-                                thumbnail_url=video.get('thumbnail_url', ''),
-                                channel_title=video.get('channel_title', ''),
-                                published_at=video.get('published_at'),
-                                view_count=video.get('view_count', 0),
-                                duration=video.get('duration', '')
-                            )
-                            db.add(highlight)
-                        db.commit()
-                        highlights_found += len(videos)
+                        rows.extend(highlight_row(match.id, video) for video in videos)
                         print(f"[Admin] ✓ Found {len(videos)} highlights for {match.home_team} vs {match.away_team}")
                     else:
                         print(f"[Admin] ✗ No highlights found for {match.home_team} vs {match.away_team}")
@@ -1105,6 +1013,7 @@ async def add_sample_matches(db: Session = Depends(get_db), fetch_highlights: bo
                     print(f"[Admin] Error fetching highlight for {match.home_team} vs {match.away_team}: {e}")
                     continue
             
+            highlights_found = len(insert_highlights(db, rows))
             result["highlights_found"] = highlights_found
             print(f"[Admin] Highlight fetch complete! Found {highlights_found} highlights")
             
@@ -1193,9 +1102,11 @@ def remove_duplicate_highlights(db: Session = Depends(get_db)) -> Dict[str, Any]
         "details": []
     }
     
+    removed = []
+    
     try:
         # Get all matches with highlights
-        matches = db.query(models.Match).all()
+        matches = db.query(models.Match).filter(models.Match.highlight_count > 1).all()
         
         for match in matches:
             if not match.highlights:
@@ -1215,6 +1126,7 @@ def remove_duplicate_highlights(db: Session = Depends(get_db)) -> Dict[str, Any]
             
             # Remove duplicates
             for duplicate in duplicates:
+                removed.append(duplicate)
                 db.delete(duplicate)
                 result["duplicates_removed"] += 1
                 result["details"].append({
@@ -1223,6 +1135,7 @@ def remove_duplicate_highlights(db: Session = Depends(get_db)) -> Dict[str, Any]
                     "title": duplicate.title
                 })
         
+        refresh_highlight_counters(db, {d.match_id for d in removed})
         db.commit()
         print(f"[Admin] Removed {result['duplicates_removed']} duplicate highlights")
         
@@ -1254,6 +1167,7 @@ def clear_all_songs(db: Session = Depends(get_db)) -> Dict[str, Any]:
         db.execute(text("ALTER SEQUENCE songs_id_seq RESTART WITH 1"))
         
         db.commit()
+        get_suggest_index().remove_type("song")
         print(f"[Admin] Cleared {result['songs_deleted']} songs from database")
         
     except Exception as e:
@@ -1297,6 +1211,7 @@ def add_movie_songs(
             artist_row = artist_result.fetchone()
         
         artist_id = artist_row.id
+        added_songs = []
         
         # Add each song
         for url in url_list:
@@ -1310,9 +1225,10 @@ def add_movie_songs(
                 video_id = video_id_match.group(1)
                 
                 # Insert song
-                db.execute(text("""
+                inserted = db.execute(text("""
                     INSERT INTO songs (title, language, year, artist_id, youtube_video_id, album)
                     VALUES (:title, :language, :year, :artist_id, :video_id, :album)
+                    RETURNING id, title
                 """), {
                     "title": f"{movie} Song",
                     "language": "HINDI",
@@ -1320,14 +1236,21 @@ def add_movie_songs(
                     "artist_id": artist_id,
                     "video_id": video_id,
                     "album": movie
-                })
+                }).fetchone()
                 
+                added_songs.append(inserted)
                 result["songs_added"] += 1
                 
             except Exception as e:
                 result["failed"].append({"url": url, "error": str(e)})
         
         db.commit()
+        
+        suggest_index = get_suggest_index()
+        suggest_index.add("artist", artist_id, "Various Artists")
+        for song in added_songs:
+            suggest_index.add("song", song.id, song.title)
+        
         print(f"[Admin] Added {result['songs_added']} songs for {movie}")
         
     except Exception as e:
@@ -1,6 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-import yt_dlp
 import asyncio
 import logging
 from typing import Optional, Dict, Any
@@ -78,6 +77,9 @@ class AudioExtractor:
     
     def _extract_info(self, url: str) -> Optional[Dict]:
         """Synchronous wrapper for yt-dlp"""
+        # Imported lazily: yt-dlp is heavy and these endpoints are retired (410)
+        import yt_dlp
+        
         try:
             with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
                 return ydl.extract_info(url, download=False)
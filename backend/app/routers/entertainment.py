@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from typing import List, Optional
-from ..database import get_db
+from ..database import get_db, is_postgres
+from ..pagination import decode_cursor, next_cursor
 from pydantic import BaseModel
 
 router = APIRouter(
@@ -30,6 +31,42 @@ class Entertainment(BaseModel):
         from_attributes = True
 
 
+class EntertainmentListResponse(BaseModel):
+    items: List[Entertainment]
+    next_cursor: Optional[str] = None
+    page_size: int
+
+
+def _page_sort_key(db: Session) -> str:
+    """
+    created_at is nullable; the same expression orders pages, builds cursors and
+    is indexed (add_catalogue_pagination_indexes.sql), so NULL rows sort last
+    instead of ending pagination early
+    """
+    if is_postgres(db):
+        return "COALESCE(created_at, TIMESTAMP '1970-01-01')"
+    return "COALESCE(created_at, '1970-01-01 00:00:00')"
+
+
+def _row_to_entertainment(row) -> Entertainment:
+    return Entertainment(
+        id=row.id,
+        title=row.title,
+        youtube_video_id=row.youtube_video_id,
+        description="",  # Not available in production DB
+        content_type=row.content_type,
+        start_seconds=row.start_seconds,
+        end_seconds=row.end_seconds,
+        duration=0,  # Not available in production DB
+        thumbnail_url="",  # Not available in production DB
+        channel_title="",  # Not available in production DB
+        view_count=0,  # Not available in production DB
+        tags=[],  # Not available in production DB
+        is_featured=False  # Not available in production DB
+    )
+
+
+
 @router.get("/", response_model=List[Entertainment])
 async def get_entertainment(
     content_type: Optional[str] = Query(None, description="Filter by content type (fun, comedy, viral, meme, etc.)"),
@@ -88,31 +125,85 @@ async def get_entertainment(
     
     # Execute query
     result = db.execute(text(query), params)
-    entertainment_items = []
-    
-    for row in result:
-        entertainment_items.append(Entertainment(
-            id=row.id,
-            title=row.title,
-            youtube_video_id=row.youtube_video_id,
-            description="",  # Not available in production DB
-            content_type=row.content_type,
-            start_seconds=row.start_seconds,
-            end_seconds=row.end_seconds,
-            duration=0,  # Not available in production DB
-            thumbnail_url="",  # Not available in production DB
-            channel_title="",  # Not available in production DB
-            view_count=0,  # Not available in production DB
-            tags=[],  # Not available in production DB
-            is_featured=False  # Not available in production DB
-        ))
-    
-    return entertainment_items
+    return [_row_to_entertainment(row) for row in result]
+
+
+@router.get("/page", response_model=EntertainmentListResponse)
+async def get_entertainment_page(
+    content_type: Optional[str] = Query(None, description="Filter by content type (fun, comedy, viral, meme, etc.)"),
+    search: Optional[str] = Query(None, description="Search in title"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=500, description="Number of items per page"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get entertainment content with keyset pagination, newest first.
+    
+    Pages are ordered by (created_at, id) so rows never shift between pages;
+    rows without created_at come last. Pass the returned **next_cursor** back
+    as **cursor** to fetch the following page.
+    """
+    sort_key = _page_sort_key(db)
+    
+    query = f"""
+        SELECT 
+            id,
+            title,
+            youtube_video_id,
+            content_type,
+            start_seconds,
+            end_seconds,
+            created_at,
+            updated_at,
+            {sort_key} AS sort_at
+        FROM entertainment
+        WHERE 1=1
+    """
+    
+    params = {}
+    
+    if content_type:
+        query += " AND content_type = :content_type"
+        params['content_type'] = content_type.lower()
+    
+    if search:
+        query += " AND title ILIKE :search"
+        params['search'] = f"%{search}%"
+    
+    if cursor:
+        try:
+            last_created_at, last_id = decode_cursor(cursor, 2)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query += f" AND ({sort_key}, id) < (:last_created_at, :last_id)"
+        params['last_created_at'] = last_created_at
+        params['last_id'] = last_id
+    
+    query += f" ORDER BY {sort_key} DESC, id DESC LIMIT :limit"
+    params['limit'] = limit
+    
+    rows = db.execute(text(query), params).fetchall()
+    
+    return EntertainmentListResponse(
+        items=[_row_to_entertainment(row) for row in rows],
+        next_cursor=next_cursor(rows, limit, "sort_at", "id"),
+        page_size=limit
+    )
 
 
 @router.get("/types")
 async def get_content_types(db: Session = Depends(get_db)):
     """Get all available content types"""
+    if is_postgres(db):
+        # Served from the trigger-maintained counters (migrations/add_catalogue_counters.sql)
+        result = db.execute(text("""
+            SELECT key AS content_type, count
+            FROM catalogue_counters
+            WHERE scope = 'entertainment_type' AND count > 0
+            ORDER BY count DESC
+        """))
+        return [{"type": row.content_type, "count": row.count} for row in result]
+    
     result = db.execute(text("""
         SELECT content_type, COUNT(*) as count 
         FROM entertainment 
@@ -152,18 +243,4 @@ async def get_entertainment_by_id(entertainment_id: int, db: Session = Depends(g
     if not row:
         raise HTTPException(status_code=404, detail="Entertainment content not found")
     
-    return Entertainment(
-        id=row.id,
-        title=row.title,
-        youtube_video_id=row.youtube_video_id,
-        description="",  # Not available in production DB
-        content_type=row.content_type,
-        start_seconds=row.start_seconds,
-        end_seconds=row.end_seconds,
-        duration=0,  # Not available in production DB
-        thumbnail_url="",  # Not available in production DB
-        channel_title="",  # Not available in production DB
-        view_count=0,  # Not available in production DB
-        tags=[],  # Not available in production DB
-        is_featured=False  # Not available in production DB
-    )
\ No newline at end of file
+    return _row_to_entertainment(row)
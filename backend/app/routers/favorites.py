@@ -5,6 +5,7 @@ from ..database import get_db
 from ..models_users import User, UserFavoriteTeam
 from ..schemas_users import UserFavoriteTeamCreate, UserFavoriteTeamResponse
 from .auth import get_current_user
+from ..user_feed import rebuild_user_feed
 from .. import models
 
 router = APIRouter(prefix="/api/favorites", tags=["favorites"])
@@ -51,6 +52,7 @@ def add_favorite_team(
     
     db.add(favorite)
     db.commit()
+    rebuild_user_feed(db, current_user.id)
     db.refresh(favorite)
     
     return favorite
@@ -85,6 +87,7 @@ def add_favorite_teams_bulk(
     if new_favorites:
         db.add_all(new_favorites)
         db.commit()
+        rebuild_user_feed(db, current_user.id)
         for fav in new_favorites:
             db.refresh(fav)
     
@@ -117,6 +120,7 @@ def remove_favorite_team(
     
     db.delete(favorite)
     db.commit()
+    rebuild_user_feed(db, current_user.id)
     
     return {"message": "Team removed from favorites"}
 
@@ -133,6 +137,7 @@ def clear_favorite_teams(
     ).delete()
     
     db.commit()
+    rebuild_user_feed(db, current_user.id)
     
     return {"message": "All favorite teams cleared"}
 
@@ -165,6 +170,7 @@ def replace_favorite_teams(
             db.add_all(new_favorites)
         
         db.commit()
+        rebuild_user_feed(db, current_user.id)
         
         # Refresh all favorites to get IDs
         for fav in new_favorites:
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
 from datetime import date
 from ..database import get_db
@@ -8,6 +8,10 @@ from ..youtube_service import get_youtube_service, YouTubeQuotaExhaustedError
 from ..models_users import User, UserFavoriteTeam
 from .auth import get_current_user
 from ..geo_service import get_geo_service, GeoService
+from ..highlight_store import highlight_row, insert_highlights
+from ..teams import team_filter_clause
+from ..task_queue import enqueue_task
+from ..upstream_guard import guarded_execute
 
 router = APIRouter(prefix="/api/highlights", tags=["highlights"])
 
@@ -45,49 +49,43 @@ async def get_highlights_grouped(
         if country_code:
             print(f"[Highlights] Detected user country: {country_code} from IP: {client_ip}")
     
-    # Parse team names if provided
-    team_filter = None
-    if teams:
-        team_filter = set(t.strip() for t in teams.split(",") if t.strip())
+    # Resolve team names if provided
+    team_filter = team_filter_clause(db, teams)
     
-    # Query leagues with optional league_slug filter
-    query = db.query(models.League).options(
-        joinedload(models.League.matches).joinedload(models.Match.highlights)
+    # Only matches that have highlights AND fall within the date range
+    # (served by the partial index ix_matches_with_highlights)
+    query = db.query(models.Match).options(
+        joinedload(models.Match.league),
+        selectinload(models.Match.highlights)
+    ).filter(
+        models.Match.highlight_count > 0,
+        models.Match.match_date >= start_date,
+        models.Match.match_date <= end_date
     )
     
     if league_slug:
-        query = query.filter(models.League.slug == league_slug)
+        query = query.join(models.League).filter(models.League.slug == league_slug)
     
-    leagues = query.order_by(models.League.display_order).all()
+    # If team filter is provided, only include matches with those teams
+    if team_filter is not None:
+        query = query.filter(team_filter)
+    
+    matches_by_league = {}
+    for m in query.order_by(models.Match.id).all():
+        # Filter highlights by country availability
+        if country_code:
+            m = _filter_match_highlights_by_country(m, country_code)
+        if len(m.highlights) > 0:  # Only add if has available highlights
+            matches_by_league.setdefault(m.league_id, (m.league, []))[1].append(m)
     
     result = []
-    for league in leagues:
-        matches_with_highlights = []
-        for m in league.matches:
-            # Only include matches that have highlights AND fall within the date range
-            if start_date <= m.match_date <= end_date and len(m.highlights) > 0:
-                # If team filter is provided, only include matches with those teams
-                if team_filter:
-                    if m.home_team in team_filter or m.away_team in team_filter:
-                        # Filter highlights by country availability
-                        if country_code:
-                            m = _filter_match_highlights_by_country(m, country_code)
-                        if len(m.highlights) > 0:  # Only add if has available highlights
-                            matches_with_highlights.append(m)
-                else:
-                    # Filter highlights by country availability
-                    if country_code:
-                        m = _filter_match_highlights_by_country(m, country_code)
-                    if len(m.highlights) > 0:  # Only add if has available highlights
-                        matches_with_highlights.append(m)
-        
-        if matches_with_highlights:
-            total_highlights = sum(len(m.highlights) for m in matches_with_highlights)
-            result.append(schemas.HighlightsGroupedByLeague(
-                league=league,
-                matches=matches_with_highlights,
-                total_highlights=total_highlights
-            ))
+    for league, matches_with_highlights in sorted(matches_by_league.values(), key=lambda entry: entry[0].display_order):
+        total_highlights = sum(len(m.highlights) for m in matches_with_highlights)
+        result.append(schemas.HighlightsGroupedByLeague(
+            league=league,
+            matches=matches_with_highlights,
+            total_highlights=total_highlights
+        ))
     
     return result
 
@@ -142,108 +140,55 @@ def fetch_all_highlights(
         )
     
     youtube_service = get_youtube_service()
-    total_highlights = 0
+    rows = []
     
     for match in matches:
-        existing_count = db.query(models.Highlight).filter(
-            models.Highlight.match_id == match.id
-        ).count()
-        
-        if existing_count > 0:
+        if match.highlight_count:
             continue
         
         try:
             videos = youtube_service.search_highlights(match.home_team, match.away_team)
         except YouTubeQuotaExhaustedError as e:
+            # Keep what was found before the quota ran out
             return schemas.YouTubeSearchResponse(
                 success=False,
                 message=str(e),
-                highlights_found=total_highlights
+                highlights_found=len(insert_highlights(db, rows))
             )
         
-        for video in videos:
-            existing = db.query(models.Highlight).filter(
-                models.Highlight.youtube_video_id == video['video_id']
-            ).first()
-            
-            if not existing:
-                highlight = models.Highlight(
-                    match_id=match.id,
-                    youtube_video_id=video['video_id'],
-                    title=video['title'],
-                    description=video.get('description'),
-                    thumbnail_url=video.get('thumbnail_url'),
-                    channel_title=video.get('channel_title'),
-                    view_count=video.get('view_count'),
-                    duration=video.get('duration'),
-                    is_official=video.get('is_official', False)
-                )
-                db.add(highlight)
-                total_highlights += 1
+        rows.extend(highlight_row(match.id, video) for video in videos)
     
-    db.commit()
+    inserted = insert_highlights(db, rows)
     
     return schemas.YouTubeSearchResponse(
         success=True,
         message=f"Fetched highlights for {len(matches)} matches",
-        highlights_found=total_highlights
+        highlights_found=len(inserted)
     )
 
 
-@router.post("/refresh/{match_id}", response_model=schemas.YouTubeSearchResponse)
+@router.post("/refresh/{match_id}", response_model=schemas.QueuedYouTubeSearchResponse)
 def refresh_match_highlights(
     match_id: int,
     db: Session = Depends(get_db)
 ):
-    """Delete existing highlights for a match and fetch fresh ones from YouTube"""
-    match = db.query(models.Match).options(
-        joinedload(models.Match.league)
-    ).filter(models.Match.id == match_id).first()
+    """
+    Queue a refresh of a match's highlights: the task worker deletes the
+    existing highlights and fetches fresh ones from YouTube.
+    """
+    match = db.query(models.Match).filter(models.Match.id == match_id).first()
     
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     
-    # Delete existing highlights for this match
-    db.query(models.Highlight).filter(models.Highlight.match_id == match_id).delete()
-    db.commit()
+    task = enqueue_task(db, "fetch_match_highlights", {"match_id": match.id, "replace_existing": True})
     
-    # Fetch fresh highlights
-    youtube_service = get_youtube_service()
-    try:
-        videos = youtube_service.search_highlights(
-            match.home_team, 
-            match.away_team,
-            league=match.league.name if match.league else None
-        )
-    except YouTubeQuotaExhaustedError as e:
-        return schemas.YouTubeSearchResponse(
-            success=False,
-            message=str(e),
-            highlights_found=0
-        )
-    
-    total_highlights = 0
-    for video in videos:
-        highlight = models.Highlight(
-            match_id=match.id,
-            youtube_video_id=video['video_id'],
-            title=video['title'],
-            description=video.get('description'),
-            thumbnail_url=video.get('thumbnail_url'),
-            channel_title=video.get('channel_title'),
-            view_count=video.get('view_count'),
-            duration=video.get('duration'),
-            is_official=video.get('is_official', False)
-        )
-        db.add(highlight)
-        total_highlights += 1
-    
-    db.commit()
-    
-    return schemas.YouTubeSearchResponse(
+    return schemas.QueuedYouTubeSearchResponse(
         success=True,
-        message=f"Refreshed highlights for {match.home_team} vs {match.away_team}",
-        highlights_found=total_highlights
+        message=f"Highlight refresh queued for {match.home_team} vs {match.away_team}",
+        highlights_found=0,
+        task_id=task.id,
+        status=task.status
     )
 
 
@@ -263,10 +208,10 @@ def update_highlight(
     youtube_service = get_youtube_service()
     try:
         # Get video details
-        response = youtube_service.youtube.videos().list(
+        response = guarded_execute(youtube_service.youtube.videos().list(
             part='snippet,statistics,contentDetails',
             id=youtube_video_id
-        ).execute()
+        ))
         
         if not response.get('items'):
             raise HTTPException(status_code=404, detail="YouTube video not found")
@@ -303,19 +248,17 @@ def get_recent_highlights_by_league(
     db: Session = Depends(get_db)
 ):
     """Get recent highlights for a league, ordered by match date (desc), limited by 'limit' param."""
-    league = db.query(models.League).options(
-        joinedload(models.League.matches).joinedload(models.Match.highlights)
-    ).filter(models.League.slug == league_slug).first()
+    league = db.query(models.League).filter(models.League.slug == league_slug).first()
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
-    # Only matches with highlights
-    matches_with_highlights = [
-        m for m in league.matches if len(m.highlights) > 0
-    ]
-    matches_with_highlights.sort(key=lambda x: x.match_date, reverse=True)
-    # Limit the number of matches returned
-    matches_with_highlights = matches_with_highlights[:limit]
-    total_highlights = sum(len(m.highlights) for m in matches_with_highlights)
+    # Only matches with highlights, newest first, limited in the query
+    matches_with_highlights = db.query(models.Match).options(
+        selectinload(models.Match.highlights)
+    ).filter(
+        models.Match.league_id == league.id,
+        models.Match.highlight_count > 0
+    ).order_by(models.Match.match_date.desc()).limit(limit).all()
+    total_highlights = sum(m.highlight_count for m in matches_with_highlights)
     return schemas.HighlightsGroupedByLeague(
         league=league,
         matches=matches_with_highlights,
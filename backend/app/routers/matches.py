@@ -7,6 +7,10 @@ from .. import models, schemas
 from ..football_api import get_football_api
 from ..youtube_service import get_youtube_service, YouTubeQuotaExhaustedError
 from ..config import match_has_team_of_interest
+from ..task_queue import enqueue_task, enqueue_task_once
+from ..fetch_ledger import PREFETCH_DAYS, stale_league_slugs
+from ..highlight_store import highlight_row, insert_highlights
+from ..teams import find_match_by_teams, team_filter_clause
 from ..models_users import User, UserFavoriteTeam
 from .auth import get_current_user
 
@@ -32,17 +36,12 @@ def get_matches(
     if league_slug:
         query = query.join(models.League).filter(models.League.slug == league_slug)
     
-    matches = query.order_by(models.Match.match_date.desc(), models.Match.match_time).all()
-    
     # Apply team filtering if needed
-    if teams:
-        team_filter = set(t.strip() for t in teams.split(",") if t.strip())
-        matches = [
-            m for m in matches
-            if m.home_team in team_filter or m.away_team in team_filter
-        ]
-    
-    return matches
+    team_filter = team_filter_clause(db, teams)
+    if team_filter is not None:
+        query = query.filter(team_filter)
+    
+    return query.order_by(models.Match.match_date.desc(), models.Match.match_time).all()
 
 
 def get_yesterday() -> date:
@@ -63,167 +62,64 @@ def get_date_label(target_date: date) -> str:
         return target_date.strftime("%A, %b %d")
 
 
-async def _fetch_and_store_matches_for_date(target_date: date, db: Session) -> List[schemas.UpcomingMatch]:
-    """Fetch matches from ESPN API and store in database, return upcoming matches"""
-    football_api = get_football_api()
-    upcoming_matches = []
-    
-    try:
-        fixtures_by_league = await football_api.get_matches_for_date(target_date)
-        
-        for league_name, matches in fixtures_by_league.items():
-            # Get or create league
-            league_info = models.LEAGUE_MAPPINGS.get(league_name, {
-                "slug": league_name.lower().replace(" ", "-"),
-                "country": "Unknown"
-            })
-            
-            db_league = db.query(models.League).filter(
-                models.League.slug == league_info["slug"]
-            ).first()
-            
-            if not db_league:
-                db_league = models.League(
-                    name=league_name,
-                    slug=league_info["slug"],
-                    country=league_info.get("country"),
-                    display_order=0
-                )
-                db.add(db_league)
-                db.commit()
-                db.refresh(db_league)
-            
-            for match in matches:
-                # Check if match already exists
-                existing = db.query(models.Match).filter(
-                    models.Match.espn_event_id == match.get("espn_event_id")
-                ).first() if match.get("espn_event_id") else None
-                
-                if not existing:
-                    # Also check by teams and date
-                    existing = db.query(models.Match).filter(
-                        models.Match.home_team == match["home_team"],
-                        models.Match.away_team == match["away_team"],
-                        models.Match.match_date == target_date
-                    ).first()
-                
-                if existing:
-                    # Update status if changed
-                    if existing.status != match["status"]:
-                        existing.status = match["status"]
-                        existing.home_score = match.get("home_score")
-                        existing.away_score = match.get("away_score")
-                        db.commit()
-                else:
-                    # Create new match
-                    new_match = models.Match(
-                        league_id=db_league.id,
-                        home_team=match["home_team"],
-                        away_team=match["away_team"],
-                        home_score=match.get("home_score"),
-                        away_score=match.get("away_score"),
-                        match_date=target_date,
-                        match_time=match.get("match_time"),
-                        status=match["status"],
-                        espn_event_id=match.get("espn_event_id")
-                    )
-                    db.add(new_match)
-                    db.commit()
-                
-                # Filter by teams of interest for upcoming display
-                if match_has_team_of_interest(match["home_team"], match["away_team"], league_name):
-                    # For today: include all matches. For future: only scheduled/live
-                    is_today = target_date == date.today()
-                    if is_today or match["status"] in ["scheduled", "live"]:
-                        upcoming_matches.append(schemas.UpcomingMatch(
-                            home_team=match["home_team"],
-                            away_team=match["away_team"],
-                            home_score=match.get("home_score"),
-                            away_score=match.get("away_score"),
-                            match_date=match["match_date"],
-                            match_time=match["match_time"],
-                            league_name=league_name,
-                            status=match["status"]
-                        ))
-    except Exception as e:
-        print(f"Error fetching matches for {target_date}: {e}")
-    
-    # Mark this date as fetched (even if no matches)
-    fetched_record = models.FetchedDate(fetch_date=target_date)
-    db.merge(fetched_record)
-    try:
-        db.commit()
-    except:
-        db.rollback()  # Date already exists
-    
-    return upcoming_matches
-
-
 @router.get("/upcoming", response_model=List[schemas.UpcomingMatchesByDate])
-async def get_upcoming_matches(
+def get_upcoming_matches(
     days: int = Query(default=7, ge=1, le=14),
     teams: Optional[str] = Query(default=None, description="Comma-separated list of team names to filter"),
     db: Session = Depends(get_db),
 ):
-    """Get upcoming matches of interest for the next N days (from DB, fetches from ESPN if needed)"""
+    """
+    Get upcoming matches of interest for the next N days from the DB.
+    
+    If the fetch ledger has stale league-days in the prefetch window, a
+    prefetch_matches task is queued (once) to refresh them in the background.
+    """
     today = date.today()
+    football_api = get_football_api()
     result = []
     
+    if any(
+        stale_league_slugs(db, today + timedelta(days=i), football_api.LEAGUES)
+        for i in range(min(days, PREFETCH_DAYS))
+    ):
+        enqueue_task_once(db, "prefetch_matches")
+    
     # Parse team filter if provided
-    team_filter = None
-    if teams:
-        team_filter = set(t.strip() for t in teams.split(",") if t.strip())
+    team_filter = team_filter_clause(db, teams)
     
     for i in range(days):
         target_date = today + timedelta(days=i)
         
-        # Check if we've already fetched this date
-        already_fetched = db.query(models.FetchedDate).filter(
-            models.FetchedDate.fetch_date == target_date
-        ).first()
+        query = db.query(models.Match).filter(
+            models.Match.match_date == target_date
+        )
+        # Apply team filter if provided
+        if team_filter is not None:
+            query = query.filter(team_filter)
+        db_matches = query.all()
         
-        if already_fetched:
-            # Use cached data from DB
-            db_matches = db.query(models.Match).filter(
-                models.Match.match_date == target_date
-            ).all()
+        upcoming_matches = []
+        for match in db_matches:
+            league_name = match.league.name if match.league else "Unknown"
             
-            upcoming_matches = []
-            for match in db_matches:
-                league_name = match.league.name if match.league else "Unknown"
-                
-                # Apply team filter if provided
-                if team_filter and not (match.home_team in team_filter or match.away_team in team_filter):
-                    continue
-                
-                # If no team filter, use existing logic
-                if not team_filter and not match_has_team_of_interest(match.home_team, match.away_team, league_name):
-                    continue
-                
-                # For today: include all matches (scheduled, live, finished)
-                # For future dates: only scheduled and live
-                is_today = target_date == today
-                if is_today or match.status in ["scheduled", "live"]:
-                    upcoming_matches.append(schemas.UpcomingMatch(
-                        home_team=match.home_team,
-                        away_team=match.away_team,
-                        home_score=match.home_score,
-                        away_score=match.away_score,
-                        match_date=match.match_date,
-                        match_time=match.match_time,
-                        league_name=league_name,
-                        status=match.status
-                    ))
-        else:
-            # Fetch from ESPN API and store in DB
-            upcoming_matches = await _fetch_and_store_matches_for_date(target_date, db)
+            # If no team filter, use existing logic
+            if team_filter is None and not match_has_team_of_interest(match.home_team, match.away_team, league_name):
+                continue
             
-            # Apply team filter to fetched matches if provided
-            if team_filter:
-                upcoming_matches = [
-                    m for m in upcoming_matches
-                    if m.home_team in team_filter or m.away_team in team_filter
-                ]
+            # For today: include all matches (scheduled, live, finished)
+            # For future dates: only scheduled and live
+            is_today = target_date == today
+            if is_today or match.status in ["scheduled", "live"]:
+                upcoming_matches.append(schemas.UpcomingMatch(
+                    home_team=match.home_team,
+                    away_team=match.away_team,
+                    home_score=match.home_score,
+                    away_score=match.away_score,
+                    match_date=match.match_date,
+                    match_time=match.match_time,
+                    league_name=league_name,
+                    status=match.status
+                ))
         
         if upcoming_matches:
             # Sort by time
@@ -298,11 +194,7 @@ async def scrape_matches(
                     ).first()
                 
                 if not existing:
-                    existing = db.query(models.Match).filter(
-                        models.Match.home_team == match_data["home_team"],
-                        models.Match.away_team == match_data["away_team"],
-                        models.Match.match_date == match_data["match_date"]
-                    ).first()
+                    existing = find_match_by_teams(db, match_data["home_team"], match_data["away_team"], match_data["match_date"])
                 
                 if existing:
                     existing.home_score = match_data.get("home_score")
@@ -417,10 +309,7 @@ def preview_yesterday_highlights(db: Session = Depends(get_db)):
             continue
         
         # Skip if already has highlights
-        existing_count = db.query(models.Highlight).filter(
-            models.Highlight.match_id == match.id
-        ).count()
-        if existing_count > 0:
+        if match.highlight_count:
             continue
         
         matches_to_process.append(schemas.MatchForHighlights(
@@ -472,7 +361,7 @@ def confirm_yesterday_highlights(db: Session = Depends(get_db)):
         )
     
     youtube_service = get_youtube_service()
-    total_highlights = 0
+    rows = []
     matches_processed = 0
     matches_skipped = 0
     
@@ -485,10 +374,7 @@ def confirm_yesterday_highlights(db: Session = Depends(get_db)):
             continue
         
         # Skip if already has highlights
-        existing_count = db.query(models.Highlight).filter(
-            models.Highlight.match_id == match.id
-        ).count()
-        if existing_count > 0:
+        if match.highlight_count:
             continue
         
         matches_processed += 1
@@ -497,40 +383,23 @@ def confirm_yesterday_highlights(db: Session = Depends(get_db)):
         try:
             videos = youtube_service.search_highlights(match.home_team, match.away_team, league=league_name)
         except YouTubeQuotaExhaustedError as e:
+            # Keep what was found before the quota ran out
             return schemas.YouTubeSearchResponse(
                 success=False,
                 message=str(e),
-                highlights_found=total_highlights
+                highlights_found=len(insert_highlights(db, rows))
             )
         
         # Only take the first (best) video - one highlight per match
         if videos:
-            video = videos[0]
-            existing = db.query(models.Highlight).filter(
-                models.Highlight.youtube_video_id == video['video_id']
-            ).first()
-            
-            if not existing:
-                highlight = models.Highlight(
-                    match_id=match.id,
-                    youtube_video_id=video['video_id'],
-                    title=video['title'],
-                    description=video.get('description'),
-                    thumbnail_url=video.get('thumbnail_url'),
-                    channel_title=video.get('channel_title'),
-                    view_count=video.get('view_count'),
-                    duration=video.get('duration'),
-                    is_official=video.get('is_official', False)
-                )
-                db.add(highlight)
-                total_highlights += 1
+            rows.append(highlight_row(match.id, videos[0]))
     
-    db.commit()
+    inserted = insert_highlights(db, rows)
     
     return schemas.YouTubeSearchResponse(
         success=True,
         message=f"Fetched highlights for {matches_processed} matches ({matches_skipped} skipped - not teams of interest)",
-        highlights_found=total_highlights
+        highlights_found=len(inserted)
     )
 
 
@@ -554,7 +423,7 @@ def fetch_yesterday_highlights(db: Session = Depends(get_db)):
         )
     
     youtube_service = get_youtube_service()
-    total_highlights = 0
+    rows = []
     matches_processed = 0
     matches_skipped = 0
     
@@ -567,10 +436,7 @@ def fetch_yesterday_highlights(db: Session = Depends(get_db)):
             continue
         
         # Skip if already has highlights
-        existing_count = db.query(models.Highlight).filter(
-            models.Highlight.match_id == match.id
-        ).count()
-        if existing_count > 0:
+        if match.highlight_count:
             continue
         
         matches_processed += 1
@@ -579,40 +445,23 @@ def fetch_yesterday_highlights(db: Session = Depends(get_db)):
         try:
             videos = youtube_service.search_highlights(match.home_team, match.away_team, league=league_name)
         except YouTubeQuotaExhaustedError as e:
+            # Keep what was found before the quota ran out
             return schemas.YouTubeSearchResponse(
                 success=False,
                 message=str(e),
-                highlights_found=total_highlights
+                highlights_found=len(insert_highlights(db, rows))
             )
         
         # Only take the first (best) video - one highlight per match
         if videos:
-            video = videos[0]
-            existing = db.query(models.Highlight).filter(
-                models.Highlight.youtube_video_id == video['video_id']
-            ).first()
-            
-            if not existing:
-                highlight = models.Highlight(
-                    match_id=match.id,
-                    youtube_video_id=video['video_id'],
-                    title=video['title'],
-                    description=video.get('description'),
-                    thumbnail_url=video.get('thumbnail_url'),
-                    channel_title=video.get('channel_title'),
-                    view_count=video.get('view_count'),
-                    duration=video.get('duration'),
-                    is_official=video.get('is_official', False)
-                )
-                db.add(highlight)
-                total_highlights += 1
+            rows.append(highlight_row(match.id, videos[0]))
     
-    db.commit()
+    inserted = insert_highlights(db, rows)
     
     return schemas.YouTubeSearchResponse(
         success=True,
         message=f"Fetched highlights for {matches_processed} matches ({matches_skipped} skipped - not teams of interest)",
-        highlights_found=total_highlights
+        highlights_found=len(inserted)
     )
 
 
@@ -651,11 +500,7 @@ async def _store_fixtures(db: Session, fixtures_by_league: dict) -> tuple:
                 ).first()
             
             if not existing:
-                existing = db.query(models.Match).filter(
-                    models.Match.home_team == match_data["home_team"],
-                    models.Match.away_team == match_data["away_team"],
-                    models.Match.match_date == match_data["match_date"]
-                ).first()
+                existing = find_match_by_teams(db, match_data["home_team"], match_data["away_team"], match_data["match_date"])
             
             if existing:
                 existing.home_score = match_data.get("home_score")
@@ -694,49 +539,19 @@ def get_match(match_id: int, db: Session = Depends(get_db)):
     return match
 
 
-@router.post("/{match_id}/fetch-highlights", response_model=schemas.YouTubeSearchResponse)
+@router.post("/{match_id}/fetch-highlights", response_model=schemas.QueuedYouTubeSearchResponse)
 def fetch_highlights_for_match(match_id: int, db: Session = Depends(get_db)):
+    """Queue a YouTube highlight search for a match; the task worker runs it"""
     match = db.query(models.Match).filter(models.Match.id == match_id).first()
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     
-    youtube_service = get_youtube_service()
-    try:
-        videos = youtube_service.search_highlights(match.home_team, match.away_team)
-    except YouTubeQuotaExhaustedError as e:
-        return schemas.YouTubeSearchResponse(
-            success=False,
-            message=str(e),
-            highlights_found=0
-        )
-    
-    highlights_added = 0
-    # Only take the first (best) video - one highlight per match
-    if videos:
-        video = videos[0]
-        existing = db.query(models.Highlight).filter(
-            models.Highlight.youtube_video_id == video['video_id']
-        ).first()
-        
-        if not existing:
-            highlight = models.Highlight(
-                match_id=match.id,
-                youtube_video_id=video['video_id'],
-                title=video['title'],
-                description=video.get('description'),
-                thumbnail_url=video.get('thumbnail_url'),
-                channel_title=video.get('channel_title'),
-                view_count=video.get('view_count'),
-                duration=video.get('duration'),
-                is_official=video.get('is_official', False)
-            )
-            db.add(highlight)
-            highlights_added += 1
+    task = enqueue_task(db, "fetch_match_highlights", {"match_id": match.id})
     
-    db.commit()
-    
-    return schemas.YouTubeSearchResponse(
+    return schemas.QueuedYouTubeSearchResponse(
         success=True,
-        message=f"Found highlights for {match.home_team} vs {match.away_team}",
-        highlights_found=highlights_added
+        message=f"Highlight search queued for {match.home_team} vs {match.away_team}",
+        highlights_found=0,
+        task_id=task.id,
+        status=task.status
     )
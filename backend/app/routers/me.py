@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..database import get_db
+from .. import schemas
+from ..models_users import User
+from ..push_delivery import is_expo_token, register_device, unregister_device
+from ..schemas_users import PushDeviceRegister, PushDeviceResponse
+from ..user_feed import get_user_feed
+from .auth import get_current_user
+
+router = APIRouter(prefix="/api/me", tags=["me"])
+
+
+@router.get("/feed", response_model=schemas.FeedPage)
+def get_my_feed(
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    limit: int = Query(default=20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Timeline of new highlights (newest first) and then upcoming matches
+    (soonest first) for the user's favourite teams. Precomputed when matches
+    and highlights land, so this is an indexed read; page with next_cursor.
+    """
+    try:
+        items, next_cursor = get_user_feed(db, current_user.id, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return schemas.FeedPage(items=items, next_cursor=next_cursor)
+
+
+@router.post("/devices", response_model=PushDeviceResponse)
+def register_push_device(
+    device: PushDeviceRegister,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Register the Expo push token of this install of the mobile app. Safe to
+    call on every launch; a token already registered moves to this user.
+    """
+    if not is_expo_token(device.token):
+        raise HTTPException(status_code=400, detail="Not an Expo push token")
+    return register_device(db, current_user.id, device.token, device.platform)
+
+
+@router.delete("/devices/{token}")
+def unregister_push_device(
+    token: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stop pushing to a device, e.g. on sign-out"""
+    if not unregister_device(db, current_user.id, token):
+        raise HTTPException(status_code=404, detail="Device not registered")
+    return {"message": "Device unregistered"}
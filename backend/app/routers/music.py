@@ -2,7 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from typing import List, Optional
-from ..database import get_db
+from ..database import get_db, is_postgres
+from ..pagination import decode_cursor, next_cursor
+from ..search_service import search_songs, search_artists
 from pydantic import BaseModel
 
 router = APIRouter(
@@ -38,11 +40,59 @@ class Song(BaseModel):
 
 class SongListResponse(BaseModel):
     songs: List[Song]
-    total: int
-    page: int
+    next_cursor: Optional[str] = None
     page_size: int
 
 
+SONG_SELECT = """
+    SELECT 
+        s.id,
+        s.title,
+        s.language,
+        s.year,
+        a.name as composer,
+        s.youtube_video_id as "videoId",
+        s.album as movie,
+        s.start_seconds as "startSeconds",
+        s.end_seconds as "endSeconds"
+    FROM songs s
+    LEFT JOIN artists a ON s.artist_id = a.id
+    WHERE 1=1
+"""
+
+
+def _apply_song_filters(query: str, params: dict, language: Optional[str],
+                        year: Optional[str], artist: Optional[str]) -> str:
+    """Append the shared song list filters to a query"""
+    if language:
+        query += " AND s.language = :language"
+        params['language'] = language.upper()
+    
+    if year:
+        query += " AND s.year = :year"
+        params['year'] = year
+    
+    if artist:
+        query += " AND a.name ILIKE :artist"
+        params['artist'] = f"%{artist}%"
+    
+    return query
+
+
+def _row_to_song(row) -> Song:
+    return Song(
+        id=row.id,
+        title=row.title,
+        language=row.language,
+        year=row.year,
+        composer=row.composer or "Unknown",
+        videoId=row.videoId,
+        movie=row.movie,
+        startSeconds=row.startSeconds,
+        endSeconds=row.endSeconds
+    )
+
+
 @router.get("/songs", response_model=List[Song])
 async def get_songs(
     language: Optional[str] = Query(None, description="Filter by language (ENGLISH, HINDI, TAMIL, etc.)"),
@@ -62,111 +112,112 @@ async def get_songs(
     - **artist**: Filter by artist/composer name
     - **limit**: Maximum number of songs to return (default: 100, max: 2000)
     - **offset**: Number of songs to skip for pagination
-    """
     
-    # Build the query
-    query = """
-        SELECT 
-            s.id,
-            s.title,
-            s.language,
-            s.year,
-            a.name as composer,
-            s.youtube_video_id as "videoId",
-            s.album as movie,
-            s.start_seconds as "startSeconds",
-            s.end_seconds as "endSeconds"
-        FROM songs s
-        LEFT JOIN artists a ON s.artist_id = a.id
-        WHERE 1=1
+    Results are ordered by relevance when **search** is given, newest first otherwise.
+    Prefer /music/songs/page for paging through the catalogue.
     """
     
-    params = {}
-    
-    # Apply filters
-    if language:
-        query += " AND s.language = :language"
-        params['language'] = language.upper()
-    
     if search:
-        query += " AND (s.title ILIKE :search OR a.name ILIKE :search OR s.album ILIKE :search)"
-        params['search'] = f"%{search}%"
-    
-    if year:
-        query += " AND s.year = :year"
-        params['year'] = year
+        rows = search_songs(db, search, language=language, year=year, artist=artist,
+                            limit=limit, offset=offset)
+        return [_row_to_song(row) for row in rows]
     
-    if artist:
-        query += " AND a.name ILIKE :artist"
-        params['artist'] = f"%{artist}%"
+    params = {}
+    query = _apply_song_filters(SONG_SELECT, params, language, year, artist)
     
     # Add ordering and pagination
     query += " ORDER BY s.id DESC LIMIT :limit OFFSET :offset"
     params['limit'] = limit
     params['offset'] = offset
     
-    # Execute query
     result = db.execute(text(query), params)
-    songs = []
+    return [_row_to_song(row) for row in result]
+
+
+@router.get("/songs/page", response_model=SongListResponse)
+async def get_songs_page(
+    language: Optional[str] = Query(None, description="Filter by language (ENGLISH, HINDI, TAMIL, etc.)"),
+    search: Optional[str] = Query(None, description="Search in title, artist, or movie"),
+    year: Optional[str] = Query(None, description="Filter by year"),
+    artist: Optional[str] = Query(None, description="Filter by artist/composer name"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, ge=1, le=500, description="Number of songs per page"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get songs with keyset pagination, newest first.
+    
+    Accepts the same filters as /music/songs; with **search** pages are ordered by
+    relevance. Pass the returned **next_cursor** back as **cursor** to fetch the
+    following page; it is null on the last page.
+    """
+    
+    if search:
+        after = None
+        if cursor:
+            try:
+                after = tuple(decode_cursor(cursor, 2))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        rows = search_songs(db, search, language=language, year=year, artist=artist,
+                            limit=limit, after=after)
+        return SongListResponse(
+            songs=[_row_to_song(row) for row in rows],
+            next_cursor=next_cursor(rows, limit, "rank", "id"),
+            page_size=limit
+        )
+    
+    params = {}
+    query = _apply_song_filters(SONG_SELECT, params, language, year, artist)
+    
+    if cursor:
+        try:
+            (last_id,) = decode_cursor(cursor, 1)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query += " AND s.id < :last_id"
+        params['last_id'] = last_id
     
-    for row in result:
-        songs.append(Song(
-            id=row.id,
-            title=row.title,
-            language=row.language,
-            year=row.year,
-            composer=row.composer or "Unknown",
-            videoId=row.videoId,
-            movie=row.movie,
-            startSeconds=row.startSeconds,
-            endSeconds=row.endSeconds
-        ))
+    query += " ORDER BY s.id DESC LIMIT :limit"
+    params['limit'] = limit
     
-    return songs
+    rows = db.execute(text(query), params).fetchall()
+    
+    return SongListResponse(
+        songs=[_row_to_song(row) for row in rows],
+        next_cursor=next_cursor(rows, limit, "id"),
+        page_size=limit
+    )
 
 
 @router.get("/songs/{song_id}", response_model=Song)
 async def get_song(song_id: int, db: Session = Depends(get_db)):
     """Get a specific song by ID"""
     
-    query = """
-        SELECT 
-            s.id,
-            s.title,
-            s.language,
-            s.year,
-            a.name as composer,
-            s.youtube_video_id as "videoId",
-            s.album as movie,
-            s.start_seconds as "startSeconds",
-            s.end_seconds as "endSeconds"
-        FROM songs s
-        LEFT JOIN artists a ON s.artist_id = a.id
-        WHERE s.id = :song_id
-    """
+    query = SONG_SELECT + " AND s.id = :song_id"
     
     result = db.execute(text(query), {"song_id": song_id}).fetchone()
     
     if not result:
         raise HTTPException(status_code=404, detail="Song not found")
     
-    return Song(
-        id=result.id,
-        title=result.title,
-        language=result.language,
-        year=result.year,
-        composer=result.composer or "Unknown",
-        videoId=result.videoId,
-        movie=result.movie,
-        startSeconds=result.startSeconds,
-        endSeconds=result.endSeconds
-    )
+    return _row_to_song(result)
 
 
 @router.get("/languages")
 async def get_languages(db: Session = Depends(get_db)):
     """Get all available languages with song counts"""
     
+    if is_postgres(db):
+        # Served from the trigger-maintained counters (migrations/add_catalogue_counters.sql)
+        result = db.execute(text("""
+            SELECT key AS language, count
+            FROM catalogue_counters
+            WHERE scope = 'song_language' AND count > 0
+            ORDER BY count DESC
+        """))
+        return [{"language": row.language, "count": row.count} for row in result]
+    
     query = """
         SELECT 
             language,
@@ -189,7 +240,14 @@ async def get_artists(
     limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db)
 ):
-    """Get all artists with optional filters"""
+    """Get all artists with optional filters, best matches first when searching"""
+    
+    if search:
+        rows = search_artists(db, search, language=language, limit=limit)
+        return [
+            Artist(id=row.id, name=row.name, slug=row.slug, language=row.language)
+            for row in rows
+        ]
     
     query = "SELECT id, name, slug, language FROM artists WHERE 1=1"
     params = {}
@@ -198,10 +256,6 @@ async def get_artists(
         query += " AND language = :language"
         params['language'] = language.upper()
     
-    if search:
-        query += " AND name ILIKE :search"
-        params['search'] = f"%{search}%"
-    
     query += " ORDER BY name LIMIT :limit"
     params['limit'] = limit
     
@@ -218,6 +272,19 @@ async def get_artists(
 async def get_stats(db: Session = Depends(get_db)):
     """Get music statistics"""
     
+    if is_postgres(db):
+        result = db.execute(text("""
+            SELECT key, count
+            FROM catalogue_counters
+            WHERE scope = 'totals' AND key IN ('songs', 'artists', 'languages')
+        """))
+        totals = {row.key: row.count for row in result}
+        return {
+            "total_songs": totals.get("songs", 0),
+            "total_artists": totals.get("artists", 0),
+            "total_languages": totals.get("languages", 0)
+        }
+    
     query = """
         SELECT 
             COUNT(DISTINCT s.id) as total_songs,
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from pydantic import BaseModel
-from ..database import get_db
+from ..database import get_db, is_postgres
 from ..models_users import User, UserPlaylist, UserPlaylistSong
 from .auth import get_current_user
 
@@ -25,6 +26,31 @@ class AddSongToPlaylistRequest(BaseModel):
     content_type: str = 'song'  # 'song' or 'entertainment'
 
 
+class PlaylistOperation(BaseModel):
+    op: str  # 'add', 'remove' or 'move'
+    song_id: int
+    content_type: str = 'song'  # 'song', 'entertainment' or 'submitted_song'
+    position: Optional[int] = None  # 1-based target position for 'add' and 'move'
+
+
+class BatchPlaylistRequest(BaseModel):
+    operations: List[PlaylistOperation]
+
+
+class PlaylistItemPosition(BaseModel):
+    song_id: int
+    content_type: str
+    position: int
+
+
+class BatchPlaylistResponse(BaseModel):
+    message: str
+    added: int
+    removed: int
+    moved: int
+    items: List[PlaylistItemPosition]
+
+
 class PlaylistSong(BaseModel):
     id: int
     title: str
@@ -64,7 +90,11 @@ async def get_user_playlists(
 ):
     """Get all playlists for the current user, optionally filtered by type"""
     
-    query = """
+    # On Postgres song_count is a column kept current by a trigger
+    # (migrations/add_catalogue_counters.sql); locally it is counted.
+    use_counter = is_postgres(db)
+    
+    query = f"""
         SELECT 
             p.id,
             p.title,
@@ -73,9 +103,9 @@ async def get_user_playlists(
             p.playlist_type,
             p.created_at,
             p.updated_at,
-            COUNT(ps.id) as song_count
+            {"p.song_count" if use_counter else "COUNT(ps.id) as song_count"}
         FROM user_playlists p
-        LEFT JOIN user_playlist_songs ps ON p.id = ps.playlist_id
+        {"" if use_counter else "LEFT JOIN user_playlist_songs ps ON p.id = ps.playlist_id"}
         WHERE p.user_id = :user_id
     """
     
@@ -85,10 +115,11 @@ async def get_user_playlists(
         query += " AND p.playlist_type = :playlist_type"
         params["playlist_type"] = playlist_type
     
-    query += """
-        GROUP BY p.id, p.title, p.description, p.is_public, p.playlist_type, p.created_at, p.updated_at
-        ORDER BY p.updated_at DESC
-    """
+    if not use_counter:
+        query += """
+            GROUP BY p.id, p.title, p.description, p.is_public, p.playlist_type, p.created_at, p.updated_at
+        """
+    query += " ORDER BY p.updated_at DESC"
     
     result = db.execute(text(query), params)
     playlists = []
@@ -392,6 +423,165 @@ async def remove_song_from_playlist(
     return {"message": "Song removed from playlist"}
 
 
+# Table holding the items for each playlist content type
+CONTENT_TYPE_TABLES = {
+    'song': 'songs',
+    'entertainment': 'entertainment',
+    'submitted_song': 'user_submitted_songs',
+}
+
+
+def _playlist_song_id(content_type: str, item_id: int) -> int:
+    # Submitted songs are stored with negative song ids (as in user_songs) so
+    # they never collide with a catalogue song of the same id
+    return -item_id if content_type == 'submitted_song' else item_id
+
+
+@router.post("/{playlist_id}/songs/batch", response_model=BatchPlaylistResponse)
+async def batch_update_playlist(
+    playlist_id: int,
+    request: BatchPlaylistRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply a list of add, remove and move operations to a playlist in one transaction.
+
+    Operations are applied in order against the current ordering. Referenced items
+    are validated with one query per content type, and either every operation is
+    applied or none is. Returns the resulting ordering of the playlist.
+    """
+    
+    # Check if playlist exists and belongs to user
+    playlist_check = db.execute(text("""
+        SELECT id FROM user_playlists 
+        WHERE id = :playlist_id AND user_id = :user_id
+    """), {"playlist_id": playlist_id, "user_id": current_user.id}).fetchone()
+    
+    if not playlist_check:
+        raise HTTPException(status_code=404, detail="Playlist not found")
+    
+    for operation in request.operations:
+        if operation.op not in ('add', 'remove', 'move'):
+            raise HTTPException(status_code=400, detail=f"Unknown operation: {operation.op}")
+        if operation.content_type not in CONTENT_TYPE_TABLES:
+            raise HTTPException(status_code=400, detail=f"Unknown content type: {operation.content_type}")
+    
+    # Validate all added items with one set query per content type
+    ids_to_add = {}
+    for operation in request.operations:
+        if operation.op == 'add':
+            ids_to_add.setdefault(operation.content_type, set()).add(operation.song_id)
+    
+    for content_type, item_ids in ids_to_add.items():
+        query = f"SELECT id FROM {CONTENT_TYPE_TABLES[content_type]} WHERE id IN :item_ids"
+        if content_type == 'submitted_song':
+            # Only the caller's own submissions, or ones an admin approved
+            query += " AND (user_id = :user_id OR status = 'approved')"
+        found = db.execute(
+            text(query).bindparams(bindparam("item_ids", expanding=True)),
+            {"item_ids": list(item_ids), "user_id": current_user.id}
+        ).scalars().all()
+        missing = sorted(item_ids - set(found))
+        if missing:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Items not found ({content_type}): {missing}"
+            )
+    
+    # Load the current ordering once and apply operations in memory
+    current_rows = db.execute(text("""
+        SELECT id, item_id, content_type, position
+        FROM user_playlist_songs
+        WHERE playlist_id = :playlist_id
+        ORDER BY position
+    """), {"playlist_id": playlist_id}).fetchall()
+    
+    row_ids = {(row.content_type, row.item_id): row.id for row in current_rows}
+    original_positions = {(row.content_type, row.item_id): row.position for row in current_rows}
+    ordering = [(row.content_type, row.item_id) for row in current_rows]
+    present = set(ordering)
+    added = removed = moved = 0
+    
+    for operation in request.operations:
+        key = (operation.content_type, operation.song_id)
+        
+        if operation.op == 'add':
+            if key in present:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Item already in playlist ({operation.content_type}): {operation.song_id}"
+                )
+            index = len(ordering) if operation.position is None else max(operation.position - 1, 0)
+            ordering.insert(index, key)
+            present.add(key)
+            added += 1
+        else:
+            if key not in present:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Item not found in playlist ({operation.content_type}): {operation.song_id}"
+                )
+            ordering.remove(key)
+            if operation.op == 'remove':
+                present.discard(key)
+                removed += 1
+            else:
+                if operation.position is None:
+                    raise HTTPException(status_code=400, detail="Move operation requires a position")
+                ordering.insert(max(operation.position - 1, 0), key)
+                moved += 1
+    
+    position_updates = []
+    new_items = []
+    for index, key in enumerate(ordering, start=1):
+        if key in row_ids:
+            if original_positions[key] != index:
+                position_updates.append({"id": row_ids[key], "position": index})
+        else:
+            new_items.append(UserPlaylistSong(
+                playlist_id=playlist_id,
+                song_id=_playlist_song_id(*key),
+                content_type=key[0],
+                item_id=key[1],
+                position=index
+            ))
+    
+    # Write the differences back: delete, update changed positions, insert new rows
+    try:
+        deleted_ids = [row_id for key, row_id in row_ids.items() if key not in present]
+        if deleted_ids:
+            db.execute(
+                text("DELETE FROM user_playlist_songs WHERE id IN :ids")
+                .bindparams(bindparam("ids", expanding=True)),
+                {"ids": deleted_ids}
+            )
+        
+        if position_updates:
+            db.execute(text("""
+                UPDATE user_playlist_songs SET position = :position WHERE id = :id
+            """), position_updates)
+        
+        if new_items:
+            db.add_all(new_items)
+        
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Playlist already contains an item with the same id")
+    
+    return BatchPlaylistResponse(
+        message="Playlist updated",
+        added=added,
+        removed=removed,
+        moved=moved,
+        items=[
+            PlaylistItemPosition(song_id=item_id, content_type=content_type, position=index)
+            for index, (content_type, item_id) in enumerate(ordering, start=1)
+        ]
+    )
+
+
 @router.delete("/{playlist_id}")
 async def delete_playlist(
     playlist_id: int,
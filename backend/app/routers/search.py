@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Query
+from typing import Optional
+from ..suggest_index import get_suggest_index, ENTITY_TYPES
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+@router.get("/suggest")
+def suggest(
+    q: str = Query(..., min_length=1, max_length=100, description="Partial search text"),
+    types: Optional[str] = Query(None, description=f"Comma-separated entity types: {', '.join(ENTITY_TYPES)}"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    As-you-type suggestions across teams, leagues, songs, artists and entertainment.
+    
+    Answered from the in-memory suggestion index, without a database query.
+    """
+    index = get_suggest_index()
+    type_list = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    
+    return {
+        "query": q,
+        "ready": index.ready,
+        "suggestions": index.suggest(q, types=type_list, limit=limit)
+    }
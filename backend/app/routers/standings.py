@@ -1,7 +1,7 @@
-import httpx
 from fastapi import APIRouter, HTTPException
 from typing import Optional, Dict, List
 from ..football_api import get_football_api
+from ..upstream_guard import guarded_client
 
 router = APIRouter(prefix="/api/standings", tags=["standings"])
 
@@ -22,7 +22,7 @@ LEAGUE_ESPN_MAP = {
 async def get_fifa_standings() -> List[Dict]:
     """Fetch live FIFA World Cup 2026 group standings from ESPN (no API key required)."""
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with guarded_client(timeout=15.0) as client:
             resp = await client.get(
                 "https://site.api.espn.com/apis/v2/sports/soccer/fifa.world/standings",
                 headers={"User-Agent": "Mozilla/5.0"}
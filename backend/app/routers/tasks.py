@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Dict, Any
+from ..database import get_db
+from .. import models
+from ..task_queue import task_to_dict
+
+router = APIRouter(prefix="/api/tasks", tags=["tasks"])
+
+
+@router.get("/{task_id}")
+def get_task_status(task_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Status of a queued background task.
+    
+    status is one of queued, running, succeeded or failed; result holds the
+    job's return value once it has succeeded.
+    """
+    task = db.query(models.QueuedTask).filter(models.QueuedTask.id == task_id).first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task_to_dict(task)
@@ -7,6 +7,7 @@ from datetime import datetime
 import logging
 import re
 from ..database import get_db
+from ..suggest_index import get_suggest_index
 from ..models_users import UserSubmittedSong, User, UserPlaylistSong, UserPlaylist
 from .auth import get_current_user
 
@@ -249,6 +250,11 @@ async def review_song(
     db.commit()
     db.refresh(song)
     
+    if status == "approved":
+        get_suggest_index().add("submitted_song", song.id, song.title)
+    else:
+        get_suggest_index().remove("submitted_song", song.id)
+    
     return {
         "success": True,
         "message": f"Song {status} successfully",
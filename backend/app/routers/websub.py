@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..database import get_db
+from ..websub import verify_intent, handle_notification
+
+router = APIRouter(prefix="/api/websub", tags=["websub"])
+
+
+@router.get("/callback", response_class=PlainTextResponse)
+def verify_websub_subscription(
+    channel_id: str,
+    mode: str = Query(..., alias="hub.mode"),
+    topic: str = Query(..., alias="hub.topic"),
+    challenge: Optional[str] = Query(None, alias="hub.challenge"),
+    lease_seconds: Optional[int] = Query(None, alias="hub.lease_seconds"),
+    reason: Optional[str] = Query(None, alias="hub.reason"),
+    db: Session = Depends(get_db)
+):
+    """Hub verification of a subscribe request: echo the challenge if we asked for it"""
+    confirmed = verify_intent(db, channel_id, mode, topic, challenge, lease_seconds, reason)
+    if confirmed is None:
+        raise HTTPException(status_code=404, detail="Unknown subscription")
+    return confirmed
+
+
+@router.post("/callback", status_code=204)
+async def receive_websub_notification(channel_id: str, request: Request, db: Session = Depends(get_db)):
+    """Pushed Atom feed for a subscribed channel; matched against pending fixtures right away"""
+    body = await request.body()
+    await handle_notification(db, channel_id, body, request.headers.get("X-Hub-Signature"))
+    return Response(status_code=204)
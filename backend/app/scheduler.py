@@ -4,43 +4,133 @@ Runs daily to pre-fetch upcoming matches for the next 7 days.
 """
 import asyncio
 from datetime import date, timedelta, datetime
-from typing import List
+from typing import Dict, List
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.triggers.cron import CronTrigger
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
-from .database import SessionLocal
+from .database import SessionLocal, engine
+from .scheduler_leader import get_leader_lock
+from .match_events import (
+    DISCOVERY_BACKOFF_MINUTES, discovered_match_ids, queue_missed_discovery, schedule_highlight_discovery
+)
+from .live_poll_planner import plan_live_polls, due_polls, kickoff_time
+from .fetch_ledger import PREFETCH_DAYS, stale_league_slugs, ledger_entries, record_league_fetch, prune_ledger
 from . import models
 from .football_api import get_football_api
 from .cricket_api import CricketAPI
-from .sports_apis import (
-    get_nba_api, get_tennis_api, get_nhl_api, 
-    get_nfl_api, get_mlb_api, get_fifa_api,
-    get_pga_api, get_ufc_api
-)
+from .sports_apis import SPORTS, get_espn_sports_client
 from .youtube_service import get_youtube_service, YouTubeQuotaExhaustedError
 from .youtube_rss_service import get_rss_service
-from .email_service import send_missing_highlights_notification
+from .upstream_guard import guarded_execute
+from .channel_catalogue import find_catalogued_highlights
+from .highlight_store import highlight_row, insert_highlights, refresh_highlight_counters
+from .teams import find_match_by_teams, resolve_team_ids
+from .user_feed import FEED_RETENTION_DAYS, prune_feed_items, update_feeds_for_matches
+from .websub import renew_subscriptions
+from .notifications import (
+    mark_emails_rejected, mark_emails_sent, notify_highlights_available, pending_email_notifications
+)
+from .email_service import send_missing_highlights_notification, build_notification_email
+from .email_delivery import PermanentEmailError, TransientEmailError, get_email_sender
+from .push_delivery import check_receipts, dispatch_push_notifications
 from .config import match_has_team_of_interest, get_settings
 
 settings = get_settings()
 
-# Create scheduler instance
-scheduler = AsyncIOScheduler()
+# Create scheduler instance. Jobs are persisted so a new leader (or a restarted
+# one) picks up where the previous one left off; missed runs are coalesced into one.
+scheduler = AsyncIOScheduler(
+    jobstores={"default": SQLAlchemyJobStore(engine=engine, tablename="apscheduler_jobs")},
+    job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 600},
+)
 
+# How often followers retry for leadership and the leader re-checks its lock
+LEADER_CHECK_SECONDS = 30
 
-async def fetch_matches_for_date(target_date: date, db: Session) -> int:
+_leadership_task = None
+
+
+def _resolve_match_status(match: dict, target_date: date) -> str:
+    """
+    Status to store for a match from ESPN.
+    
+    Only set status to finished if match has scores AND is today or in the past -
+    unless ESPN reports it in play or it hasn't kicked off yet (ESPN returns 0-0
+    scores for both), which the live-score poller relies on.
+    """
+    if match["status"] == "live":
+        return "live"
+    kickoff = kickoff_time(target_date, match.get("match_time"))
+    if kickoff is not None and kickoff > datetime.utcnow():
+        return match["status"]
+    if match.get("home_score") is not None and match.get("away_score") is not None and target_date <= date.today():
+        return "finished"
+    return match["status"]
+
+
+async def fetch_changed_scoreboards(db: Session, target_date: date, league_slugs, record: bool = True) -> dict:
+    """
+    Conditionally fetch ESPN scoreboards and record them in the fetch ledger.
+    
+    Sends each league's stored ETag/Last-Modified; leagues whose scoreboard is
+    unchanged (304 or identical body) are only touched in the ledger, so no
+    parsing or match lookups happen for them. Returns {league_slug: matches}
+    for the leagues that changed.
+    
+    The ledger entries are added to the session but not committed: the caller
+    commits them together with the matches it stores, so a failed upsert never
+    leaves a scoreboard marked fresh. Callers that only update existing
+    matches pass record=False; advancing the validators for them would make
+    fetch_matches_for_date see a 304 and miss new fixtures.
+    """
+    football_api = get_football_api()
+    league_slugs = list(league_slugs)
+    entries = ledger_entries(db, target_date, league_slugs)
+    scoreboards = await football_api.get_scoreboards(target_date, league_slugs, previous=entries)
+    
+    changed = {}
+    for league_slug, scoreboard in scoreboards.items():
+        if scoreboard is None:
+            continue  # Request failed - stays stale in the ledger and is retried
+        if record:
+            record_league_fetch(db, league_slug, target_date, scoreboard, entries.get(league_slug))
+        if not scoreboard.not_modified:
+            changed[league_slug] = scoreboard.matches
+    
+    unchanged = sum(1 for sb in scoreboards.values() if sb is not None and sb.not_modified)
+    if unchanged:
+        print(f"[Scheduler] {unchanged}/{len(league_slugs)} scoreboards unchanged for {target_date}")
+    return changed
+
+
+async def fetch_matches_for_date(target_date: date, db: Session, stale_only: bool = True) -> int:
     """
     Fetch matches from ESPN API for a specific date and store in database.
-    Returns the number of matches stored.
+    
+    With stale_only (the default) only league-days the fetch ledger considers
+    stale are fetched; every successful league fetch is recorded in the ledger,
+    in one commit with the matches it stored. Returns the number of matches stored.
     """
     football_api = get_football_api()
     match_count = 0
     
     try:
-        fixtures_by_league = await football_api.get_matches_for_date(target_date)
+        league_slugs = list(football_api.LEAGUES)
+        if stale_only:
+            league_slugs = stale_league_slugs(db, target_date, league_slugs)
+            if not league_slugs:
+                print(f"[Scheduler] All leagues fresh for {target_date} - skipping ESPN")
+                return 0
         
-        for league_name, matches in fixtures_by_league.items():
+        changed = await fetch_changed_scoreboards(db, target_date, league_slugs)
+        
+        for league_slug, matches in changed.items():
+            if not matches:
+                continue
+            league_name = football_api.LEAGUES[league_slug]
+            
             # Get or create league
             league_info = models.LEAGUE_MAPPINGS.get(league_name, {
                 "slug": league_name.lower().replace(" ", "-"),
@@ -59,8 +149,7 @@ async def fetch_matches_for_date(target_date: date, db: Session) -> int:
                     display_order=0
                 )
                 db.add(db_league)
-                db.commit()
-                db.refresh(db_league)
+                db.flush()
             
             for match in matches:
                 # Check if match already exists by ESPN ID
@@ -72,38 +161,25 @@ async def fetch_matches_for_date(target_date: date, db: Session) -> int:
                 
                 if not existing:
                     # Also check by teams and date
-                    existing = db.query(models.Match).filter(
-                        models.Match.home_team == match["home_team"],
-                        models.Match.away_team == match["away_team"],
-                        models.Match.match_date == target_date
-                    ).first()
+                    existing = find_match_by_teams(db, match["home_team"], match["away_team"], target_date)
                 
                 if existing:
                     # Update status/scores if changed
                     home_score = match.get("home_score")
                     away_score = match.get("away_score")
                     
-                    # Only set status to finished if match has scores AND is today or in the past
-                    if home_score is not None and away_score is not None and target_date <= date.today():
-                        new_status = "finished"
-                    else:
-                        new_status = match["status"]
+                    new_status = _resolve_match_status(match, target_date)
                     
                     if existing.status != new_status or existing.home_score != home_score or existing.away_score != away_score:
                         existing.status = new_status
                         existing.home_score = home_score
                         existing.away_score = away_score
-                        db.commit()
                 else:
                     # Create new match
                     home_score = match.get("home_score")
                     away_score = match.get("away_score")
                     
-                    # Only set status to finished if match has scores AND is today or in the past
-                    if home_score is not None and away_score is not None and target_date <= date.today():
-                        status = "finished"
-                    else:
-                        status = match["status"]
+                    status = _resolve_match_status(match, target_date)
                     
                     new_match = models.Match(
                         league_id=db_league.id,
@@ -117,14 +193,15 @@ async def fetch_matches_for_date(target_date: date, db: Session) -> int:
                         espn_event_id=match.get("espn_event_id")
                     )
                     db.add(new_match)
-                    db.commit()
                     match_count += 1
-                    
+        
+        db.commit()
     except Exception as e:
         print(f"[Scheduler] ❌ ERROR fetching matches for {target_date}: {e}")
         import traceback
         print(f"[Scheduler] Traceback: {traceback.format_exc()}")
         db.rollback()
+        match_count = 0
     
     return match_count
 
@@ -163,11 +240,7 @@ async def fetch_ipl_matches(db: Session) -> int:
         
         for match in ipl_matches:
             # Check if match already exists
-            existing = db.query(models.Match).filter(
-                models.Match.home_team == match.get("home_team"),
-                models.Match.away_team == match.get("away_team"),
-                models.Match.match_date == match.get("match_date")
-            ).first()
+            existing = find_match_by_teams(db, match.get("home_team"), match.get("away_team"), match.get("match_date"))
             
             if not existing:
                 # Create new match
@@ -197,44 +270,83 @@ async def fetch_ipl_matches(db: Session) -> int:
     return match_count
 
 
-async def fetch_multi_sport_matches(db: Session) -> int:
+def upsert_sport_matches(db: Session, league: models.League, matches: List[dict]) -> int:
+    """
+    Bulk upsert one sport's matches: a single lookup of the existing rows for
+    the dates involved, new rows added together, and status/score updates for
+    unfinished existing rows. Returns the number of new matches.
     """
-    Fetch matches from all sports APIs (NBA, Tennis, NHL, NFL, MLB, FIFA)
+    match_dates = {match["match_date"] for match in matches}
+    existing_rows = db.query(models.Match).filter(
+        models.Match.league_id == league.id,
+        models.Match.match_date.in_(match_dates)
+    ).all()
+    # Keyed by team ids, so spelling variants line up, and by names for rows not backfilled yet
+    team_ids = resolve_team_ids(db, {m.get("home_team", "") for m in matches} | {m.get("away_team", "") for m in matches})
+    existing = {}
+    for row in existing_rows:
+        existing[(row.home_team, row.away_team, row.match_date)] = row
+        if row.home_team_id and row.away_team_id:
+            existing[(row.home_team_id, row.away_team_id, row.match_date)] = row
+    
+    new_matches = []
+    for match in matches:
+        key = (match.get("home_team", ""), match.get("away_team", ""), match["match_date"])
+        id_key = (team_ids.get(key[0]), team_ids.get(key[1]), key[2])
+        row = existing.get(id_key) if id_key[0] and id_key[1] else None
+        row = row or existing.get(key)
+        if row is None:
+            row = models.Match(
+                league_id=league.id,
+                home_team=key[0],
+                away_team=key[1],
+                match_date=key[2],
+                match_time=match.get("match_time", "20:00"),
+                status=match.get("status", "scheduled"),
+                home_score=match.get("home_score"),
+                away_score=match.get("away_score")
+            )
+            existing[key] = existing[id_key] = row
+            new_matches.append(row)
+        elif row.status != "finished":
+            row.status = match.get("status", row.status)
+            row.home_score = match.get("home_score")
+            row.away_score = match.get("away_score")
+    
+    db.add_all(new_matches)
+    db.commit()
+    return len(new_matches)
+
+
+async def fetch_multi_sport_matches(db: Session, days: int = 7) -> int:
+    """
+    Fetch matches from all sports (NBA, Tennis, NHL, NFL, MLB, FIFA, PGA, UFC)
+    for today and the following days. Every sport and date is fetched
+    concurrently; results are stored with one bulk upsert per sport.
     Returns total number of new matches stored.
     """
     total_matches = 0
+    today = date.today()
     
-    # Define sports and their API getters
-    sports_config = [
-        ("NBA", "nba", get_nba_api),
-        ("Tennis", "tennis", get_tennis_api),
-        ("NHL", "nhl", get_nhl_api),
-        ("NFL", "nfl", get_nfl_api),
-        ("MLB", "mlb", get_mlb_api),
-        ("FIFA World Cup", "fifa-world-cup", get_fifa_api),
-        ("PGA", "pga", get_pga_api),
-        ("UFC", "ufc", get_ufc_api),
-    ]
+    print(f"[Scheduler] Fetching {len(SPORTS)} sports for {today} + {days - 1} days...")
+    results = await get_espn_sports_client().get_all_matches(today, today + timedelta(days=days - 1))
     
-    for sport_name, sport_slug, api_getter in sports_config:
+    for sport in SPORTS:
+        matches = results.get(sport.slug)
         try:
-            print(f"[Scheduler] Fetching {sport_name} matches...")
-            api = api_getter()
-            matches = await api.get_matches()
-            
             if not matches:
-                print(f"[Scheduler] No {sport_name} matches found")
+                print(f"[Scheduler] No {sport.name} matches found")
                 continue
             
             # Get or create league
             db_league = db.query(models.League).filter(
-                models.League.slug == sport_slug
+                models.League.slug == sport.slug
             ).first()
             
             if not db_league:
                 db_league = models.League(
-                    name=sport_name,
-                    slug=sport_slug,
+                    name=sport.name,
+                    slug=sport.slug,
                     country="International",
                     display_order=0
                 )
@@ -242,37 +354,13 @@ async def fetch_multi_sport_matches(db: Session) -> int:
                 db.commit()
                 db.refresh(db_league)
             
-            # Add matches
-            sport_match_count = 0
-            for match in matches:
-                existing = db.query(models.Match).filter(
-                    models.Match.league_id == db_league.id,
-                    models.Match.home_team == match.get("home_team"),
-                    models.Match.away_team == match.get("away_team"),
-                    models.Match.match_date == match.get("match_date")
-                ).first()
-                
-                if not existing:
-                    new_match = models.Match(
-                        league_id=db_league.id,
-                        home_team=match.get("home_team", ""),
-                        away_team=match.get("away_team", ""),
-                        match_date=match.get("match_date"),
-                        match_time=match.get("match_time", "20:00"),
-                        status=match.get("status", "scheduled"),
-                        home_score=match.get("home_score"),
-                        away_score=match.get("away_score")
-                    )
-                    db.add(new_match)
-                    sport_match_count += 1
-            
+            sport_match_count = upsert_sport_matches(db, db_league, matches)
             if sport_match_count > 0:
-                db.commit()
                 total_matches += sport_match_count
-                print(f"[Scheduler] ✓ Added {sport_match_count} {sport_name} matches")
+                print(f"[Scheduler] ✓ Added {sport_match_count} {sport.name} matches")
             
         except Exception as e:
-            print(f"[Scheduler] Error fetching {sport_name} matches: {e}")
+            print(f"[Scheduler] Error storing {sport.name} matches: {e}")
             import traceback
             print(f"[Scheduler] Traceback: {traceback.format_exc()}")
             db.rollback()
@@ -284,11 +372,9 @@ async def fetch_multi_sport_matches(db: Session) -> int:
 async def prefetch_upcoming_matches():
     """
     Daily job to pre-fetch matches for the next 7 days.
-    Only fetches dates that haven't been fetched yet (smart incremental fetch).
-    Also refreshes today's matches to get updated scores/status.
-    
-    FIX: Don't mark past dates as fetched if we got 0 matches (indicates potential API failure).
-    This ensures matches aren't missed due to temporary API issues.
+    Only fetches league-days that are stale in the fetch ledger (smart incremental fetch).
+    Failed league requests are never recorded, so they are retried on the next run
+    instead of a temporary API issue hiding a date's matches.
     """
     print(f"\n[Scheduler] Starting daily match prefetch at {datetime.now()}")
     
@@ -296,7 +382,6 @@ async def prefetch_upcoming_matches():
     today = date.today()
     total_new_matches = 0
     dates_fetched = 0
-    failed_dates = []
     
     try:
         # Fetch IPL matches first
@@ -305,7 +390,7 @@ async def prefetch_upcoming_matches():
         total_new_matches += ipl_matches
         print(f"[Scheduler] ✓ Fetched {ipl_matches} IPL matches")
         
-        # Fetch multi-sport matches (NBA, Tennis, NHL, NFL, MLB, FIFA)
+        # Fetch multi-sport matches (NBA, Tennis, NHL, NFL, MLB, FIFA, PGA, UFC) for the next 7 days
         print(f"[Scheduler] Fetching multi-sport matches...")
         multi_sport_matches = await fetch_multi_sport_matches(db)
         total_new_matches += multi_sport_matches
@@ -328,72 +413,26 @@ async def prefetch_upcoming_matches():
         except Exception as e:
             print(f"[Scheduler] Error fixing FIFA statuses: {e}")
         
-        # Then fetch football matches for next 7 days
-        for i in range(7):
+        # Then fetch football matches for next 7 days - only league-days the
+        # fetch ledger considers stale (today's refresh every 30 min, nearer
+        # dates more often than far ones, finished days never)
+        for i in range(PREFETCH_DAYS):
             target_date = today + timedelta(days=i)
+            print(f"[Scheduler] Fetching stale football leagues for {target_date}...")
             
-            # Check if we've already fetched this date
-            already_fetched = db.query(models.FetchedDate).filter(
-                models.FetchedDate.fetch_date == target_date
-            ).first()
+            match_count = await fetch_matches_for_date(target_date, db)
+            total_new_matches += match_count
+            dates_fetched += 1
             
-            # Always refresh today (to get score updates)
-            # For other days, only fetch if not already in DB
-            if i == 0 or not already_fetched:
-                print(f"[Scheduler] Fetching football matches for {target_date}...")
-                
-                # If it's today and already fetched, we're just updating
-                if i == 0 and already_fetched:
-                    print(f"[Scheduler] Refreshing today's matches for score updates")
-                
-                match_count = await fetch_matches_for_date(target_date, db)
-                total_new_matches += match_count
-                dates_fetched += 1
-                
-                # CRITICAL FIX: Only mark past dates as fetched if we got matches
-                # If past date has 0 matches, it might indicate API failure - don't mark as fetched
-                # This allows reconciliation job to catch it and refetch
-                should_mark_fetched = False
-                
-                if target_date > today:
-                    # Future dates: mark as fetched (matches may be added later)
-                    should_mark_fetched = True
-                elif match_count > 0:
-                    # Past/today with matches: mark as fetched
-                    should_mark_fetched = True
-                elif target_date == today:
-                    # Today with 0 matches: still mark as fetched (will update via refresh_today_scores)
-                    should_mark_fetched = True
-                else:
-                    # Past date with 0 matches: DON'T mark as fetched!
-                    # Indicates potential API issue - reconciliation will refetch
-                    should_mark_fetched = False
-                    failed_dates.append(target_date)
-                    print(f"[Scheduler] ⚠️  FLAGGED: {target_date} has 0 matches - may be API issue, not marking as fetched")
-                
-                # Mark date as fetched if appropriate
-                if not already_fetched and should_mark_fetched:
-                    fetched_record = models.FetchedDate(fetch_date=target_date)
-                    db.merge(fetched_record)
-                    try:
-                        db.commit()
-                    except:
-                        db.rollback()
-                
-                if match_count > 0:
-                    print(f"[Scheduler] ✓ Fetched {match_count} new matches for {target_date}")
-                else:
-                    print(f"[Scheduler] Found 0 matches for {target_date}")
-            else:
-                print(f"[Scheduler] Skipping {target_date} - already fetched")
+            if match_count > 0:
+                print(f"[Scheduler] ✓ Fetched {match_count} new matches for {target_date}")
         
-        # Clean up old fetched_dates entries (older than 7 days ago)
+        # Clean up old ledger entries (older than 7 days ago)
         cutoff_date = today - timedelta(days=7)
-        db.query(models.FetchedDate).filter(
-            models.FetchedDate.fetch_date < cutoff_date
-        ).delete()
+        prune_ledger(db, cutoff_date)
+        pruned_items = prune_feed_items(db, datetime.utcnow() - timedelta(days=FEED_RETENTION_DAYS))
         db.commit()
-        print(f"[Scheduler] Cleaned up fetched_dates older than {cutoff_date}")
+        print(f"[Scheduler] Cleaned up fetch ledger entries older than {cutoff_date} and {pruned_items} old feed items")
         
     except Exception as e:
         print(f"[Scheduler] Error in prefetch job: {e}")
@@ -403,9 +442,6 @@ async def prefetch_upcoming_matches():
     finally:
         db.close()
     
-    if failed_dates:
-        print(f"[Scheduler] ⚠️  ALERT: {len(failed_dates)} dates flagged for reconciliation: {failed_dates}")
-    
     print(f"[Scheduler] Prefetch complete! Fetched {dates_fetched} dates, {total_new_matches} new matches\n")
 
 
@@ -439,7 +475,8 @@ async def refresh_today_scores():
         
         # Only call API if there are unfinished matches
         football_api = get_football_api()
-        fixtures_by_league = await football_api.get_matches_for_date(today)
+        changed = await fetch_changed_scoreboards(db, today, football_api.LEAGUES, record=False)
+        fixtures_by_league = {football_api.LEAGUES[slug]: matches for slug, matches in changed.items()}
         updated_count = 0
         
         for league_name, matches in fixtures_by_league.items():
@@ -452,22 +489,14 @@ async def refresh_today_scores():
                     ).first()
                 
                 if not existing:
-                    existing = db.query(models.Match).filter(
-                        models.Match.home_team == match["home_team"],
-                        models.Match.away_team == match["away_team"],
-                        models.Match.match_date == today
-                    ).first()
+                    existing = find_match_by_teams(db, match["home_team"], match["away_team"], today)
                 
                 if existing:
                     # Update if status or scores changed
                     home_score = match.get("home_score")
                     away_score = match.get("away_score")
                     
-                    # Auto-set status to finished if match has scores
-                    if home_score is not None and away_score is not None:
-                        new_status = "finished"
-                    else:
-                        new_status = match["status"]
+                    new_status = _resolve_match_status(match, today)
                     
                     changed = False
                     if existing.status != new_status:
@@ -494,55 +523,141 @@ async def refresh_today_scores():
         db.close()
 
 
-async def fetch_highlights_for_yesterday(send_notification: bool = False):
+# (league name, match date) -> when the live poller last fetched its scoreboard
+_last_live_poll = {}
+
+
+async def poll_live_scores():
+    """
+    Adaptive live-score refresh (runs every minute).
+    
+    Only leagues with a match in play or about to kick off are fetched from
+    ESPN - every minute while live, every two minutes around kick-off - so
+    scores stay fresh during matches and no upstream calls are made when idle.
+    See app.live_poll_planner for the polling rules.
+    """
+    now = datetime.utcnow()
+    today = date.today()
+    db = SessionLocal()
+    
+    try:
+        # Yesterday too: late kick-offs are stored under ESPN's (US) date
+        candidates = db.query(
+            models.League.name.label("league_name"),
+            models.Match.match_date,
+            models.Match.match_time,
+            models.Match.status
+        ).join(models.League, models.Match.league_id == models.League.id).filter(
+            models.Match.match_date.in_([today - timedelta(days=1), today]),
+            models.Match.status.in_(["scheduled", "live"])
+        ).all()
+        
+        plan = plan_live_polls(candidates, now)
+        for key in list(_last_live_poll):
+            if key not in plan:
+                del _last_live_poll[key]
+        due = due_polls(plan, _last_live_poll, now)
+        if not due:
+            return
+        
+        updated_count = 0
+        
+        for league_name, match_date in due:
+            _last_live_poll[(league_name, match_date)] = now
+            league_slug = get_football_api().league_slug_for(league_name)
+            if league_slug is None:
+                continue
+            # Unchanged scoreboards (the common case between goals) cost one
+            # conditional request and no match lookups
+            changed = await fetch_changed_scoreboards(db, match_date, [league_slug], record=False)
+            
+            for match in changed.get(league_slug, []):
+                existing = None
+                if match.get("espn_event_id"):
+                    existing = db.query(models.Match).filter(
+                        models.Match.espn_event_id == match.get("espn_event_id")
+                    ).first()
+                
+                if not existing:
+                    existing = find_match_by_teams(db, match["home_team"], match["away_team"], match_date)
+                
+                # ESPN's status is authoritative here: in-play matches already
+                # have scores, so scores alone don't mean the match is over.
+                # A finished match is never moved back.
+                if not existing or existing.status == "finished":
+                    continue
+                
+                new_status = match["status"]
+                home_score = match.get("home_score")
+                away_score = match.get("away_score")
+                if (existing.status, existing.home_score, existing.away_score) != (new_status, home_score, away_score):
+                    existing.status = new_status
+                    existing.home_score = home_score
+                    existing.away_score = away_score
+                    updated_count += 1
+            
+            db.commit()
+        
+        print(f"[Live Scores] Polled {len(due)} leagues ({', '.join(name for name, _ in due)}), updated {updated_count} matches")
+        
+    except Exception as e:
+        print(f"[Live Scores] Error polling live scores: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+async def fetch_highlights_for_yesterday(send_notification: bool = False, fallback_only: bool = False):
     """
     Fetch YouTube highlights for yesterday's finished matches.
     Only fetches for matches that don't already have highlights.
-    Runs twice daily (8 AM and 2 PM) to catch highlight uploads.
+    Scheduled daily at 2 PM as a fallback; admin endpoints run it on demand.
     
     Args:
-        send_notification: If True, sends email for missing highlights (used on 2nd run)
+        send_notification: If True, sends email for missing highlights
+        fallback_only: Skip matches that event-driven discovery already handles
     """
     print(f"\n[Scheduler] Fetching highlights for yesterday's matches at {datetime.now()}")
     
     db = SessionLocal()
     yesterday = date.today() - timedelta(days=1)
-    highlights_found = 0
     matches_checked = 0
     missing_matches = []  # Track matches that couldn't find highlights
     
     try:
-        # Get yesterday's finished matches that are teams of interest
+        # Get yesterday's finished matches still without highlights
         yesterdays_matches = db.query(models.Match).filter(
             models.Match.match_date == yesterday,
-            models.Match.status == 'finished'
+            models.Match.status == 'finished',
+            models.Match.highlight_count == 0
         ).all()
         
         if not yesterdays_matches:
-            print(f"[Scheduler] No finished matches for yesterday ({yesterday})")
+            print(f"[Scheduler] No finished matches without highlights for yesterday ({yesterday}) ✓")
             return
         
-        # Filter to matches without highlights
+        # Filter to teams of interest
         matches_without_highlights = []
         for match in yesterdays_matches:
-            # Check if match already has highlights
-            existing_highlight = db.query(models.Highlight).filter(
-                models.Highlight.match_id == match.id
-            ).first()
-            
-            if not existing_highlight:
-                # Check if it's a team of interest
-                league_name = match.league.name if match.league else "Unknown"
-                if match_has_team_of_interest(match.home_team, match.away_team, league_name):
-                    matches_without_highlights.append(match)
+            league_name = match.league.name if match.league else "Unknown"
+            if match_has_team_of_interest(match.home_team, match.away_team, league_name):
+                matches_without_highlights.append(match)
         
         if not matches_without_highlights:
-            print(f"[Scheduler] All {len(yesterdays_matches)} matches already have highlights ✓")
+            print(f"[Scheduler] None of yesterday's {len(yesterdays_matches)} matches without highlights involve teams of interest")
             return
         
+        if fallback_only:
+            discovered = discovered_match_ids(db, (match.id for match in matches_without_highlights))
+            matches_without_highlights = [m for m in matches_without_highlights if m.id not in discovered]
+            if not matches_without_highlights:
+                print(f"[Scheduler] All of yesterday's matches without highlights are covered by discovery ✓")
+                return
+        
         print(f"[Scheduler] Found {len(matches_without_highlights)} matches needing highlights")
         
         youtube_service = get_youtube_service()
+        rows = []
         
         for match in matches_without_highlights:
             matches_checked += 1
@@ -551,7 +666,8 @@ async def fetch_highlights_for_yesterday(send_notification: bool = False):
             try:
                 print(f"[Scheduler] Searching highlights: {match.home_team} vs {match.away_team}")
                 
-                videos = youtube_service.search_highlights(
+                videos = await asyncio.to_thread(
+                    youtube_service.search_highlights,
                     home_team=match.home_team,
                     away_team=match.away_team,
                     league=league_name,
@@ -561,31 +677,8 @@ async def fetch_highlights_for_yesterday(send_notification: bool = False):
                 
                 if videos:
                     # Store ALL highlights in DB for better geo-filtering options
-                    added_count = 0
-                    for video in videos:
-                        # Check if this highlight already exists
-                        existing = db.query(models.Highlight).filter(
-                            models.Highlight.match_id == match.id,
-                            models.Highlight.youtube_video_id == video['video_id']
-                        ).first()
-                        
-                        if not existing:
-                            highlight = models.Highlight(
-                                match_id=match.id,
-                                youtube_video_id=video['video_id'],
-                                title=video['title'],
-                                description=video.get('description', ''),
-                                thumbnail_url=video.get('thumbnail_url', ''),
-                                channel_title=video.get('channel_title', ''),
-                                published_at=video.get('published_at'),
-                                view_count=video.get('view_count', 0),
-                                duration=video.get('duration', '')
-                            )
-                            db.add(highlight)
-                            added_count += 1
-                    db.commit()
-                    highlights_found += added_count
-                    print(f"[Scheduler] ✓ Found {len(videos)} highlights, added {added_count} new ones for {match.home_team} vs {match.away_team}")
+                    rows.extend(highlight_row(match.id, video) for video in videos)
+                    print(f"[Scheduler] ✓ Found {len(videos)} highlights for {match.home_team} vs {match.away_team}")
                 else:
                     print(f"[Scheduler] ✗ No highlights found for {match.home_team} vs {match.away_team}")
                     # Track this match for notification
@@ -604,14 +697,15 @@ async def fetch_highlights_for_yesterday(send_notification: bool = False):
                 print(f"[Scheduler] Error fetching highlight for {match.home_team} vs {match.away_team}: {e}")
                 continue
         
-        print(f"[Scheduler] Highlights fetch complete! Found {highlights_found}/{matches_checked} highlights")
+        highlights_found = len(insert_highlights(db, rows))
+        print(f"[Scheduler] Highlights fetch complete! Added {highlights_found} new highlights for {matches_checked} matches")
         
         # Send email notification for missing highlights (only on 2nd run of the day)
         if send_notification and missing_matches:
             print(f"[Scheduler] Sending notification for {len(missing_matches)} missing highlights...")
-            send_missing_highlights_notification(missing_matches)
+            await asyncio.to_thread(send_missing_highlights_notification, missing_matches)
         elif missing_matches:
-            print(f"[Scheduler] {len(missing_matches)} matches still missing - will retry at 2 PM\n")
+            print(f"[Scheduler] {len(missing_matches)} matches still missing\n")
         
     except Exception as e:
         print(f"[Scheduler] Error in highlights fetch job: {e}")
@@ -620,38 +714,43 @@ async def fetch_highlights_for_yesterday(send_notification: bool = False):
         db.close()
 
 
+def _finish_past_fifa_matches(db: Session, today: date):
+    """FIFA matches stay "scheduled" until explicitly marked finished"""
+    try:
+        fifa_league = db.query(models.League).filter(models.League.slug == "fifa-world-cup").first()
+        if fifa_league:
+            stale = db.query(models.Match).filter(
+                models.Match.league_id == fifa_league.id,
+                models.Match.status == "scheduled",
+                models.Match.match_date <= today
+            ).all()
+            if stale:
+                for m in stale:
+                    m.status = "finished"
+                db.commit()
+                print(f"[Scheduler] ✓ Auto-fixed {len(stale)} FIFA match statuses")
+    except Exception as e:
+        print(f"[Scheduler] Warning: FIFA status fix failed: {e}")
+        db.rollback()
+
+
 async def fetch_highlights_for_today():
     """
     Fetch YouTube highlights for today's finished matches with retry logic.
-    Runs every 1-2 hours throughout the day.
+    Not scheduled (event-driven discovery covers finishing matches); run on
+    demand from /api/admin.
     Tracks retry attempts and stops after 12 attempts (24 hours).
     """
     print(f"\n[Scheduler] Fetching highlights for today's finished matches at {datetime.now()}")
     
     db = SessionLocal()
     today = date.today()
-    highlights_found = 0
     matches_checked = 0
     max_retry_attempts = 12  # Stop after 12 attempts (24 hours with 2-hour intervals)
     
     try:
         # Auto-fix FIFA match statuses before fetching highlights
-        # (FIFA matches stay "scheduled" until explicitly marked finished)
-        try:
-            fifa_league = db.query(models.League).filter(models.League.slug == "fifa-world-cup").first()
-            if fifa_league:
-                stale = db.query(models.Match).filter(
-                    models.Match.league_id == fifa_league.id,
-                    models.Match.status == "scheduled",
-                    models.Match.match_date <= today
-                ).all()
-                if stale:
-                    for m in stale:
-                        m.status = "finished"
-                    db.commit()
-                    print(f"[Scheduler] ✓ Auto-fixed {len(stale)} FIFA match statuses before highlight fetch")
-        except Exception as e:
-            print(f"[Scheduler] Warning: FIFA status fix failed: {e}")
+        _finish_past_fifa_matches(db, today)
 
         # Get today's finished matches without highlights
         todays_finished_matches = db.query(models.Match).filter(
@@ -667,11 +766,7 @@ async def fetch_highlights_for_today():
         matches_to_process = []
         for match in todays_finished_matches:
             # Skip if already has highlights
-            existing_highlight = db.query(models.Highlight).filter(
-                models.Highlight.match_id == match.id
-            ).first()
-            
-            if existing_highlight:
+            if match.highlight_count:
                 continue
             
             # Skip if exceeded retry attempts
@@ -685,13 +780,14 @@ async def fetch_highlights_for_today():
         
         if not matches_to_process:
             finished_count = len(todays_finished_matches)
-            with_highlights = sum(1 for m in todays_finished_matches if db.query(models.Highlight).filter(models.Highlight.match_id == m.id).first())
+            with_highlights = sum(1 for m in todays_finished_matches if m.highlight_count)
             print(f"[Scheduler] All today's finished matches processed ({with_highlights}/{finished_count} have highlights)")
             return
         
         print(f"[Scheduler] Processing {len(matches_to_process)} matches needing highlights")
         
         youtube_service = get_youtube_service()
+        rows = []
         
         for match in matches_to_process:
             matches_checked += 1
@@ -704,7 +800,8 @@ async def fetch_highlights_for_today():
             try:
                 print(f"[Scheduler] Searching highlights (attempt {match.highlight_fetch_attempts}): {match.home_team} vs {match.away_team}")
                 
-                videos = youtube_service.search_highlights(
+                videos = await asyncio.to_thread(
+                    youtube_service.search_highlights,
                     home_team=match.home_team,
                     away_team=match.away_team,
                     league=league_name,
@@ -713,35 +810,11 @@ async def fetch_highlights_for_today():
                 )
                 
                 if videos:
-                    video = videos[0]
-                    # Check if this highlight already exists
-                    existing = db.query(models.Highlight).filter(
-                        models.Highlight.match_id == match.id,
-                        models.Highlight.youtube_video_id == video['video_id']
-                    ).first()
-                    
-                    if not existing:
-                        # Store highlight in DB
-                        highlight = models.Highlight(
-                            match_id=match.id,
-                            youtube_video_id=video['video_id'],
-                            title=video['title'],
-                            description=video.get('description', ''),
-                            thumbnail_url=video.get('thumbnail_url', ''),
-                            channel_title=video.get('channel_title', ''),
-                            published_at=video.get('published_at'),
-                            view_count=video.get('view_count', 0),
-                            duration=video.get('duration', '')
-                        )
-                        db.add(highlight)
-                        db.commit()
-                        highlights_found += 1
-                        print(f"[Scheduler] ✓ Found: {video['title'][:50]}...")
-                    else:
-                        print(f"[Scheduler] ℹ️  Highlight already exists: {video['title'][:50]}...")
+                    rows.append(highlight_row(match.id, videos[0]))
+                    print(f"[Scheduler] ✓ Found: {videos[0]['title'][:50]}...")
                 else:
                     print(f"[Scheduler] ✗ No highlights yet (will retry later)")
-                    db.commit()  # Save the retry attempt count
+                db.commit()  # Save the retry attempt count
                     
             except YouTubeQuotaExhaustedError:
                 print(f"[Scheduler] YouTube quota exhausted - stopping today's highlight fetch")
@@ -752,6 +825,7 @@ async def fetch_highlights_for_today():
                 db.commit()  # Save retry attempt even on error
                 continue
         
+        highlights_found = len(insert_highlights(db, rows))
         print(f"[Scheduler] Today's highlights fetch complete! Found {highlights_found}/{matches_checked} highlights\n")
         
     except Exception as e:
@@ -772,7 +846,6 @@ async def fetch_highlights_for_matches_missing_them():
     print(f"[Scheduler] Starting highlights fetch for matches without highlights at {datetime.now()}")
     
     db = SessionLocal()
-    highlights_found = 0
     matches_checked = 0
     
     try:
@@ -782,33 +855,29 @@ async def fetch_highlights_for_matches_missing_them():
         finished_matches = db.query(models.Match).filter(
             models.Match.match_date >= seven_days_ago,
             models.Match.match_date <= date.today(),
-            models.Match.status == 'finished'
+            models.Match.status == 'finished',
+            models.Match.highlight_count == 0
         ).all()
         
         if not finished_matches:
-            print(f"[Scheduler] No finished matches in the past 7 days")
+            print(f"[Scheduler] All finished matches in the past 7 days already have highlights")
             return
         
-        # Filter to matches without highlights
+        # Filter to teams of interest
         matches_to_process = []
         for match in finished_matches:
-            existing_highlight = db.query(models.Highlight).filter(
-                models.Highlight.match_id == match.id
-            ).first()
-            
-            if not existing_highlight:
-                league_name = match.league.name if match.league else "Unknown"
-                if match_has_team_of_interest(match.home_team, match.away_team, league_name):
-                    matches_to_process.append(match)
+            league_name = match.league.name if match.league else "Unknown"
+            if match_has_team_of_interest(match.home_team, match.away_team, league_name):
+                matches_to_process.append(match)
         
         if not matches_to_process:
-            finished_with_highlights = sum(1 for m in finished_matches if db.query(models.Highlight).filter(models.Highlight.match_id == m.id).first())
-            print(f"[Scheduler] All finished matches already have highlights ({finished_with_highlights}/{len(finished_matches)})")
+            print(f"[Scheduler] None of the {len(finished_matches)} finished matches without highlights involve teams of interest")
             return
         
         print(f"[Scheduler] Found {len(matches_to_process)} finished matches needing highlights\n")
         
         youtube_service = get_youtube_service()
+        rows = []
         
         for match in matches_to_process:
             matches_checked += 1
@@ -817,7 +886,11 @@ async def fetch_highlights_for_matches_missing_them():
             try:
                 print(f"[Scheduler] [{matches_checked}/{len(matches_to_process)}] Searching: {match.home_team} vs {match.away_team} ({match.match_date})")
                 
-                videos = youtube_service.search_highlights(
+                # Uploads already seen by the RSS poller or playlist scans cost nothing
+                videos = find_catalogued_highlights(
+                    db, match.home_team, match.away_team, match.match_date, limit=1
+                ) or await asyncio.to_thread(
+                    youtube_service.search_highlights,
                     home_team=match.home_team,
                     away_team=match.away_team,
                     league=league_name,
@@ -826,31 +899,8 @@ async def fetch_highlights_for_matches_missing_them():
                 )
                 
                 if videos:
-                    video = videos[0]
-                    # Check if this highlight already exists
-                    existing = db.query(models.Highlight).filter(
-                        models.Highlight.match_id == match.id,
-                        models.Highlight.youtube_video_id == video['video_id']
-                    ).first()
-                    
-                    if not existing:
-                        highlight = models.Highlight(
-                            match_id=match.id,
-                            youtube_video_id=video['video_id'],
-                            title=video['title'],
-                            description=video.get('description', ''),
-                            thumbnail_url=video.get('thumbnail_url', ''),
-                            channel_title=video.get('channel_title', ''),
-                            published_at=video.get('published_at'),
-                            view_count=video.get('view_count', 0),
-                            duration=video.get('duration', '')
-                        )
-                        db.add(highlight)
-                        db.commit()
-                        highlights_found += 1
-                        print(f"[Scheduler] ✓ Found: {video['title'][:60]}...")
-                    else:
-                        print(f"[Scheduler] ℹ️  Highlight already exists: {video['title'][:60]}...")
+                    rows.append(highlight_row(match.id, videos[0]))
+                    print(f"[Scheduler] ✓ Found: {videos[0]['title'][:60]}...")
                 else:
                     print(f"[Scheduler] ✗ No highlights found yet")
                     
@@ -861,6 +911,8 @@ async def fetch_highlights_for_matches_missing_them():
                 print(f"[Scheduler] Error: {e}")
                 continue
         
+        highlights_found = len(insert_highlights(db, rows))
+        
         print(f"\n[Scheduler] ==================== RESULT ====================")
         print(f"[Scheduler] Matches checked: {matches_checked}")
         print(f"[Scheduler] Highlights found: {highlights_found}")
@@ -880,7 +932,7 @@ async def reconcile_todays_matches():
     2. Re-fetches ALL of today's matches from ESPN (regardless of DB state)
     3. Ensures all matches exist in DB and are up-to-date
     4. Checks that all finished matches have highlights
-    5. Triggers highlight fetch for any finished matches missing highlights
+    5. Queues highlight discovery for finished matches the event-driven path missed
     
     This is a safety net to catch:
     - Matches that were missed during morning prefetch (e.g., Copa del Rey Barcelona vs Atletico)
@@ -907,38 +959,27 @@ async def reconcile_todays_matches():
         football_api = get_football_api()
         
         # Step 0: CHECK YESTERDAY'S MATCHES (Safety net for missed matches)
-        # This catches matches that should have been fetched during morning prefetch but weren't
+        # Re-fetches only yesterday's league-days that the fetch ledger has not
+        # seen finish (late kick-offs, leagues whose fetch failed)
         print(f"[Scheduler] Step 0: Checking yesterday's matches for completeness ({yesterday})...")
         
-        yesterday_matches_db = db.query(models.Match).filter(
-            models.Match.match_date == yesterday
-        ).count()
-        
-        print(f"[Scheduler] Yesterday in DB: {yesterday_matches_db} matches")
-        
-        # Fetch yesterday from ESPN to verify we have everything
-        yesterday_espn = await football_api.get_matches_for_date(yesterday)
-        
-        if yesterday_espn:
-            yesterday_total_espn = sum(len(matches) for matches in yesterday_espn.values())
-            print(f"[Scheduler] Yesterday on ESPN: {yesterday_total_espn} matches")
-            
-            if yesterday_total_espn > yesterday_matches_db:
-                print(f"[Scheduler] ⚠️  ALERT: Missing {yesterday_total_espn - yesterday_matches_db} matches from yesterday!")
-                print(f"[Scheduler] Re-fetching yesterday from ESPN...")
-                
-                # Re-fetch yesterday to add missing matches
-                added_count = await fetch_matches_for_date(yesterday, db)
-                if added_count > 0:
-                    stats['matches_added'] += added_count
-                    print(f"[Scheduler] ✓ Added {added_count} missing matches from yesterday")
-        
-        # Step 1: Fetch ALL today's matches from ESPN (fresh from source)
-        print(f"[Scheduler] Step 1: Fetching all matches for {today} from ESPN API...")
-        fixtures_by_league = await football_api.get_matches_for_date(today)
+        added_count = await fetch_matches_for_date(yesterday, db)
+        if added_count > 0:
+            stats['matches_added'] += added_count
+            print(f"[Scheduler] ✓ Added {added_count} missing matches from yesterday")
+        
+        # Step 1: Fetch today's stale league-days from ESPN (fresh from source)
+        print(f"[Scheduler] Step 1: Fetching stale leagues for {today} from ESPN API...")
+        stale_slugs = stale_league_slugs(db, today, football_api.LEAGUES)
+        changed = await fetch_changed_scoreboards(db, today, stale_slugs) if stale_slugs else {}
+        fixtures_by_league = {
+            football_api.LEAGUES[league_slug]: matches
+            for league_slug, matches in changed.items()
+            if matches
+        }
         
         if not fixtures_by_league:
-            print(f"[Scheduler] No matches found on ESPN for {today}")
+            print(f"[Scheduler] No changed scoreboards on ESPN for {today}")
         else:
             all_espn_matches = []
             for league_name, matches in fixtures_by_league.items():
@@ -969,8 +1010,7 @@ async def reconcile_todays_matches():
                         display_order=0
                     )
                     db.add(db_league)
-                    db.commit()
-                    db.refresh(db_league)
+                    db.flush()
                 
                 # Find existing match
                 existing = None
@@ -980,20 +1020,12 @@ async def reconcile_todays_matches():
                     ).first()
                 
                 if not existing:
-                    existing = db.query(models.Match).filter(
-                        models.Match.home_team == match["home_team"],
-                        models.Match.away_team == match["away_team"],
-                        models.Match.match_date == today
-                    ).first()
+                    existing = find_match_by_teams(db, match["home_team"], match["away_team"], today)
                 
                 home_score = match.get("home_score")
                 away_score = match.get("away_score")
                 
-                # Determine status: if has scores, mark as finished
-                if home_score is not None and away_score is not None:
-                    status = "finished"
-                else:
-                    status = match["status"]
+                status = _resolve_match_status(match, today)
                 
                 if existing:
                     # Update existing match if anything changed
@@ -1009,7 +1041,6 @@ async def reconcile_todays_matches():
                         changed = True
                     
                     if changed:
-                        db.commit()
                         stats['matches_updated'] += 1
                         print(f"[Scheduler] Updated: {match['home_team']} vs {match['away_team']} - {status} ({home_score}-{away_score})")
                 else:
@@ -1026,81 +1057,31 @@ async def reconcile_todays_matches():
                         espn_event_id=match.get("espn_event_id")
                     )
                     db.add(new_match)
-                    db.commit()
                     stats['matches_added'] += 1
                     print(f"[Scheduler] ⚠️  ADDED MISSING MATCH: {match['home_team']} vs {match['away_team']}")
-            
-            # Step 3: Check all finished matches for highlights
-            print(f"[Scheduler] Step 3: Checking highlights for finished matches...")
-            
-            finished_matches = db.query(models.Match).filter(
-                models.Match.match_date == today,
-                models.Match.status == 'finished'
-            ).all()
-            
-            if not finished_matches:
-                print(f"[Scheduler] No finished matches yet today")
-            else:
-                print(f"[Scheduler] Found {len(finished_matches)} finished matches")
-                
-                youtube_service = get_youtube_service()
-                
-                for match in finished_matches:
-                    # Check if highlights exist
-                    existing_highlight = db.query(models.Highlight).filter(
-                        models.Highlight.match_id == match.id
-                    ).first()
-                    
-                    if existing_highlight:
-                        stats['highlights_found'] += 1
-                        continue
-                    
-                    # Check if this is a match of interest
-                    league_name = match.league.name if match.league else "Unknown"
-                    if not match_has_team_of_interest(match.home_team, match.away_team, league_name):
-                        continue
-                    
-                    # Missing highlights - try to fetch now
-                    print(f"[Scheduler] ⚠️  Missing highlights: {match.home_team} vs {match.away_team}")
-                    stats['highlights_missing'] += 1
-                    
-                    try:
-                        videos = youtube_service.search_highlights(
-                            home_team=match.home_team,
-                            away_team=match.away_team,
-                            league=league_name,
-                            match_date=match.match_date,
-                            max_results=1
-                        )
-                        
-                        if videos:
-                            video = videos[0]
-                            highlight = models.Highlight(
-                                match_id=match.id,
-                                youtube_video_id=video['video_id'],
-                                title=video['title'],
-                                description=video.get('description', ''),
-                                thumbnail_url=video.get('thumbnail_url', ''),
-                                channel_title=video.get('channel_title', ''),
-                                published_at=video.get('published_at'),
-                                view_count=video.get('view_count', 0),
-                                duration=video.get('duration', '')
-                            )
-                            db.add(highlight)
-                            db.commit()
-                            print(f"[Scheduler] ✓ Found and added highlights!")
-                            stats['highlights_found'] += 1
-                            stats['highlights_missing'] -= 1
-                        else:
-                            print(f"[Scheduler] ✗ Highlights not available yet (will retry next run)")
-                            
-                    except YouTubeQuotaExhaustedError:
-                        print(f"[Scheduler] YouTube quota exhausted - will retry in next reconciliation")
-                        break
-                    except Exception as e:
-                        print(f"[Scheduler] Error fetching highlights: {e}")
-                        continue
         
+        # Matches and the ledger entries for their scoreboards land together
+        db.commit()
+        
+        # Step 3: Finished matches without highlights are found by event-driven
+        # discovery; only start it for matches that never emitted the event
+        print(f"[Scheduler] Step 3: Checking highlights for finished matches...")
+        _finish_past_fifa_matches(db, today)
+        
+        finished_matches = db.query(models.Match).filter(
+            models.Match.match_date == today,
+            models.Match.status == 'finished'
+        ).all()
+        
+        if not finished_matches:
+            print(f"[Scheduler] No finished matches yet today")
+        else:
+            stats['highlights_found'] = sum(1 for match in finished_matches if match.highlight_count)
+            stats['highlights_missing'] = len(finished_matches) - stats['highlights_found']
+            queued = queue_missed_discovery(db, finished_matches)
+            if queued:
+                print(f"[Scheduler] ⚠️  Queued highlight discovery for {queued} matches that missed the finished event")
+    
         # Print summary
         print(f"\n[Scheduler] ==================== RECONCILIATION SUMMARY ====================")
         print(f"[Scheduler] ESPN Matches Fetched (today): {stats['matches_fetched']}")
@@ -1124,119 +1105,89 @@ async def reconcile_todays_matches():
         db.close()
 
 
+def matches_awaiting_highlights(db: Session) -> List[models.Match]:
+    """Finished matches from the last 48 hours with a team of interest and no highlights yet"""
+    lookback_date = date.today() - timedelta(days=2)
+    
+    finished_matches = db.query(models.Match).options(
+        joinedload(models.Match.league)
+    ).filter(
+        models.Match.match_date >= lookback_date,
+        models.Match.status == 'finished',
+        models.Match.highlight_count == 0
+    ).all()
+    return [
+        match for match in finished_matches
+        if match.league
+        and match_has_team_of_interest(match.home_team, match.away_team, match.league.name)
+    ]
+
+
+def attach_feed_highlights(db: Session, rss_service, videos: List[dict], matches: List[models.Match], source: str = "RSS Poller") -> int:
+    """
+    Match feed entries (polled or pushed) against fixtures awaiting highlights
+    and store the first hit for each. Returns the number of highlights added.
+    """
+    rows = []
+    for match in matches:
+        found = rss_service.match_highlights(
+            videos,
+            home_team=match.home_team,
+            away_team=match.away_team,
+            league_name=match.league.name,
+            hours_lookback=24
+        )
+        if found:
+            # Take the first/best match
+            rows.append(highlight_row(match.id, found[0]))
+            print(f"[{source}] ✅ Highlight for {match.home_team} vs {match.away_team}: {found[0]['title']}")
+    return len(insert_highlights(db, rows))
+
+
 async def poll_rss_feeds_for_highlights():
     """
-    Poll YouTube RSS feeds for recent highlights (runs every 10 minutes).
+    Poll YouTube RSS feeds for recent highlights.
     This is FAST and FREE - no API quota used!
     
-    Checks recent finished matches (last 48 hours) and searches RSS feeds
-    for highlight videos. Much faster than hourly API-based search.
+    Checks recent finished matches (last 48 hours) without highlights. Each
+    channel their leagues need is fetched once per cycle, concurrently and
+    conditionally, and only videos no earlier cycle (or WebSub push) has
+    processed are matched against the pending fixtures. With WebSub enabled
+    this is the low-frequency fallback for missed pushes.
     """
     print(f"\n[RSS Poller] ==================== RSS FEED POLL ====================")
     print(f"[RSS Poller] Starting RSS feed polling at {datetime.now()}")
     
     db = SessionLocal()
-    highlights_found = 0
-    matches_checked = 0
     
     try:
-        # Get finished matches from the last 48 hours without highlights
-        lookback_date = date.today() - timedelta(days=2)
-        
-        finished_matches = db.query(models.Match).filter(
-            models.Match.match_date >= lookback_date,
-            models.Match.status == 'finished'
-        ).all()
-        
-        if not finished_matches:
-            print(f"[RSS Poller] No finished matches in the last 48 hours")
-            return
-        
-        # Filter to matches without highlights and teams of interest
-        matches_to_check = []
-        for match in finished_matches:
-            # Skip if already has highlights
-            existing_highlight = db.query(models.Highlight).filter(
-                models.Highlight.match_id == match.id
-            ).first()
-            
-            if existing_highlight:
-                continue
-            
-            # Check if it's a team of interest
-            league_name = match.league.name if match.league else "Unknown"
-            if match_has_team_of_interest(match.home_team, match.away_team, league_name):
-                matches_to_check.append(match)
-        
+        matches_to_check = matches_awaiting_highlights(db)
         if not matches_to_check:
-            with_highlights = sum(1 for m in finished_matches if db.query(models.Highlight).filter(models.Highlight.match_id == m.id).first())
-            print(f"[RSS Poller] All recent finished matches have highlights ({with_highlights}/{len(finished_matches)})")
+            print(f"[RSS Poller] No recent finished matches need highlights")
             return
         
         print(f"[RSS Poller] Checking {len(matches_to_check)} matches needing highlights")
         
         rss_service = await get_rss_service()
-        
         try:
-            for match in matches_to_check:
-                matches_checked += 1
-                league_name = match.league.name if match.league else None
-                
-                if not league_name:
-                    continue
-                
-                try:
-                    print(f"[RSS Poller] Searching RSS: {match.home_team} vs {match.away_team} ({league_name})")
-                    
-                    # Search RSS feeds for this match (24 hour lookback)
-                    videos = await rss_service.find_recent_highlights_for_match(
-                        home_team=match.home_team,
-                        away_team=match.away_team,
-                        league_name=league_name,
-                        match_date=match.match_date,
-                        hours_lookback=24
-                    )
-                    
-                    if videos:
-                        video = videos[0]  # Take the first/best match
-                        
-                        # Check if this highlight already exists
-                        existing = db.query(models.Highlight).filter(
-                            models.Highlight.youtube_video_id == video['youtube_video_id']
-                        ).first()
-                        
-                        if not existing:
-                            # Create new highlight
-                            highlight = models.Highlight(
-                                match_id=match.id,
-                                youtube_video_id=video['youtube_video_id'],
-                                title=video['title'],
-                                description=video.get('description'),
-                                thumbnail_url=video.get('thumbnail_url'),
-                                channel_title=video.get('channel_title'),
-                                is_official=video.get('is_official', True),
-                                published_at=video.get('published_at')
-                            )
-                            
-                            db.add(highlight)
-                            db.commit()
-                            db.refresh(highlight)
-                            
-                            highlights_found += 1
-                            print(f"[RSS Poller] ✅ Added highlight: {video['title']}")
-                        else:
-                            print(f"[RSS Poller] ℹ️  Highlight already exists")
-                    else:
-                        print(f"[RSS Poller] ❌ No highlights found yet")
-                
-                except Exception as e:
-                    print(f"[RSS Poller] Error processing match {match.id}: {e}")
-                    continue
+            channel_ids = rss_service.channels_for_leagues({m.league.name for m in matches_to_check})
+            new_videos = await rss_service.poll_new_videos(channel_ids)
         finally:
             await rss_service.close()
         
+        if not new_videos:
+            print(f"[RSS Poller] No new videos since the last poll")
+            return
+        
+        highlights_found = attach_feed_highlights(db, rss_service, new_videos, matches_to_check)
+        
+        # Matches that finish later are picked up by event-driven discovery,
+        # which reads whole feeds rather than only unseen entries
+        rss_service.mark_videos_seen(new_videos)
+        
         print(f"[RSS Poller] ==================== RSS POLL COMPLETE ====================")
-        print(f"[RSS Poller] Matches Checked: {matches_checked}")
+        print(f"[RSS Poller] Matches Checked: {len(matches_to_check)}")
+        print(f"[RSS Poller] New Videos: {len(new_videos)}")
         print(f"[RSS Poller] New Highlights Found: {highlights_found}")
         print(f"[RSS Poller] ===========================================================\n")
     
@@ -1249,122 +1200,533 @@ async def poll_rss_feeds_for_highlights():
         db.close()
 
 
+async def renew_websub_subscriptions():
+    """Subscribe channels to WebSub push and renew leases that expire within a day"""
+    db = SessionLocal()
+    try:
+        await renew_subscriptions(db)
+    except Exception as e:
+        print(f"[WebSub] Error renewing subscriptions: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+async def fetch_fifa_highlights():
+    """
+    FIFA World Cup highlight fetching - searches ONLY in FOX Sports channel.
+    Searches FOX channel for "{Team1} vs {Team2} Extended Highlights" for finished
+    FIFA matches from the last 60 days that have no highlights yet.
+    
+    Enqueued from /api/admin/fetch-fifa-highlights and run by the task worker.
+    """
+    from googleapiclient.errors import HttpError
+    
+    # FOX Sports YouTube channel ID
+    FOX_SPORTS_CHANNEL_ID = "UCwNqHDsnBCKT-olwJwIFyfg"
+    
+    db = SessionLocal()
+    
+    try:
+        youtube_service = get_youtube_service()
+        
+        fifa_league = db.query(models.League).filter(
+            models.League.slug == "fifa-world-cup"
+        ).first()
+        
+        if not fifa_league:
+            print("[FIFA] FIFA World Cup league not found")
+            return {"highlights_found": 0}
+        
+        # Get matches from last 60 days that are finished and don't have highlights
+        sixty_days_ago = datetime.utcnow().date() - timedelta(days=60)
+        matches_needing_highlights = db.query(models.Match).filter(
+            models.Match.league_id == fifa_league.id,
+            models.Match.match_date >= sixty_days_ago,
+            models.Match.status == "finished",
+            models.Match.highlight_count == 0
+        ).all()
+        
+        print(f"[FIFA] Found {len(matches_needing_highlights)} finished FIFA matches needing highlights")
+        
+        rows = []
+        for match in matches_needing_highlights:
+            try:
+                # Use search().list() with channelId to search WITHIN FOX Sports channel only
+                # search().list() supports q= parameter - costs 100 units but scoped to 1 channel
+                query = f"{match.home_team} vs {match.away_team} Extended Highlights"
+                print(f"[FIFA] Searching FOX Sports channel for: {query}")
+                
+                response = await asyncio.to_thread(guarded_execute, youtube_service.youtube.search().list(
+                    part='snippet',
+                    channelId=FOX_SPORTS_CHANNEL_ID,
+                    q=query,
+                    type='video',
+                    maxResults=5,
+                    order='relevance'
+                ))
+                
+                videos_added = 0
+                
+                for item in response.get('items', []):
+                    snippet = item['snippet']
+                    video_id = item['id']['videoId']
+                    title = snippet['title']
+                    
+                    # Filter: must contain both team names AND "extended highlights"
+                    title_lower = title.lower()
+                    home_in_title = match.home_team.lower() in title_lower
+                    away_in_title = match.away_team.lower() in title_lower
+                    has_extended = 'extended highlights' in title_lower
+                    
+                    if home_in_title and away_in_title and has_extended:
+                        rows.append(highlight_row(match.id, {
+                            'video_id': video_id,
+                            'title': title,
+                            'description': snippet.get('description', ''),
+                            'thumbnail_url': snippet['thumbnails'].get('high', {}).get('url') or
+                                             snippet['thumbnails'].get('medium', {}).get('url'),
+                            'channel_title': snippet.get('channelTitle', 'FOX Sports'),
+                            'published_at': snippet.get('publishedAt')
+                        }))
+                        videos_added += 1
+                        print(f"[FIFA] ✓ Found on FOX Sports: {title[:70]}")
+                
+                if videos_added == 0:
+                    print(f"[FIFA] ✗ No highlights found in FOX Sports for {match.home_team} vs {match.away_team}")
+                    
+            except HttpError as e:
+                if 'quotaExceeded' in str(e):
+                    print(f"[FIFA] YouTube quota exhausted - stopping fetch")
+                    break
+                else:
+                    print(f"[FIFA] YouTube API error: {e}")
+                    continue
+            except Exception as e:
+                print(f"[FIFA] Error fetching highlights for {match.home_team} vs {match.away_team}: {e}")
+                continue
+        
+        highlights_found = len(insert_highlights(db, rows))
+        print(f"[FIFA] ✅ Highlight fetch complete! Found {highlights_found} new highlights from FOX Sports")
+        return {"highlights_found": highlights_found}
+    
+    finally:
+        db.close()
+
+
+async def fetch_highlights_for_match(match_id: int, replace_existing: bool = False):
+    """
+    Search YouTube for one match's highlights.
+    
+    Enqueued from /api/matches/{id}/fetch-highlights (best video only) and
+    /api/highlights/refresh/{id} (replace_existing=True: delete the current
+    highlights and store every video found).
+    
+    Returns:
+        Dict with success, message and highlights_found, as in YouTubeSearchResponse
+    """
+    db = SessionLocal()
+    try:
+        match = db.query(models.Match).filter(models.Match.id == match_id).first()
+        if not match:
+            return {"success": False, "message": "Match not found", "highlights_found": 0}
+        
+        league_name = match.league.name if match.league else None
+        youtube_service = get_youtube_service()
+        try:
+            videos = await asyncio.to_thread(
+                youtube_service.search_highlights,
+                match.home_team,
+                match.away_team,
+                league=league_name if replace_existing else None
+            )
+        except YouTubeQuotaExhaustedError as e:
+            return {"success": False, "message": str(e), "highlights_found": 0}
+        
+        if replace_existing:
+            # Deleted in the same transaction as the insert below
+            db.query(models.Highlight).filter(models.Highlight.match_id == match_id).delete()
+            refresh_highlight_counters(db, [match_id])
+        else:
+            # Only take the first (best) video - one highlight per match
+            videos = videos[:1]
+        
+        inserted = insert_highlights(db, [highlight_row(match.id, video) for video in videos])
+        
+        verb = "Refreshed" if replace_existing else "Found"
+        print(f"[Scheduler] {verb} {len(inserted)} highlights for {match.home_team} vs {match.away_team}")
+        return {
+            "success": True,
+            "message": f"{verb} highlights for {match.home_team} vs {match.away_team}",
+            "highlights_found": len(inserted)
+        }
+    finally:
+        db.close()
+
+
+async def update_match_feeds(match_ids: List[int]):
+    """
+    Fan matches out to their followers' feeds.
+    
+    Queued by app.user_feed when fixtures are added and by insert_highlights
+    when highlights land.
+    """
+    db = SessionLocal()
+    try:
+        written = update_feeds_for_matches(db, match_ids)
+        print(f"[Feed] Updated {written} feed items for {len(match_ids)} matches")
+        return {"matches": len(match_ids), "feed_items": written}
+    finally:
+        db.close()
+
+
+async def notify_highlights(match_ids: List[int]):
+    """
+    Notify the followers of matches whose highlights just landed.
+    
+    Queued by insert_highlights; queues deliver_notifications batches in turn.
+    """
+    db = SessionLocal()
+    try:
+        result = notify_highlights_available(db, match_ids)
+        print(f"[Notifications] Created {result['notifications']} notifications for {len(match_ids)} matches")
+        return result
+    finally:
+        db.close()
+
+
+async def deliver_notifications(notification_ids: List[int]):
+    """
+    Email a batch of notifications over the worker's pooled SMTP connection,
+    skipping ones already sent. Transient failures left after the sender's own
+    retries fail the task so the queue retries it later; sent ones are
+    recorded first, so a retry only resends the rest. Permanently rejected
+    ones (5xx) get email_error and are never retried.
+    """
+    if not get_settings().smtp_configured():
+        print("[Notifications] Email not configured - leaving notifications unsent")
+        return {"emailed": 0}
+    db = SessionLocal()
+    try:
+        notifications = pending_email_notifications(db, notification_ids)
+        messages = {
+            notification.id: build_notification_email(
+                notification.user.email, notification.title, notification.message or ""
+            )
+            for notification in notifications
+        }
+        sent, failed = await get_email_sender().send_batch(messages)
+        rejected = {key: error for key, error in failed.items() if isinstance(error, PermanentEmailError)}
+        mark_emails_rejected(db, rejected)
+        mark_emails_sent(db, sent)
+        
+        for notification_id, error in failed.items():
+            print(f"[Notifications] Email for notification {notification_id} failed: {error}")
+        print(f"[Notifications] Emailed {len(sent)}/{len(notifications)} notifications")
+        transient = [key for key, error in failed.items() if isinstance(error, TransientEmailError)]
+        if transient:
+            raise TransientEmailError(f"{len(transient)} notification emails failed, will retry")
+        return {"emailed": len(sent), "rejected": len(rejected)}
+    finally:
+        db.close()
+
+
+async def deliver_push_notifications(notification_ids: List[int]):
+    """Push a batch of notifications to their users' devices via Expo"""
+    db = SessionLocal()
+    try:
+        result = await dispatch_push_notifications(db, notification_ids)
+        print(f"[Push] Sent {result['messages']} push messages, {result['accepted']} accepted, "
+              f"{result['rejected']} notifications rejected, {result['tokens_pruned']} tokens pruned")
+        return result
+    finally:
+        db.close()
+
+
+async def check_push_receipts(receipts: Dict[str, str]):
+    """Prune device tokens that Expo receipts report as unregistered"""
+    db = SessionLocal()
+    try:
+        result = await check_receipts(db, receipts)
+        print(f"[Push] Checked {result['receipts']} receipts, {result['tokens_pruned']} tokens pruned")
+        return result
+    finally:
+        db.close()
+
+
+async def discover_highlights_for_match(match_id: int, attempt: int = 0):
+    """
+    One event-driven discovery attempt for a match that just finished.
+    
+    Queued by app.match_events when a match's status changes to "finished".
+    Checks the local channel_videos catalogue and the free RSS feeds first,
+    then falls back to a YouTube API search; if nothing is found the next
+    attempt is queued on the backoff curve.
+    """
+    db = SessionLocal()
+    try:
+        match = db.query(models.Match).filter(models.Match.id == match_id).first()
+        if not match:
+            return {"found": False, "reason": "match not found"}
+        
+        if match.highlight_count:
+            return {"found": True, "reason": "already has highlights"}
+        
+        league_name = match.league.name if match.league else None
+        if not match_has_team_of_interest(match.home_team, match.away_team, league_name or "Unknown"):
+            return {"found": False, "reason": "no team of interest"}
+        
+        print(f"[Discovery] Attempt {attempt + 1}/{len(DISCOVERY_BACKOFF_MINUTES)}: {match.home_team} vs {match.away_team}")
+        
+        # Each attempt has max_attempts=1, so a failed lookup counts as "not
+        # found" rather than failing the task and dropping the rest of the curve
+        video = None
+        try:
+            catalogued = find_catalogued_highlights(db, match.home_team, match.away_team, match.match_date, limit=1)
+            video = catalogued[0] if catalogued else None
+        except Exception as e:
+            db.rollback()
+            print(f"[Discovery] Catalogue lookup failed: {e}")
+        
+        if video is None and league_name:
+            try:
+                rss_service = await get_rss_service()
+                try:
+                    videos = await rss_service.find_recent_highlights_for_match(
+                        home_team=match.home_team,
+                        away_team=match.away_team,
+                        league_name=league_name,
+                        match_date=match.match_date,
+                        hours_lookback=48
+                    )
+                finally:
+                    await rss_service.close()
+                if videos:
+                    video = dict(videos[0], video_id=videos[0]['youtube_video_id'])
+            except Exception as e:
+                print(f"[Discovery] RSS lookup failed: {e}")
+        
+        if video is None:
+            try:
+                videos = await asyncio.to_thread(
+                    get_youtube_service().search_highlights,
+                    home_team=match.home_team,
+                    away_team=match.away_team,
+                    league=league_name,
+                    match_date=match.match_date,
+                    max_results=1
+                )
+            except YouTubeQuotaExhaustedError:
+                videos = []
+                print(f"[Discovery] YouTube quota exhausted - relying on RSS until the next attempt")
+            except Exception as e:
+                videos = []
+                print(f"[Discovery] YouTube search failed: {e}")
+            if videos:
+                video = videos[0]
+        
+        if video is not None:
+            insert_highlights(db, [highlight_row(match.id, video)])
+            print(f"[Discovery] ✓ Found: {video['title'][:60]}...")
+            return {"found": True, "video_id": video['video_id'], "attempt": attempt}
+        
+        next_task = schedule_highlight_discovery(db, match.id, attempt + 1)
+        if next_task is None:
+            print(f"[Discovery] ✗ Giving up on {match.home_team} vs {match.away_team} after {attempt + 1} attempts")
+            return {"found": False, "reason": "gave up", "attempt": attempt}
+        return {"found": False, "attempt": attempt, "next_task_id": next_task.id}
+    finally:
+        db.close()
+
+
 def start_scheduler():
-    """Start the scheduler with configured jobs"""
+    """
+    Start the scheduler if this process wins leader election.
+    
+    Every API worker calls this on startup; only the one holding the leader lock
+    runs jobs. The others keep retrying in the background and take over if the
+    leader goes away.
+    """
+    global _leadership_task
+    
+    if get_leader_lock().try_acquire():
+        _become_leader()
+    else:
+        print("[Scheduler] Another instance is the scheduler leader - running as follower")
+    
+    try:
+        _leadership_task = asyncio.get_running_loop().create_task(_leadership_watchdog())
+    except RuntimeError:
+        # Not inside an event loop (scripts): no failover needed
+        pass
+
+
+def _become_leader():
+    if scheduler.running:
+        scheduler.resume()
+        print("[Scheduler] Leadership regained - jobs resumed")
+    else:
+        print("[Scheduler] Acquired leader lock")
+        _schedule_jobs()
+
+
+async def _leadership_watchdog():
+    """Keep leadership state current: fail over to followers, step down on lost locks"""
+    lock = get_leader_lock()
+    while True:
+        await asyncio.sleep(LEADER_CHECK_SECONDS)
+        try:
+            if lock.is_leader:
+                if not lock.check_alive() and scheduler.running:
+                    scheduler.pause()
+                    print("[Scheduler] Leader lock lost - jobs paused")
+            elif lock.try_acquire():
+                _become_leader()
+        except Exception as e:
+            print(f"[Scheduler] Leadership check failed: {e}")
+
+
+def _schedule_jobs():
+    """Register the configured jobs and start the scheduler"""
+    
+    wanted = {}
+    
+    def schedule(func, trigger, **options):
+        wanted[options["id"]] = (func, trigger, options)
     
     try:
         # Schedule the prefetch job to run daily at 6:00 AM local time
-        scheduler.add_job(
+        schedule(
             prefetch_upcoming_matches,
             CronTrigger(hour=6, minute=0),
             id="prefetch_matches",
-            name="Daily Match Prefetch (Morning)",
-            replace_existing=True
+            name="Daily Match Prefetch (Morning)"
         )
         
         # Schedule SECOND prefetch at 6:00 PM to catch matches ESPN adds between 6 AM-6 PM
         # This reduces the maximum miss window from 24 hours to 12 hours
         # (ESPN often publishes cup match data with 3-7 day lead time, not always available at first check)
-        scheduler.add_job(
+        schedule(
             prefetch_upcoming_matches,
             CronTrigger(hour=18, minute=0),
             id="prefetch_matches_evening",
-            name="Daily Match Prefetch (Evening)",
-            replace_existing=True
+            name="Daily Match Prefetch (Evening)"
         )
         
-        # Schedule score refresh every 2 hours for status updates
-        scheduler.add_job(
-            refresh_today_scores,
-            CronTrigger(hour='*/2', minute=0),  # Every 2 hours at :00
+        # Live score polling - the job wakes every minute but only calls ESPN for
+        # leagues with matches live or about to kick off (see live_poll_planner)
+        schedule(
+            poll_live_scores,
+            CronTrigger(minute='*'),
             id="refresh_scores",
-            name="Score Status Refresh",
-            replace_existing=True
-        )
-        
-        # Schedule highlights fetch for yesterday's matches - 8 AM and 2 PM
-        # Morning run: First attempt, no notification (highlights may still be uploading)
-        scheduler.add_job(
-            fetch_highlights_for_yesterday,
-            CronTrigger(hour=8, minute=0),
-            id="fetch_highlights_morning",
-            name="Morning Highlights Fetch",
-            replace_existing=True,
-            kwargs={"send_notification": False}
+            name="Adaptive Live Score Polling"
         )
         
-        # Afternoon run: Second attempt, send email if highlights still missing
-        scheduler.add_job(
+        # Highlights are found by event-driven discovery as matches finish; this
+        # sweep of yesterday's matches is the fallback for ones that never emitted
+        # the event, and emails the admin about any still missing
+        schedule(
             fetch_highlights_for_yesterday,
             CronTrigger(hour=14, minute=0),
             id="fetch_highlights_afternoon",
-            name="Afternoon Highlights Fetch",
-            replace_existing=True,
-            kwargs={"send_notification": True}
-        )
-        
-        # Fetch highlights for today's finished matches every hour throughout the day
-        # Matches happen at various times globally, highlights typically uploaded within 1-3 hours after match ends
-        scheduler.add_job(
-            fetch_highlights_for_today,
-            CronTrigger(hour='8-23', minute=0),  # Every hour from 8 AM to 11 PM
-            id="fetch_today_highlights",
-            name="Today's Highlights Fetch",
-            replace_existing=True
+            name="Yesterday's Highlights Fallback",
+            kwargs={"send_notification": True, "fallback_only": True}
         )
         
         # Comprehensive reconciliation job - safety net to catch missed matches/highlights
         # Runs at noon, 6 PM, and 11 PM to ensure nothing is missed
-        scheduler.add_job(
+        schedule(
             reconcile_todays_matches,
             CronTrigger(hour='12,18,23', minute=0),  # 12 PM, 6 PM, 11 PM
             id="reconcile_matches",
-            name="Daily Match Reconciliation",
-            replace_existing=True
+            name="Daily Match Reconciliation"
         )
         
         # RSS Feed Polling - FAST and FREE highlight discovery
-        # Polls YouTube RSS feeds every 10 minutes for instant highlight detection
-        # No API quota used, gives us highlights within 10-15 minutes of upload!
-        scheduler.add_job(
+        # With WebSub enabled uploads are pushed within seconds, so RSS polling
+        # drops to a 30-minute fallback for missed pushes; otherwise every 10 min.
+        websub_enabled = get_settings().websub_enabled()
+        rss_minutes = 30 if websub_enabled else 10
+        schedule(
             poll_rss_feeds_for_highlights,
-            CronTrigger(minute='*/10'),  # Every 10 minutes
+            CronTrigger(minute=f'*/{rss_minutes}'),
             id="rss_feed_polling",
-            name="RSS Feed Polling (Every 10 min)",
-            replace_existing=True
+            name=f"RSS Feed Polling (Every {rss_minutes} min)"
         )
         
-        # Aggressive highlight retry - every 30 minutes for matches missing highlights
-        # This ensures we catch highlights even if they're delayed
-        scheduler.add_job(
+        if websub_enabled:
+            # Subscribe on start, then renew leases before they expire
+            schedule(
+                renew_websub_subscriptions,
+                CronTrigger(hour='*/6', minute=15),
+                id="websub_renewal",
+                name="WebSub Subscription Renewal (Every 6 hours)",
+                next_run_time=datetime.now()
+            )
+        
+        # Highlight retry sweep for matches still missing highlights. Matches that
+        # finish are retried individually on a backoff curve (see match_events),
+        # so this is only a safety net for matches that never emitted the event.
+        schedule(
             fetch_highlights_for_matches_missing_them,
-            CronTrigger(minute='*/30'),  # Every 30 minutes
+            CronTrigger(hour='*/3', minute=30),  # Every 3 hours
             id="aggressive_highlight_retry",
-            name="Aggressive Highlight Retry (Every 30 min)",
-            replace_existing=True
+            name="Highlight Retry Sweep (Every 3 hours)"
         )
         
-        scheduler.start()
+        # Start paused so the stored jobs can be reconciled before any of them fire
+        scheduler.start(paused=True)
+        _sync_jobs(wanted)
+        scheduler.resume()
         print("[Scheduler] Started! Jobs scheduled:")
         print("  - Daily prefetch at 6:00 AM (7-day lookahead)")
         print("  - Daily prefetch at 6:00 PM (catch late ESPN data updates)")
-        print("  - Score status refresh every 2 hours")
-        print("  - Highlights fetch at 8 AM and 2 PM (yesterday's matches)")
-        print("  - Today's highlights fetch every hour (8 AM - 11 PM)")
+        print("  - Live scores every 1-2 min for leagues in play (idle otherwise)")
+        print("  - Yesterday's highlights fallback at 2 PM")
         print("  - Match reconciliation at 12 PM, 6 PM, 11 PM (safety net)")
-        print("  - 🚀 RSS feed polling every 10 minutes (FAST & FREE!)")
-        print("  - ⚡ Aggressive highlight retry every 30 minutes (catch delayed uploads)")
-        print("[Scheduler] Note: RSS polling provides highlights 10-15 min after upload!")
+        if websub_enabled:
+            print("  - 🚀 WebSub push for channel uploads (lease renewal every 6 hours)")
+        print(f"  - RSS feed polling every {rss_minutes} minutes")
+        print("  - ⚡ Highlight discovery per finished match (+15m, +30m, +1h, +2h, ... backoff)")
+        print("  - Highlight retry sweep every 3 hours (safety net)")
     except Exception as e:
         print(f"[Scheduler] Warning: Failed to start scheduler: {e}")
         print("[Scheduler] Application will continue without scheduled jobs")
 
 
+def _sync_jobs(wanted: Dict[str, tuple]):
+    """
+    Reconcile the persistent job store with the configured jobs.
+    
+    Jobs already stored keep their next_run_time, so a run missed while no
+    leader was up still fires (coalesced) when the scheduler resumes. Missing
+    jobs are added, changed triggers rescheduled, and stored jobs that are no
+    longer configured (e.g. websub_renewal once WebSub is turned off) removed.
+    """
+    stored = {job.id: job for job in scheduler.get_jobs()}
+    for job_id, (func, trigger, options) in wanted.items():
+        job = stored.pop(job_id, None)
+        if job is None:
+            scheduler.add_job(func, trigger, **options)
+            continue
+        if str(job.trigger) != str(trigger):
+            scheduler.reschedule_job(job_id, trigger=trigger)
+        if job.name != options["name"] or job.kwargs != options.get("kwargs", {}):
+            scheduler.modify_job(job_id, name=options["name"], kwargs=options.get("kwargs", {}))
+    
+    for job_id in stored:
+        scheduler.remove_job(job_id)
+        print(f"[Scheduler] Removed job no longer scheduled: {job_id}")
+
+
 def shutdown_scheduler():
-    """Gracefully shutdown the scheduler"""
+    """Gracefully shutdown the scheduler and hand leadership to another instance"""
     try:
+        if _leadership_task is not None:
+            _leadership_task.cancel()
         if scheduler.running:
             scheduler.shutdown(wait=False)
             print("[Scheduler] Shutdown complete")
+        get_leader_lock().release()
     except Exception as e:
         print(f"[Scheduler] Warning: Error during shutdown: {e}")
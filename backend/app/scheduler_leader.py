@@ -0,0 +1,130 @@
+"""
+Scheduler leader election.
+
+Every uvicorn worker and replica imports the app and calls start_scheduler(),
+but only one process should run the scheduled jobs. Leadership is held through
+a session-level Postgres advisory lock on a dedicated connection; if the leader
+dies its connection closes, the lock is released, and a follower picks it up on
+its next attempt. Local SQLite development uses an exclusive file lock instead.
+"""
+import os
+import tempfile
+from typing import Optional
+
+from sqlalchemy import text
+
+from .database import engine
+
+# Arbitrary application-wide key for pg_try_advisory_lock
+SCHEDULER_LOCK_ID = 7_265_431_001
+
+
+class SchedulerLeaderLock:
+    """Non-blocking, process-wide leadership lock for the scheduler"""
+
+    def __init__(self):
+        self._connection = None
+        self._lock_file = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._connection is not None or self._lock_file is not None
+
+    def try_acquire(self) -> bool:
+        """Try to become leader. Returns True if this process holds the lock."""
+        if self.is_leader:
+            return True
+        if engine.dialect.name == "postgresql":
+            return self._try_acquire_advisory_lock()
+        return self._try_acquire_file_lock()
+
+    def check_alive(self) -> bool:
+        """Verify a held lock is still valid (the lock connection may have dropped)"""
+        if self._connection is None:
+            return self.is_leader
+        try:
+            self._connection.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            print(f"[Scheduler] Lost leader lock connection: {e}")
+            self._discard_connection()
+            return False
+
+    def release(self):
+        if self._connection is not None:
+            try:
+                self._connection.execute(
+                    text("SELECT pg_advisory_unlock(:lock_id)"), {"lock_id": SCHEDULER_LOCK_ID}
+                )
+            except Exception:
+                pass
+            self._discard_connection()
+        if self._lock_file is not None:
+            try:
+                import fcntl
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            except Exception:
+                pass
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _try_acquire_advisory_lock(self) -> bool:
+        connection = None
+        try:
+            # Autocommit so the held session lock doesn't keep a transaction open
+            connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:lock_id)"), {"lock_id": SCHEDULER_LOCK_ID}
+            ).scalar()
+        except Exception as e:
+            print(f"[Scheduler] Could not check leader lock: {e}")
+            if connection is not None:
+                connection.close()
+            return False
+
+        if not acquired:
+            connection.close()
+            return False
+        self._connection = connection
+        return True
+
+    def _try_acquire_file_lock(self) -> bool:
+        try:
+            import fcntl
+        except ImportError:
+            # No flock on this platform (Windows dev machine): single process assumed
+            self._lock_file = open(_lock_file_path(), "a")
+            return True
+
+        lock_file = open(_lock_file_path(), "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _discard_connection(self):
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+
+def _lock_file_path() -> str:
+    database = engine.url.database
+    if database and database != ":memory:":
+        return f"{os.path.abspath(database)}.scheduler.lock"
+    return os.path.join(tempfile.gettempdir(), "football-highlights-scheduler.lock")
+
+
+_leader_lock: Optional[SchedulerLeaderLock] = None
+
+
+def get_leader_lock() -> SchedulerLeaderLock:
+    global _leader_lock
+    if _leader_lock is None:
+        _leader_lock = SchedulerLeaderLock()
+    return _leader_lock
@@ -68,7 +68,11 @@ class MatchCreate(MatchBase):
 class Match(MatchBase):
     id: int
     league_id: int
+    home_team_id: Optional[int] = None
+    away_team_id: Optional[int] = None
     espn_event_id: Optional[str] = None
+    highlight_count: int = 0
+    latest_highlight_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     
@@ -91,6 +95,21 @@ class HighlightsGroupedByLeague(BaseModel):
     total_highlights: int
 
 
+class FeedItem(BaseModel):
+    """A match in the user's timeline: kind is 'upcoming' or 'highlights'"""
+    kind: str
+    sort_at: datetime
+    match: MatchWithHighlights
+    
+    class Config:
+        from_attributes = True
+
+
+class FeedPage(BaseModel):
+    items: List[FeedItem]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page
+
+
 class ScrapeResponse(BaseModel):
     success: bool
     message: str
@@ -104,6 +123,12 @@ class YouTubeSearchResponse(BaseModel):
     highlights_found: int
 
 
+class QueuedYouTubeSearchResponse(YouTubeSearchResponse):
+    """Highlight search queued for the task worker; poll /api/tasks/{task_id}"""
+    task_id: int
+    status: str
+
+
 class MatchForHighlights(BaseModel):
     """Match info for the cost estimation preview"""
     id: int
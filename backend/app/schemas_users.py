@@ -37,6 +37,7 @@ class UserFavoriteTeamCreate(UserFavoriteTeamBase):
 class UserFavoriteTeamResponse(UserFavoriteTeamBase):
     id: int
     user_id: int
+    team_id: Optional[int] = None
     created_at: datetime
     
     class Config:
@@ -76,7 +77,24 @@ class NotificationResponse(NotificationBase):
     sent_at: datetime
     read_at: Optional[datetime] = None
     email_sent: bool = False
+    email_error: Optional[str] = None
     push_sent: bool = False
+    push_error: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class PushDeviceRegister(BaseModel):
+    token: str  # ExponentPushToken[...] from expo-notifications
+    platform: Optional[str] = None  # 'ios', 'android'
+
+
+class PushDeviceResponse(PushDeviceRegister):
+    id: int
+    user_id: int
+    created_at: datetime
+    last_seen_at: datetime
     
     class Config:
         from_attributes = True
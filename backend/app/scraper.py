@@ -1,5 +1,4 @@
 import httpx
-from bs4 import BeautifulSoup
 from datetime import date, datetime, timedelta
 from typing import List, Dict, Optional
 import re
@@ -44,6 +43,8 @@ class BBCSportScraper:
         return all_fixtures
     
     def parse_fixtures(self, html: str, match_date: date = None) -> Dict[str, List[Dict]]:
+        from bs4 import BeautifulSoup  # bs4/lxml are only needed when scraping
+        
         soup = BeautifulSoup(html, 'lxml')
         fixtures_by_league = {}
         match_date = match_date or date.today()
@@ -0,0 +1,263 @@
+"""
+Catalogue search for songs and artists.
+
+On PostgreSQL this uses the tsvector column and pg_trgm indexes created by
+migrations/add_music_search_indexes.sql. Locally on SQLite it uses FTS5 tables
+that are created and populated on first use. Both backends match accent-insensitively
+(unaccent / remove_diacritics), support prefix matching for as-you-type search and
+return results ordered by relevance.
+"""
+import unicodedata
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .database import is_postgres
+
+
+_sqlite_fts_ready = False
+
+
+def _is_token_char(char: str) -> bool:
+    # Combining marks (e.g. Devanagari and Tamil vowel signs, category M*) are
+    # part of the word; \w would split 'तुम' into 'त' and 'म'
+    return char.isalnum() or unicodedata.category(char).startswith('M')
+
+
+def _tokenize(term: str) -> List[str]:
+    """Split a search term into words on whitespace and punctuation"""
+    tokens, current = [], []
+    for char in term.lower():
+        if _is_token_char(char):
+            current.append(char)
+        elif current:
+            tokens.append(''.join(current))
+            current = []
+    if current:
+        tokens.append(''.join(current))
+    return tokens
+
+
+def search_songs(
+    db: Session,
+    term: str,
+    language: Optional[str] = None,
+    year: Optional[str] = None,
+    artist: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    after: Optional[Tuple[float, int]] = None,
+) -> list:
+    """
+    Search songs by title, album/movie and artist name, best matches first.
+
+    Args:
+        db: Database session
+        term: Free-text search term
+        language, year, artist: Optional filters, same semantics as /music/songs
+        limit, offset: Result window
+        after: (rank, id) of the last row already returned, for keyset paging
+
+    Returns:
+        Rows with the same columns as /music/songs plus a ``rank`` column
+    """
+    tokens = _tokenize(term)
+    if not tokens:
+        return []
+
+    if is_postgres(db):
+        query, params = _postgres_song_query(term, tokens)
+    else:
+        _ensure_sqlite_fts(db)
+        query, params = _sqlite_song_query(tokens)
+
+    filters = ""
+    if language:
+        filters += " AND ranked.language = :language"
+        params["language"] = language.upper()
+    if year:
+        filters += " AND ranked.year = :year"
+        params["year"] = year
+    if artist:
+        filters += " AND LOWER(ranked.composer) LIKE :artist"
+        params["artist"] = f"%{artist.lower()}%"
+    if after:
+        filters += " AND (ranked.rank < :after_rank OR (ranked.rank = :after_rank AND ranked.id < :after_id))"
+        params["after_rank"], params["after_id"] = after
+
+    final_query = f"""
+        SELECT * FROM ({query}) ranked
+        WHERE 1=1 {filters}
+        ORDER BY ranked.rank DESC, ranked.id DESC
+        LIMIT :limit OFFSET :offset
+    """
+    params["limit"] = limit
+    params["offset"] = offset
+
+    return db.execute(text(final_query), params).fetchall()
+
+
+def search_artists(db: Session, term: str, language: Optional[str] = None, limit: int = 50) -> list:
+    """Search artists by name, best matches first. Rows have id, name, slug, language and rank."""
+    tokens = _tokenize(term)
+    if not tokens:
+        return []
+
+    params = {"limit": limit}
+    if is_postgres(db):
+        query = """
+            SELECT id, name, slug, language,
+                   similarity(f_unaccent(lower(name)), f_unaccent(lower(:term))) AS rank
+            FROM artists
+            WHERE (f_unaccent(lower(name)) LIKE '%' || f_unaccent(lower(:term)) || '%'
+                   OR f_unaccent(lower(name)) % f_unaccent(lower(:term)))
+        """
+        params["term"] = term
+    else:
+        _ensure_sqlite_fts(db)
+        query = """
+            SELECT a.id, a.name, a.slug, a.language, -bm25(artists_fts) AS rank
+            FROM artists_fts
+            JOIN artists a ON a.id = artists_fts.rowid
+            WHERE artists_fts MATCH :match
+        """
+        params["match"] = _fts5_match(tokens)
+
+    query = f"SELECT * FROM ({query}) ranked WHERE 1=1"
+    if language:
+        query += " AND ranked.language = :language"
+        params["language"] = language.upper()
+
+    query += " ORDER BY ranked.rank DESC, ranked.name LIMIT :limit"
+    return db.execute(text(query), params).fetchall()
+
+
+def _postgres_song_query(term: str, tokens: List[str]) -> Tuple[str, dict]:
+    # Full-text hits are weighted above trigram similarity so exact word
+    # matches win; trigram matches cover substrings and misspellings.
+    query = """
+        WITH q AS (
+            SELECT f_unaccent(lower(:term)) AS term,
+                   to_tsquery('simple', f_unaccent(:tsquery)) AS tsq
+        ),
+        candidates AS (
+            SELECT s.id FROM songs s, q WHERE s.search_vector @@ q.tsq
+            UNION
+            SELECT s.id FROM songs s, q
+            WHERE f_unaccent(lower(s.title)) LIKE '%' || q.term || '%'
+               OR f_unaccent(lower(s.album)) LIKE '%' || q.term || '%'
+               OR f_unaccent(lower(s.title)) % q.term
+            UNION
+            SELECT s.id FROM songs s JOIN artists a ON s.artist_id = a.id, q
+            WHERE f_unaccent(lower(a.name)) LIKE '%' || q.term || '%'
+               OR f_unaccent(lower(a.name)) % q.term
+        )
+        SELECT
+            s.id,
+            s.title,
+            s.language,
+            s.year,
+            a.name as composer,
+            s.youtube_video_id as "videoId",
+            s.album as movie,
+            s.start_seconds as "startSeconds",
+            s.end_seconds as "endSeconds",
+            (2 * ts_rank(s.search_vector, q.tsq)
+             + GREATEST(
+                 similarity(f_unaccent(lower(s.title)), q.term),
+                 COALESCE(similarity(f_unaccent(lower(s.album)), q.term), 0),
+                 COALESCE(similarity(f_unaccent(lower(a.name)), q.term), 0)
+             ))::float AS rank
+        FROM candidates c
+        JOIN songs s ON s.id = c.id
+        LEFT JOIN artists a ON s.artist_id = a.id
+        CROSS JOIN q
+    """
+    params = {
+        "term": term.strip(),
+        "tsquery": " & ".join(f"{token}:*" for token in tokens),
+    }
+    return query, params
+
+
+def _sqlite_song_query(tokens: List[str]) -> Tuple[str, dict]:
+    query = """
+        SELECT
+            s.id,
+            s.title,
+            s.language,
+            s.year,
+            a.name as composer,
+            s.youtube_video_id as "videoId",
+            s.album as movie,
+            s.start_seconds as "startSeconds",
+            s.end_seconds as "endSeconds",
+            -bm25(songs_fts, 10.0, 5.0, 3.0) AS rank
+        FROM songs_fts
+        JOIN songs s ON s.id = songs_fts.rowid
+        LEFT JOIN artists a ON s.artist_id = a.id
+        WHERE songs_fts MATCH :match
+    """
+    return query, {"match": _fts5_match(tokens)}
+
+
+def _fts5_match(tokens: List[str]) -> str:
+    # Quote every token so FTS5 syntax characters in user input are literal,
+    # and add * for prefix matching on each token.
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _ensure_sqlite_fts(db: Session):
+    """Create and populate the FTS5 tables used for local SQLite development"""
+    global _sqlite_fts_ready
+    if _sqlite_fts_ready:
+        return
+
+    statements = [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS songs_fts USING fts5(
+            title, album, artist, tokenize='unicode61 remove_diacritics 2'
+        )""",
+        """CREATE VIRTUAL TABLE IF NOT EXISTS artists_fts USING fts5(
+            name, tokenize='unicode61 remove_diacritics 2'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS songs_fts_insert AFTER INSERT ON songs BEGIN
+            INSERT INTO songs_fts(rowid, title, album, artist)
+            VALUES (new.id, new.title, new.album, (SELECT name FROM artists WHERE id = new.artist_id));
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS songs_fts_update AFTER UPDATE ON songs BEGIN
+            DELETE FROM songs_fts WHERE rowid = old.id;
+            INSERT INTO songs_fts(rowid, title, album, artist)
+            VALUES (new.id, new.title, new.album, (SELECT name FROM artists WHERE id = new.artist_id));
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS songs_fts_delete AFTER DELETE ON songs BEGIN
+            DELETE FROM songs_fts WHERE rowid = old.id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS artists_fts_insert AFTER INSERT ON artists BEGIN
+            INSERT INTO artists_fts(rowid, name) VALUES (new.id, new.name);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS artists_fts_update AFTER UPDATE ON artists BEGIN
+            DELETE FROM artists_fts WHERE rowid = old.id;
+            INSERT INTO artists_fts(rowid, name) VALUES (new.id, new.name);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS artists_fts_delete AFTER DELETE ON artists BEGIN
+            DELETE FROM artists_fts WHERE rowid = old.id;
+        END""",
+    ]
+    for statement in statements:
+        db.execute(text(statement))
+
+    # Backfill rows that existed before the FTS tables were created
+    db.execute(text("""
+        INSERT INTO songs_fts(rowid, title, album, artist)
+        SELECT s.id, s.title, s.album, a.name
+        FROM songs s LEFT JOIN artists a ON s.artist_id = a.id
+        WHERE s.id NOT IN (SELECT rowid FROM songs_fts)
+    """))
+    db.execute(text("""
+        INSERT INTO artists_fts(rowid, name)
+        SELECT id, name FROM artists
+        WHERE id NOT IN (SELECT rowid FROM artists_fts)
+    """))
+    db.commit()
+    _sqlite_fts_ready = True
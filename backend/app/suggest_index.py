@@ -0,0 +1,318 @@
+"""
+In-memory typeahead index for as-you-type suggestions.
+
+Covers teams (from matches), leagues, songs, artists, entertainment clips and
+approved user-submitted songs. The index is built once at startup and then kept
+current by the write paths calling add()/remove(), so /api/search/suggest never
+touches the database.
+
+Storage is array-backed to stay compact with tens of thousands of entries:
+entries live in parallel arrays indexed by an integer slot, a sorted array of
+word keys serves prefix lookups with bisect, and trigram postings are arrays
+of slots used for typo-tolerant fallback matches.
+"""
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, object_session
+
+from . import models
+
+
+ENTITY_TYPES = ("team", "league", "song", "artist", "entertainment", "submitted_song")
+
+# Minimum share of the query's trigrams an entry must contain to be a fuzzy match
+FUZZY_THRESHOLD = 0.5
+
+
+def normalize(value: str) -> str:
+    """Lowercase and strip Latin accents (e.g. 'Rahmān' -> 'rahman')"""
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    return "".join(
+        ch for ch in decomposed
+        if not (unicodedata.combining(ch) and ord(ch) < 0x0370)
+    ).strip()
+
+
+def _trigrams(value: str) -> set:
+    padded = f"  {value} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SuggestIndex:
+    """Prefix + trigram index over catalogue and football entity names"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.ready = False
+        # add/remove calls made while build() reads the database, replayed on its result
+        self._pending_edits: Optional[List[Tuple]] = None
+        self._reset()
+
+    _STORAGE = ("_types", "_alive", "_ids", "_labels", "_normalized", "_slots",
+                "_keys", "_key_slots", "_postings")
+
+    def _reset(self):
+        # Entry storage, indexed by slot
+        self._types = array("B")
+        self._alive = bytearray()
+        self._ids: List = []
+        self._labels: List[str] = []
+        self._normalized: List[str] = []
+        self._slots: Dict[Tuple[int, object], int] = {}
+        # Sorted word keys and the slot each key belongs to
+        self._keys: List[str] = []
+        self._key_slots = array("I")
+        # Trigram -> slots containing it
+        self._postings: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add(self, entity_type: str, entity_id, label: Optional[str]):
+        """Add or rename an entry. Safe to call for entries already indexed."""
+        if not label or entity_type not in ENTITY_TYPES:
+            return
+        type_code = ENTITY_TYPES.index(entity_type)
+        with self._lock:
+            if self._pending_edits is not None:
+                self._pending_edits.append(("add", entity_type, entity_id, label))
+            self._add(type_code, entity_id, label)
+
+    def _add(self, type_code: int, entity_id, label: str):
+        slot = self._slots.get((type_code, entity_id))
+        if slot is not None:
+            if self._labels[slot] == label:
+                return
+            self._alive[slot] = 0
+        self._insert(type_code, entity_id, label)
+
+    def remove(self, entity_type: str, entity_id):
+        """Remove an entry; its slot is tombstoned and skipped at query time"""
+        if entity_type not in ENTITY_TYPES:
+            return
+        with self._lock:
+            if self._pending_edits is not None:
+                self._pending_edits.append(("remove", entity_type, entity_id, None))
+            self._remove(ENTITY_TYPES.index(entity_type), entity_id)
+
+    def _remove(self, type_code: int, entity_id):
+        slot = self._slots.pop((type_code, entity_id), None)
+        if slot is not None:
+            self._alive[slot] = 0
+
+    def remove_type(self, entity_type: str):
+        """Remove every entry of one type (e.g. after clearing the songs table)"""
+        type_code = ENTITY_TYPES.index(entity_type)
+        with self._lock:
+            if self._pending_edits is not None:
+                self._pending_edits.append(("remove_type", entity_type, None, None))
+            self._remove_type(type_code)
+
+    def _remove_type(self, type_code: int):
+        for key in [key for key in self._slots if key[0] == type_code]:
+            self._alive[self._slots.pop(key)] = 0
+
+    def _insert(self, type_code: int, entity_id, label: str, keep_sorted: bool = True):
+        slot = len(self._labels)
+        self._types.append(type_code)
+        self._alive.append(1)
+        self._ids.append(entity_id)
+        self._labels.append(label)
+        normalized = normalize(label)
+        self._normalized.append(normalized)
+        self._slots[(type_code, entity_id)] = slot
+
+        words = set(normalized.split())
+        words.add(normalized)
+        for word in words:
+            if keep_sorted:
+                position = bisect_left(self._keys, word)
+                self._keys.insert(position, word)
+                self._key_slots.insert(position, slot)
+            else:
+                self._keys.append(word)
+                self._key_slots.append(slot)
+
+        for trigram in _trigrams(normalized):
+            postings = self._postings.get(trigram)
+            if postings is None:
+                postings = self._postings[trigram] = array("I")
+            postings.append(slot)
+
+    def suggest(self, query: str, types: Optional[List[str]] = None, limit: int = 10) -> List[dict]:
+        """
+        Return up to `limit` suggestions for a partial query.
+
+        Prefix matches on the whole name rank above prefix matches on a word of
+        the name; trigram matches fill the remaining places for misspellings.
+        """
+        normalized = normalize(query)
+        if not normalized:
+            return []
+        allowed = None
+        if types:
+            allowed = {ENTITY_TYPES.index(t) for t in types if t in ENTITY_TYPES}
+
+        scores: Dict[int, float] = {}
+        with self._lock:
+            # Prefix on the first word narrows candidates; the rest of the query
+            # must appear in the label too ("man un" -> "Manchester United").
+            terms = normalized.split()
+            first = terms[0] if len(terms) > 1 else normalized
+            position = bisect_left(self._keys, first)
+            while position < len(self._keys) and self._keys[position].startswith(first):
+                slot = self._key_slots[position]
+                position += 1
+                if not self._alive[slot] or (allowed is not None and self._types[slot] not in allowed):
+                    continue
+                label = self._normalized[slot]
+                if label.startswith(normalized):
+                    score = 3.0
+                elif all(any(w.startswith(t) for w in label.split()) for t in terms):
+                    score = 2.0
+                else:
+                    continue
+                scores[slot] = max(scores.get(slot, 0), score)
+
+            if len(scores) < limit and len(normalized) >= 3:
+                query_trigrams = _trigrams(normalized)
+                counts = Counter()
+                for trigram in query_trigrams:
+                    counts.update(self._postings.get(trigram, ()))
+                for slot, shared in counts.items():
+                    similarity = shared / len(query_trigrams)
+                    if similarity < FUZZY_THRESHOLD or slot in scores or not self._alive[slot]:
+                        continue
+                    if allowed is not None and self._types[slot] not in allowed:
+                        continue
+                    scores[slot] = similarity
+
+            ranked = sorted(scores, key=lambda s: (-scores[s], len(self._labels[s]), self._labels[s]))
+            return [
+                {
+                    "type": ENTITY_TYPES[self._types[slot]],
+                    "id": self._ids[slot],
+                    "label": self._labels[slot],
+                    "score": round(scores[slot], 3),
+                }
+                for slot in ranked[:limit]
+            ]
+
+    def build(self, db: Session):
+        """(Re)build the whole index from the database"""
+        loaders = [
+            ("team", """
+                SELECT DISTINCT home_team AS id, home_team AS label FROM matches
+                UNION
+                SELECT DISTINCT away_team AS id, away_team AS label FROM matches
+            """),
+            ("league", "SELECT id, name AS label FROM leagues"),
+            ("song", "SELECT id, title AS label FROM songs"),
+            ("artist", "SELECT id, name AS label FROM artists"),
+            ("entertainment", "SELECT id, title AS label FROM entertainment"),
+            ("submitted_song", "SELECT id, title AS label FROM user_submitted_songs WHERE status = 'approved'"),
+        ]
+        with self._lock:
+            self._pending_edits = []
+        
+        # Load into a separate index so suggest() keeps answering from the
+        # current one; only the swap below takes the lock
+        fresh = SuggestIndex()
+        try:
+            for entity_type, query in loaders:
+                type_code = ENTITY_TYPES.index(entity_type)
+                try:
+                    rows = db.execute(text(query)).fetchall()
+                except Exception as e:
+                    db.rollback()
+                    print(f"[Suggest] Skipping {entity_type}: {e}")
+                    continue
+                for row in rows:
+                    if row.label:
+                        fresh._insert(type_code, row.id, row.label, keep_sorted=False)
+            # Sort the word keys once instead of inserting each in order
+            pairs = sorted(zip(fresh._keys, fresh._key_slots))
+            fresh._keys = [key for key, _ in pairs]
+            fresh._key_slots = array("I", (slot for _, slot in pairs))
+        except Exception:
+            with self._lock:
+                self._pending_edits = None
+            raise
+        
+        with self._lock:
+            for attribute in self._STORAGE:
+                setattr(self, attribute, getattr(fresh, attribute))
+            # Writes committed while the database was being read may be missing from it
+            for operation, entity_type, entity_id, label in self._pending_edits:
+                type_code = ENTITY_TYPES.index(entity_type)
+                if operation == "add":
+                    self._add(type_code, entity_id, label)
+                elif operation == "remove":
+                    self._remove(type_code, entity_id)
+                else:
+                    self._remove_type(type_code)
+            self._pending_edits = None
+            self.ready = True
+        print(f"[Suggest] Index built with {len(self)} entries")
+
+
+suggest_index = SuggestIndex()
+
+
+def get_suggest_index() -> SuggestIndex:
+    """Get the process-wide suggestion index"""
+    return suggest_index
+
+
+def build_suggest_index():
+    """Build the suggestion index with its own session (used at startup)"""
+    from .database import SessionLocal
+    db = SessionLocal()
+    try:
+        suggest_index.build(db)
+    finally:
+        db.close()
+
+
+# Matches and leagues are inserted from many ingestion paths (scheduler, admin,
+# scrape endpoints), so index them from ORM events instead of at each call site.
+# Rows are collected at flush and indexed once their transaction commits, so a
+# rollback leaves no suggestions behind.
+_PENDING_KEY = "suggest_index_pending"
+
+
+def _queue_entry(target, entity_type: str, entity_id, label: Optional[str]):
+    session = object_session(target)
+    if session is None:
+        suggest_index.add(entity_type, entity_id, label)
+    else:
+        session.info.setdefault(_PENDING_KEY, []).append((entity_type, entity_id, label))
+
+
+@event.listens_for(models.Match, "after_insert")
+def _index_match(mapper, connection, target):
+    _queue_entry(target, "team", target.home_team, target.home_team)
+    _queue_entry(target, "team", target.away_team, target.away_team)
+
+
+@event.listens_for(models.League, "after_insert")
+@event.listens_for(models.League, "after_update")
+def _index_league(mapper, connection, target):
+    _queue_entry(target, "league", target.id, target.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_entries(session):
+    for entity_type, entity_id, label in session.info.pop(_PENDING_KEY, None) or []:
+        suggest_index.add(entity_type, entity_id, label)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_entries(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
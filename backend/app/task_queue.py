@@ -0,0 +1,222 @@
+"""
+Durable database-backed task queue.
+
+Long-running jobs (reconciliation, prefetch, highlight searches) are enqueued
+as rows in the task_queue table instead of running inside an API worker. The
+separate worker process (run_worker.py) claims queued rows with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers can poll the same
+table without handing the same task to two of them. Failed tasks are retried
+with exponential backoff up to max_attempts; tasks left "running" by a worker
+that died are reclaimed once they go stale.
+"""
+import asyncio
+import os
+import socket
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import SessionLocal, is_postgres
+
+# task_type -> job function in app.scheduler (imported lazily by the worker)
+TASK_HANDLERS = {
+    "reconcile_today": "reconcile_todays_matches",
+    "fetch_missing_highlights": "fetch_highlights_for_matches_missing_them",
+    "prefetch_matches": "prefetch_upcoming_matches",
+    "fetch_fifa_highlights": "fetch_fifa_highlights",
+    "fetch_match_highlights": "fetch_highlights_for_match",
+    "discover_match_highlights": "discover_highlights_for_match",
+    "update_match_feeds": "update_match_feeds",
+    "notify_highlights": "notify_highlights",
+    "deliver_notifications": "deliver_notifications",
+    "deliver_push_notifications": "deliver_push_notifications",
+    "check_push_receipts": "check_push_receipts",
+}
+
+# A running task not finished after this long is assumed to have lost its worker
+STALE_TASK_SECONDS = 60 * 60
+RETRY_BASE_SECONDS = 60
+POLL_INTERVAL_SECONDS = 5
+
+
+def add_task(
+    db: Session,
+    task_type: str,
+    payload: Optional[Dict[str, Any]] = None,
+    run_after: Optional[datetime] = None,
+    max_attempts: int = 3,
+) -> models.QueuedTask:
+    """
+    Add a task to the queue and flush, without committing, so it lands in the
+    same transaction as the caller's other writes. Returns the new task row.
+    """
+    if task_type not in TASK_HANDLERS:
+        raise ValueError(f"Unknown task type: {task_type}")
+    task = models.QueuedTask(
+        task_type=task_type,
+        payload=payload or {},
+        status="queued",
+        max_attempts=max_attempts,
+        run_after=run_after or datetime.utcnow(),
+    )
+    db.add(task)
+    db.flush()
+    return task
+
+
+def enqueue_task(
+    db: Session,
+    task_type: str,
+    payload: Optional[Dict[str, Any]] = None,
+    run_after: Optional[datetime] = None,
+    max_attempts: int = 3,
+) -> models.QueuedTask:
+    """Add a task to the queue and commit. Returns the new task row."""
+    task = add_task(db, task_type, payload, run_after=run_after, max_attempts=max_attempts)
+    db.commit()
+    db.refresh(task)
+    return task
+
+
+def enqueue_task_once(db: Session, task_type: str, payload: Optional[Dict[str, Any]] = None) -> models.QueuedTask:
+    """Enqueue a task unless one of the same type is already queued or running. Returns either."""
+    pending = db.query(models.QueuedTask).filter(
+        models.QueuedTask.task_type == task_type,
+        models.QueuedTask.status.in_(["queued", "running"])
+    ).order_by(models.QueuedTask.id).first()
+    if pending is not None:
+        return pending
+    return enqueue_task(db, task_type, payload)
+
+
+def task_to_dict(task: models.QueuedTask) -> Dict[str, Any]:
+    """Serialize a task for the status endpoint"""
+    return {
+        "task_id": task.id,
+        "task_type": task.task_type,
+        "status": task.status,
+        "payload": task.payload,
+        "attempts": task.attempts,
+        "max_attempts": task.max_attempts,
+        "result": task.result,
+        "error": task.error,
+        "created_at": task.created_at,
+        "started_at": task.started_at,
+        "finished_at": task.finished_at,
+    }
+
+
+def claim_next_task(db: Session, worker_id: str) -> Optional[models.QueuedTask]:
+    """
+    Claim the oldest runnable task for this worker, or return None.
+    
+    On PostgreSQL the row is locked with SKIP LOCKED so concurrent workers
+    each claim a different task. SQLite serializes writers, so a plain
+    select-then-update is enough for local development.
+    """
+    now = datetime.utcnow()
+    stale = and_(
+        models.QueuedTask.status == "running",
+        models.QueuedTask.started_at < now - timedelta(seconds=STALE_TASK_SECONDS),
+    )
+    # A stale task that already used its last attempt is not run again
+    db.query(models.QueuedTask).filter(
+        stale, models.QueuedTask.attempts >= models.QueuedTask.max_attempts
+    ).update({
+        models.QueuedTask.status: "failed",
+        models.QueuedTask.error: "Worker lost while running the last attempt",
+        models.QueuedTask.finished_at: now,
+        models.QueuedTask.locked_by: None,
+    }, synchronize_session=False)
+
+    query = db.query(models.QueuedTask).filter(
+        or_(
+            and_(models.QueuedTask.status == "queued", models.QueuedTask.run_after <= now),
+            and_(stale, models.QueuedTask.attempts < models.QueuedTask.max_attempts),
+        )
+    ).order_by(models.QueuedTask.run_after, models.QueuedTask.id)
+    if is_postgres(db):
+        query = query.with_for_update(skip_locked=True)
+
+    task = query.first()
+    if task is None:
+        db.commit()
+        return None
+
+    task.status = "running"
+    task.attempts += 1
+    task.locked_by = worker_id
+    task.started_at = now
+    task.error = None
+    db.commit()
+    return task
+
+
+def _record_failure(db: Session, task: models.QueuedTask, error: Exception):
+    """Requeue the task with backoff, or fail it once out of attempts. Commits."""
+    db.rollback()
+    task.error = f"{error}\n{traceback.format_exc()}"
+    if task.attempts < task.max_attempts:
+        delay = RETRY_BASE_SECONDS * (2 ** (task.attempts - 1))
+        task.status = "queued"
+        task.run_after = datetime.utcnow() + timedelta(seconds=delay)
+        print(f"[Worker] Task {task.id} failed, retrying in {delay}s: {error}")
+    else:
+        task.status = "failed"
+        task.finished_at = datetime.utcnow()
+        print(f"[Worker] Task {task.id} failed permanently: {error}")
+    task.locked_by = None
+    db.commit()
+
+
+async def run_task(db: Session, task: models.QueuedTask):
+    """Run a claimed task and record its outcome"""
+    from . import scheduler
+
+    print(f"[Worker] Running task {task.id} ({task.task_type}), attempt {task.attempts}/{task.max_attempts}")
+    try:
+        handler = getattr(scheduler, TASK_HANDLERS[task.task_type])
+        result = await handler(**(task.payload or {}))
+
+        task.status = "succeeded"
+        task.result = result if isinstance(result, dict) else {"value": result}
+        task.finished_at = datetime.utcnow()
+        task.locked_by = None
+        db.commit()
+    except Exception as e:
+        _record_failure(db, task, e)
+        return
+    print(f"[Worker] Task {task.id} succeeded")
+
+
+async def run_worker(poll_interval: float = POLL_INTERVAL_SECONDS, once: bool = False):
+    """
+    Poll the queue and run tasks one at a time until cancelled.
+    
+    Args:
+        poll_interval: Seconds to sleep when the queue is empty
+        once: Drain the currently runnable tasks and return (for cron/one-off use)
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    print(f"[Worker] Task worker {worker_id} started")
+    while True:
+        db = SessionLocal()
+        try:
+            task = claim_next_task(db, worker_id)
+            if task is not None:
+                await run_task(db, task)
+        except Exception as e:
+            print(f"[Worker] Error polling task queue: {e}")
+            db.rollback()
+            task = None
+        finally:
+            db.close()
+
+        if task is None:
+            if once:
+                return
+            await asyncio.sleep(poll_interval)
@@ -0,0 +1,230 @@
+"""
+Canonical teams and alias resolution.
+
+Data sources spell teams differently ("Inter Milan", "Internazionale",
+"Atletico Madrid", "Atlético de Madrid"), so matches and favourites carry a
+team_id next to the free-text name. Names are normalised (case, accents and
+punctuation ignored) and looked up in team_aliases; unknown names create a
+team under their canonical name from config.TEAM_ALIASES, together with all
+of its known aliases.
+
+Like match_events, resolution runs from a before_flush session event, so every
+ingestion path (scheduler jobs, admin and scrape endpoints, favourites) fills
+the ids without changes at each call site. Resolved aliases are cached per
+process once the transaction that saw them commits.
+"""
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, event, false, inspect, or_
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import TEAM_ALIASES
+from .database import is_postgres
+from .models_users import UserFavoriteTeam
+
+_PENDING_KEY = "resolved_team_aliases"
+
+# Normalised alias -> team id, for rows known to be committed
+_team_ids: Dict[str, int] = {}
+
+
+def normalize_team_name(name: str) -> str:
+    """'Atlético de Madrid' -> 'atletico de madrid', 'Paris Saint-Germain' -> 'paris saint germain'"""
+    decomposed = unicodedata.normalize('NFD', (name or '').lower().replace('ß', 'ss'))
+    stripped = ''.join(c for c in decomposed if unicodedata.category(c) != 'Mn')
+    return ' '.join(re.sub(r"[^a-z0-9&]+", " ", stripped).split())[:200]
+
+
+# Normalised name or alias -> canonical name
+_CANONICAL_NAMES: Dict[str, str] = {
+    normalize_team_name(alias): canonical
+    for canonical, aliases in TEAM_ALIASES.items()
+    for alias in aliases | {canonical}
+}
+
+
+def canonical_team_name(name: str) -> str:
+    return _CANONICAL_NAMES.get(normalize_team_name(name), (name or '').strip()[:200])
+
+
+def _insert_ignoring_conflicts(db: Session, table, rows: List[Dict], conflict_column: str):
+    if is_postgres(db):
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    db.execute(insert(table).values(rows).on_conflict_do_nothing(index_elements=[conflict_column]))
+
+
+def _create_teams(db: Session, names_by_alias: Dict[str, str]) -> Dict[str, int]:
+    """Insert teams (and their known aliases) for unresolved normalised names"""
+    canonical_by_alias = {alias: canonical_team_name(name) for alias, name in names_by_alias.items()}
+    canonical_names = set(canonical_by_alias.values())
+
+    # Concurrent ingestion may create the same team; the unique columns decide
+    _insert_ignoring_conflicts(
+        db, models.Team.__table__, [{'name': name} for name in sorted(canonical_names)], 'name'
+    )
+    team_ids = dict(db.query(models.Team.name, models.Team.id).filter(models.Team.name.in_(canonical_names)))
+
+    alias_rows = {}
+    for alias, canonical in canonical_by_alias.items():
+        team_id = team_ids[canonical]
+        alias_rows[alias] = team_id
+        for known in TEAM_ALIASES.get(canonical, set()) | {canonical}:
+            alias_rows.setdefault(normalize_team_name(known), team_id)
+    _insert_ignoring_conflicts(
+        db, models.TeamAlias.__table__,
+        [{'alias': alias, 'team_id': team_id} for alias, team_id in sorted(alias_rows.items())],
+        'alias'
+    )
+    return dict(db.query(models.TeamAlias.alias, models.TeamAlias.team_id).filter(
+        models.TeamAlias.alias.in_(names_by_alias)
+    ))
+
+
+def resolve_team_ids(db: Session, names: Iterable[str], create: bool = True) -> Dict[str, int]:
+    """
+    Team id for each name. With create=False unknown names are left out
+    instead of creating teams (for filters built from user input).
+    """
+    names_by_alias: Dict[str, str] = {}
+    alias_of: Dict[str, str] = {}
+    for name in names:
+        alias = normalize_team_name(name)
+        if alias:
+            alias_of[name] = alias
+            names_by_alias.setdefault(alias, name)
+
+    pending = db.info.setdefault(_PENDING_KEY, {})
+    resolved = {}
+    missing = {}
+    for alias, name in names_by_alias.items():
+        team_id = _team_ids.get(alias) or pending.get(alias)
+        if team_id:
+            resolved[alias] = team_id
+        else:
+            missing[alias] = name
+
+    if missing:
+        with db.no_autoflush:
+            found = dict(db.query(models.TeamAlias.alias, models.TeamAlias.team_id).filter(
+                models.TeamAlias.alias.in_(missing)
+            ))
+            unknown = {alias: name for alias, name in missing.items() if alias not in found}
+            if unknown and create:
+                found.update(_create_teams(db, unknown))
+        pending.update(found)
+        resolved.update(found)
+
+    return {name: resolved[alias] for name, alias in alias_of.items() if alias in resolved}
+
+
+def find_match_by_teams(db: Session, home_team: str, away_team: str, match_date) -> Optional[models.Match]:
+    """
+    Existing fixture for two teams on a date. Compared by team id so spelling
+    variants line up, and by name for rows not backfilled yet.
+    """
+    team_ids = resolve_team_ids(db, [home_team, away_team])
+    home_id, away_id = team_ids.get(home_team), team_ids.get(away_team)
+    same_teams = and_(models.Match.home_team == home_team, models.Match.away_team == away_team)
+    if home_id and away_id:
+        same_teams = or_(
+            and_(models.Match.home_team_id == home_id, models.Match.away_team_id == away_id),
+            same_teams
+        )
+    return db.query(models.Match).filter(models.Match.match_date == match_date, same_teams).first()
+
+
+def team_filter_clause(db: Session, teams_csv: Optional[str]):
+    """
+    Filter clause for a comma-separated `teams=` query parameter, or None when
+    it names no team (e.g. "" or ","). Matches by resolved team id, and by the
+    given and canonical names for rows whose ids are not backfilled yet, so a
+    name with no alias row still finds its matches.
+    """
+    names = [t.strip() for t in (teams_csv or "").split(",") if t.strip()]
+    if not names:
+        return None
+    team_ids = sorted(set(resolve_team_ids(db, names, create=False).values()))
+    return involves_teams(team_ids, set(names) | {canonical_team_name(name) for name in names})
+
+
+def involves_teams(team_ids: Iterable[int], names: Iterable[str] = ()):
+    """Filter clause for matches where either side is one of the teams, by id or by name"""
+    team_ids, names = list(team_ids), sorted(names)
+    clauses = []
+    if team_ids:
+        clauses += [models.Match.home_team_id.in_(team_ids), models.Match.away_team_id.in_(team_ids)]
+    if names:
+        clauses += [models.Match.home_team.in_(names), models.Match.away_team.in_(names)]
+    return or_(*clauses) if clauses else false()
+
+
+def backfill_team_ids(db: Session, batch_size: int = 1000) -> Dict:
+    """Resolve team ids for matches and favourites stored before teams existed"""
+    matches_updated = 0
+    while True:
+        matches = db.query(models.Match).filter(
+            or_(models.Match.home_team_id.is_(None), models.Match.away_team_id.is_(None))
+        ).limit(batch_size).all()
+        if not matches:
+            break
+        team_ids = resolve_team_ids(db, {m.home_team for m in matches} | {m.away_team for m in matches})
+        progress = 0
+        for match in matches:
+            home_id, away_id = team_ids.get(match.home_team), team_ids.get(match.away_team)
+            if (home_id, away_id) != (match.home_team_id, match.away_team_id):
+                match.home_team_id, match.away_team_id = home_id, away_id
+                progress += 1
+        db.commit()
+        matches_updated += progress
+        # Names that normalise to nothing (e.g. "") never resolve
+        if not progress:
+            break
+
+    favorites = db.query(UserFavoriteTeam).filter(UserFavoriteTeam.team_id.is_(None)).all()
+    team_ids = resolve_team_ids(db, {f.team_name for f in favorites})
+    for favorite in favorites:
+        favorite.team_id = team_ids.get(favorite.team_name)
+    db.commit()
+
+    print(f"[Teams] Backfilled team ids on {matches_updated} matches and {len(favorites)} favourites")
+    return {"matches_updated": matches_updated, "favorites_updated": len(favorites)}
+
+
+def _name_changed(obj, attribute: str) -> bool:
+    return inspect(obj).attrs[attribute].history.has_changes()
+
+
+@event.listens_for(Session, "before_flush")
+def _resolve_team_references(session, flush_context, instances):
+    references = []  # (object, name attribute, id attribute)
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, models.Match):
+            for side in ("home_team", "away_team"):
+                if getattr(obj, f"{side}_id") is None or _name_changed(obj, side):
+                    references.append((obj, side, f"{side}_id"))
+        elif isinstance(obj, UserFavoriteTeam):
+            if obj.team_id is None or _name_changed(obj, "team_name"):
+                references.append((obj, "team_name", "team_id"))
+    if not references:
+        return
+
+    team_ids = resolve_team_ids(session, {getattr(obj, name) for obj, name, _ in references})
+    for obj, name, id_attribute in references:
+        setattr(obj, id_attribute, team_ids.get(getattr(obj, name)))
+
+
+@event.listens_for(Session, "after_commit")
+def _cache_resolved_teams(session):
+    resolved = session.info.pop(_PENDING_KEY, None)
+    if resolved:
+        _team_ids.update(resolved)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_resolved_teams(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,323 @@
+"""
+Rate limits and circuit breakers for third-party APIs.
+
+Every upstream we call (ESPN, cricapi, ip-api.com, YouTube RSS feeds and the
+YouTube Data API) gets a token bucket sized to what it tolerates and a circuit
+breaker. After FAILURE_THRESHOLD consecutive failures (transport errors, 5xx or
+429) the breaker opens and calls fail immediately with UpstreamUnavailable
+instead of waiting out a timeout; once a jittered, exponentially growing cool-off
+has passed a single probe request is let through, and its outcome closes or
+re-opens the breaker.
+
+httpx clients opt in with guarded_client(), whose transport looks the upstream up
+by request host; unknown hosts pass through untouched. Synchronous
+googleapiclient requests go through guarded_execute(); called from the event
+loop thread it never waits for a token, so async jobs run it (and anything that
+calls it, like YouTubeService.search_highlights) through asyncio.to_thread.
+State is per process.
+"""
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+
+class UpstreamUnavailable(httpx.TransportError):
+    """Raised instead of calling an upstream whose breaker is open or whose rate limit is exhausted"""
+    pass
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """
+        Take a token, possibly one that has not been refilled yet.
+
+        Returns how long the caller must wait before using it, or None (and takes
+        nothing) if that wait would be longer than max_wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class CircuitBreaker:
+    """closed -> open after repeated failures -> half_open probe -> closed or open again"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, base_backoff: float, max_backoff: float):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.last_error: Optional[str] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go out now. In half_open only one probe is allowed at a time."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() < self.open_until:
+                    return False
+                self.state = self.HALF_OPEN
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.trips = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, error: str):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = error
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.trips += 1
+                backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.trips - 1))
+                # Jittered so replicas and workers don't all probe at the same moment
+                self.open_until = time.monotonic() + random.uniform(backoff / 2, backoff)
+                self.state = self.OPEN
+
+    def release_probe(self):
+        """Give back a half_open probe slot that was granted but not used"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def reset(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self.trips = 0
+            self.open_until = 0.0
+            self._probe_in_flight = False
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.open_until - time.monotonic())
+
+
+class Upstream:
+    """Limiter, breaker and timeout for one third-party API"""
+
+    FAILURE_THRESHOLD = 5
+
+    def __init__(
+        self,
+        name: str,
+        hosts: List[str],
+        rate: float,
+        capacity: int,
+        timeout: float,
+        max_wait: float = 30.0,
+        base_backoff: float = 30.0,
+        max_backoff: float = 600.0,
+    ):
+        self.name = name
+        self.hosts = hosts
+        self.timeout = timeout
+        self.max_wait = max_wait
+        self.bucket = TokenBucket(rate, capacity)
+        self.breaker = CircuitBreaker(self.FAILURE_THRESHOLD, base_backoff, max_backoff)
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+
+    def _admit(self, max_wait: Optional[float] = None) -> float:
+        """Check the breaker and take a token. Returns the wait before the call may go out."""
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise UpstreamUnavailable(
+                f"{self.name} circuit open, retrying in {self.breaker.retry_in():.0f}s"
+            )
+        wait = self.bucket.reserve(self.max_wait if max_wait is None else max_wait)
+        if wait is None:
+            self.breaker.release_probe()
+            self.rejected += 1
+            raise UpstreamUnavailable(f"{self.name} rate limit exhausted")
+        self.calls += 1
+        return wait
+
+    async def acquire(self):
+        wait = self._admit()
+        if wait:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self):
+        # time.sleep on the event loop thread would stall every request and job,
+        # so a blocking caller there gets a token now or UpstreamUnavailable
+        wait = self._admit(max_wait=0.0 if _on_event_loop() else None)
+        if wait:
+            time.sleep(wait)
+
+    def record_success(self):
+        self.breaker.record_success()
+
+    def record_failure(self, error: str):
+        self.failures += 1
+        self.breaker.record_failure(error)
+        if self.breaker.state == CircuitBreaker.OPEN:
+            print(f"[Upstream] {self.name} circuit open for {self.breaker.retry_in():.0f}s after: {error}")
+
+    def state(self) -> Dict:
+        return {
+            "name": self.name,
+            "hosts": self.hosts,
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+            "retry_in_seconds": round(self.breaker.retry_in(), 1),
+            "last_error": self.breaker.last_error,
+            "tokens_available": round(self.bucket.tokens, 2),
+            "rate_per_minute": round(self.bucket.rate * 60, 1),
+            "burst": self.bucket.capacity,
+            "timeout_seconds": self.timeout,
+            "calls": self.calls,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+UPSTREAMS: Dict[str, Upstream] = {
+    upstream.name: upstream
+    for upstream in [
+        Upstream("espn", ["site.api.espn.com"], rate=5, capacity=10, timeout=10.0),
+        Upstream("cricapi", ["api.cricapi.com"], rate=1, capacity=5, timeout=10.0),
+        # Free tier allows 45 requests a minute: burst + one minute of refill = 45.
+        # Lookups happen on user requests, so never wait for a token.
+        Upstream("ip-api", ["ip-api.com"], rate=40 / 60, capacity=5, timeout=2.0, max_wait=0.0),
+        Upstream("youtube-rss", ["www.youtube.com"], rate=5, capacity=10, timeout=10.0),
+        Upstream("websub-hub", ["pubsubhubbub.appspot.com"], rate=2, capacity=10, timeout=10.0),
+        # Expo accepts 600 notifications a second per project, i.e. 6 requests of 100
+        Upstream("expo-push", ["exp.host"], rate=6, capacity=6, timeout=15.0),
+        Upstream("youtube-data-api", ["www.googleapis.com", "youtube.googleapis.com"], rate=5, capacity=10, timeout=15.0),
+    ]
+}
+
+_HOSTS = {host: upstream for upstream in UPSTREAMS.values() for host in upstream.hosts}
+
+
+def get_upstream(name: str) -> Upstream:
+    return UPSTREAMS[name]
+
+
+def upstream_for_host(host: str) -> Optional[Upstream]:
+    return _HOSTS.get(host)
+
+
+def upstream_states() -> List[Dict]:
+    return [upstream.state() for upstream in UPSTREAMS.values()]
+
+
+def _is_failure_status(status_code: int) -> bool:
+    return status_code >= 500 or status_code == 429
+
+
+class GuardedTransport(httpx.AsyncBaseTransport):
+    """httpx transport that applies the upstream's limiter, breaker and timeout by request host"""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        upstream = upstream_for_host(request.url.host)
+        if upstream is None:
+            return await self._transport.handle_async_request(request)
+
+        await upstream.acquire()
+        # Never wait on an upstream longer than its own timeout
+        timeout = request.extensions.get("timeout", {})
+        request.extensions["timeout"] = {
+            key: upstream.timeout if value is None else min(value, upstream.timeout)
+            for key, value in (timeout or httpx.Timeout(upstream.timeout).as_dict()).items()
+        }
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception as e:
+            upstream.record_failure(f"{type(e).__name__}: {e}")
+            raise
+
+        if _is_failure_status(response.status_code):
+            upstream.record_failure(f"HTTP {response.status_code}")
+        else:
+            upstream.record_success()
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def guarded_client(**kwargs) -> httpx.AsyncClient:
+    """httpx.AsyncClient whose requests to known upstreams are rate limited and circuit broken"""
+    return httpx.AsyncClient(transport=GuardedTransport(), **kwargs)
+
+
+def guarded_execute(request, upstream_name: str = "youtube-data-api"):
+    """
+    Execute a googleapiclient request under the upstream's limiter and breaker.
+
+    HTTP errors below 500 (e.g. quotaExceeded) mean the API is up and are
+    re-raised for the caller without counting against the breaker.
+    """
+    upstream = get_upstream(upstream_name)
+    upstream.acquire_sync()
+    try:
+        response = request.execute()
+    except Exception as e:
+        status = getattr(getattr(e, "resp", None), "status", None)
+        if status is not None and not _is_failure_status(int(status)):
+            upstream.record_success()
+        else:
+            upstream.record_failure(f"{type(e).__name__}: {e}")
+        raise
+    upstream.record_success()
+    return response
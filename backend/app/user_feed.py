@@ -0,0 +1,285 @@
+"""
+Personalised "my teams" timelines, fanned out on write.
+
+Each user has one user_feed_items row per match involving a favourite team:
+an upcoming fixture, or a match whose highlights have landed. Rows are written
+when something changes, not when the feed is read:
+
+- new fixtures, and changes to a match's status, date or kick-off time (from
+  session events, like match_events), and highlight inserts (from
+  highlight_store) queue an update_match_feeds task for the followers of
+  either team, which the worker upserts in chunks;
+- changing favourites rebuilds that user's rows inline.
+
+The feed lists highlights first, newest first, then upcoming fixtures, soonest
+first, so a fixture two weeks out never outranks today's highlights. Each
+section is a range scan on (user_id, kind, sort_at, id). A fixture's item is
+removed when it kicks off and comes back as highlights once they land.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, event, func, inspect, or_
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from . import models
+from .database import SessionLocal, is_postgres
+from .live_poll_planner import kickoff_time
+from .models_users import UserFavoriteTeam, UserFeedItem
+from .pagination import decode_cursor, encode_cursor
+from .teams import involves_teams
+
+# Rebuilds include matches this many days either side of today
+FEED_WINDOW_DAYS = 14
+# Items older than this are pruned by the prefetch job
+FEED_RETENTION_DAYS = 30
+FAN_OUT_CHUNK = 1000
+
+HIGHLIGHTS = 'highlights'
+UPCOMING = 'upcoming'
+
+# Match columns that decide an item's kind and position
+_FEED_ATTRIBUTES = ('status', 'match_date', 'match_time')
+
+_CHANGED_MATCHES_KEY = "feed_matches"
+_PENDING_KEY = "feed_match_ids"
+
+
+def _feed_entry(match: models.Match) -> Dict:
+    if match.highlight_count:
+        return {'kind': HIGHLIGHTS, 'sort_at': match.latest_highlight_at or datetime.utcnow()}
+    kickoff = kickoff_time(match.match_date, match.match_time)
+    return {'kind': UPCOMING, 'sort_at': kickoff or datetime.combine(match.match_date, datetime.min.time())}
+
+
+def _feed_worthy(today: date):
+    """
+    Matches worth a feed item: highlights to watch, or still to be played.
+    Live and finished matches without highlights are dropped until they land.
+    """
+    return or_(
+        models.Match.highlight_count > 0,
+        and_(models.Match.status.notin_(('live', 'finished')), models.Match.match_date >= today)
+    )
+
+
+def _upsert_items(db: Session, rows: List[Dict]):
+    if not rows:
+        return
+    if is_postgres(db):
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    statement = insert(UserFeedItem.__table__).values(rows)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=['user_id', 'match_id'],
+        set_={
+            'kind': statement.excluded.kind,
+            'sort_at': statement.excluded.sort_at,
+            'updated_at': func.now(),
+        },
+    ))
+
+
+def update_feeds_for_matches(db: Session, match_ids: Iterable[int]) -> int:
+    """
+    Fan out: write or refresh the feed item of every follower of either team.
+    Followers come from one query on the favourites (team_id, user_id) index
+    and are upserted FAN_OUT_CHUNK at a time; items of matches no longer worth
+    a feed entry (e.g. moved into the past without highlights) are removed.
+    Returns items written.
+    """
+    match_ids = list(match_ids)
+    matches = db.query(models.Match).filter(
+        models.Match.id.in_(match_ids),
+        _feed_worthy(date.today())
+    ).all()
+    dropped = set(match_ids) - {match.id for match in matches}
+    if dropped:
+        db.query(UserFeedItem).filter(UserFeedItem.match_id.in_(dropped)).delete(synchronize_session=False)
+    matches_by_team = defaultdict(list)
+    for match in matches:
+        for team_id in {match.home_team_id, match.away_team_id} - {None}:
+            matches_by_team[team_id].append(match)
+    if not matches_by_team:
+        db.commit()
+        return 0
+    entries = {match.id: _feed_entry(match) for match in matches}
+
+    followers = db.query(UserFavoriteTeam.team_id, UserFavoriteTeam.user_id).filter(
+        UserFavoriteTeam.team_id.in_(list(matches_by_team))
+    ).yield_per(FAN_OUT_CHUNK)
+
+    written = 0
+    chunk = {}
+    for team_id, user_id in followers:
+        for match in matches_by_team[team_id]:
+            # Keyed so a user following both teams gets one row per statement
+            chunk[(user_id, match.id)] = {'user_id': user_id, 'match_id': match.id, **entries[match.id]}
+        if len(chunk) >= FAN_OUT_CHUNK:
+            _upsert_items(db, list(chunk.values()))
+            written += len(chunk)
+            chunk = {}
+    _upsert_items(db, list(chunk.values()))
+    written += len(chunk)
+    db.commit()
+    return written
+
+
+def rebuild_user_feed(db: Session, user_id: int) -> int:
+    """Rewrite one user's feed from their current favourites. Returns items written."""
+    db.query(UserFeedItem).filter(UserFeedItem.user_id == user_id).delete(synchronize_session=False)
+    team_ids = [
+        team_id for (team_id,) in db.query(UserFavoriteTeam.team_id).filter(
+            UserFavoriteTeam.user_id == user_id,
+            UserFavoriteTeam.team_id.isnot(None)
+        )
+    ]
+    rows = []
+    if team_ids:
+        today = date.today()
+        matches = db.query(models.Match).filter(
+            involves_teams(team_ids),
+            models.Match.match_date >= today - timedelta(days=FEED_WINDOW_DAYS),
+            models.Match.match_date <= today + timedelta(days=FEED_WINDOW_DAYS),
+            _feed_worthy(today)
+        ).all()
+        rows = [{'user_id': user_id, 'match_id': match.id, **_feed_entry(match)} for match in matches]
+    for start in range(0, len(rows), FAN_OUT_CHUNK):
+        _upsert_items(db, rows[start:start + FAN_OUT_CHUNK])
+    db.commit()
+    return len(rows)
+
+
+def _section(db: Session, user_id: int, kind: str, after: Optional[Tuple[datetime, int]], limit: int) -> List[UserFeedItem]:
+    """Up to `limit` items of one kind, highlights newest first and fixtures soonest first"""
+    newest_first = kind == HIGHLIGHTS
+    query = db.query(UserFeedItem).options(
+        joinedload(UserFeedItem.match).joinedload(models.Match.league),
+        joinedload(UserFeedItem.match).selectinload(models.Match.highlights)
+    ).filter(UserFeedItem.user_id == user_id, UserFeedItem.kind == kind)
+    if kind == UPCOMING:
+        # Fixtures whose kick-off has passed but whose status hasn't changed yet
+        query = query.filter(UserFeedItem.sort_at >= datetime.utcnow())
+
+    if after is not None:
+        sort_at, item_id = after
+        if newest_first:
+            query = query.filter(or_(
+                UserFeedItem.sort_at < sort_at,
+                and_(UserFeedItem.sort_at == sort_at, UserFeedItem.id < item_id)
+            ))
+        else:
+            query = query.filter(or_(
+                UserFeedItem.sort_at > sort_at,
+                and_(UserFeedItem.sort_at == sort_at, UserFeedItem.id > item_id)
+            ))
+
+    if newest_first:
+        order = (UserFeedItem.sort_at.desc(), UserFeedItem.id.desc())
+    else:
+        order = (UserFeedItem.sort_at, UserFeedItem.id)
+    return query.order_by(*order).limit(limit).all()
+
+
+def get_user_feed(db: Session, user_id: int, cursor: Optional[str] = None, limit: int = 20) -> Tuple[List[UserFeedItem], Optional[str]]:
+    """
+    One page of a user's timeline (highlights, then upcoming fixtures) with
+    matches, leagues and highlights loaded. Returns (items, cursor for the
+    next page or None). Raises ValueError for a malformed cursor.
+    """
+    kind, after = HIGHLIGHTS, None
+    if cursor:
+        kind, sort_at, item_id = decode_cursor(cursor, 3)
+        if kind not in (HIGHLIGHTS, UPCOMING) or not isinstance(sort_at, datetime) or not isinstance(item_id, int):
+            raise ValueError("Invalid cursor")
+        after = (sort_at, item_id)
+
+    # One extra row tells whether another page follows
+    items = _section(db, user_id, kind, after, limit + 1)
+    if kind == HIGHLIGHTS and len(items) <= limit:
+        items += _section(db, user_id, UPCOMING, None, limit + 1 - len(items))
+
+    if len(items) > limit:
+        last = items[limit - 1]
+        return items[:limit], encode_cursor(last.kind, last.sort_at, last.id)
+    return items, None
+
+
+def prune_feed_items(db: Session, before: datetime) -> int:
+    return db.query(UserFeedItem).filter(UserFeedItem.sort_at < before).delete(synchronize_session=False)
+
+
+def followed_match_ids(db: Session, match_ids: Iterable[int]) -> List[int]:
+    """The matches among match_ids that at least one user follows a team of"""
+    match_ids = sorted(set(match_ids))
+    if not match_ids:
+        return []
+    followed = db.query(models.Match.id).join(
+        UserFavoriteTeam,
+        or_(UserFavoriteTeam.team_id == models.Match.home_team_id,
+            UserFavoriteTeam.team_id == models.Match.away_team_id)
+    ).filter(models.Match.id.in_(match_ids)).distinct().all()
+    return sorted(match_id for (match_id,) in followed)
+
+
+def queue_feed_updates(db: Session, match_ids: Iterable[int]):
+    """Queue a fan-out for matches that have at least one follower"""
+    from .task_queue import enqueue_task
+
+    followed = followed_match_ids(db, match_ids)
+    if not followed:
+        return None
+    return enqueue_task(db, "update_match_feeds", {"match_ids": followed})
+
+
+def _feed_position_changed(match: models.Match) -> bool:
+    state = inspect(match)
+    return any(state.attrs[attribute].history.has_changes() for attribute in _FEED_ATTRIBUTES)
+
+
+@event.listens_for(Session, "before_flush")
+def _detect_feed_changes(session, flush_context, instances):
+    today = date.today()
+    changed_matches = [
+        obj for obj in session.new
+        if isinstance(obj, models.Match) and obj.match_date and obj.match_date >= today
+    ]
+    # Followers' items move or disappear when a match is rescheduled or finishes
+    changed_matches += [
+        obj for obj in session.dirty
+        if isinstance(obj, models.Match) and _feed_position_changed(obj)
+    ]
+    if changed_matches:
+        session.info.setdefault(_CHANGED_MATCHES_KEY, []).extend(changed_matches)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_feed_changes(session, flush_context):
+    changed_matches = session.info.pop(_CHANGED_MATCHES_KEY, None)
+    if changed_matches:
+        session.info.setdefault(_PENDING_KEY, set()).update(match.id for match in changed_matches)
+
+
+@event.listens_for(Session, "after_commit")
+def _fan_out_feed_changes(session):
+    match_ids = session.info.pop(_PENDING_KEY, None)
+    if not match_ids:
+        return
+    # The committing session can't run SQL from inside after_commit
+    db = SessionLocal()
+    try:
+        queue_feed_updates(db, match_ids)
+    except Exception as e:
+        print(f"[Feed] Failed to queue feed fan-out: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_feed_changes(session, previous_transaction):
+    session.info.pop(_CHANGED_MATCHES_KEY, None)
+    session.info.pop(_PENDING_KEY, None)
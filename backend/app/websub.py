@@ -0,0 +1,220 @@
+"""
+WebSub (PubSubHubbub) push ingestion for YouTube channel uploads.
+
+Every channel polled over RSS or scanned as an official uploads playlist is
+subscribed at the hub with its own callback URL (?channel_id=...) and HMAC
+secret. The hub verifies each subscription with a GET to the callback, then
+POSTs the channel's Atom feed whenever a video is published or updated; pushed
+entries are catalogued and matched against fixtures awaiting highlights
+straight away. Leases are renewed by a scheduler job a day before they expire.
+RSS polling keeps running at a lower frequency to cover missed pushes.
+"""
+import hashlib
+import hmac
+import secrets
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import get_settings
+from .upstream_guard import guarded_client
+
+TOPIC_URL = "https://www.youtube.com/xml/feeds/videos.xml?channel_id={channel_id}"
+
+# Requested lease; the hub may grant a different one and says so on verification
+LEASE_SECONDS = 5 * 24 * 3600
+RENEW_BEFORE = timedelta(days=1)
+# Resubscribe if the hub never came back to verify a request
+VERIFY_TIMEOUT = timedelta(hours=1)
+
+
+def subscription_channel_ids() -> List[str]:
+    """Channel ids from the RSS channel lists and the official uploads playlists"""
+    from .youtube_rss_service import YouTubeRSSService
+    from .youtube_service import YouTubeService
+
+    channel_ids = {c for channels in YouTubeRSSService.CHANNEL_IDS.values() for c in channels}
+    # Uploads playlists are the channel id with UC replaced by UU
+    channel_ids.update(
+        "UC" + playlist_id[2:]
+        for playlist_id in YouTubeService.OFFICIAL_CHANNELS.values()
+        if playlist_id.startswith("UU")
+    )
+    return sorted(channel_ids)
+
+
+def callback_url(channel_id: str) -> str:
+    base = get_settings().websub_callback_url
+    separator = "&" if "?" in base else "?"
+    return f"{base}{separator}{urlencode({'channel_id': channel_id})}"
+
+
+def _renewal_due(subscription: models.WebSubSubscription, now: datetime) -> bool:
+    if subscription.status == "pending":
+        return subscription.requested_at is None or subscription.requested_at < now - VERIFY_TIMEOUT
+    if subscription.status == "verified":
+        return subscription.lease_expires_at is None or subscription.lease_expires_at < now + RENEW_BEFORE
+    # denied / failed: try again
+    return True
+
+
+async def renew_subscriptions(db: Session, now: Optional[datetime] = None) -> Dict:
+    """
+    Subscribe every channel that has no lease, an expiring lease or an
+    unanswered request. Returns counts of requests sent and failed.
+    """
+    settings = get_settings()
+    if not settings.websub_enabled():
+        return {"enabled": False}
+
+    now = now or datetime.utcnow()
+    existing = {s.channel_id: s for s in db.query(models.WebSubSubscription).all()}
+    requested, failed = 0, 0
+
+    async with guarded_client(timeout=10.0) as client:
+        for channel_id in subscription_channel_ids():
+            subscription = existing.get(channel_id)
+            if subscription is None:
+                subscription = models.WebSubSubscription(
+                    channel_id=channel_id,
+                    topic_url=TOPIC_URL.format(channel_id=channel_id),
+                    secret=secrets.token_hex(20),
+                )
+                db.add(subscription)
+            elif not _renewal_due(subscription, now):
+                continue
+
+            try:
+                response = await client.post(settings.websub_hub_url, data={
+                    "hub.mode": "subscribe",
+                    "hub.topic": subscription.topic_url,
+                    "hub.callback": callback_url(channel_id),
+                    "hub.verify": "async",
+                    "hub.secret": subscription.secret,
+                    "hub.lease_seconds": str(LEASE_SECONDS),
+                })
+                if response.status_code not in (202, 204):
+                    raise ValueError(f"hub returned {response.status_code}: {response.text[:200]}")
+                if subscription.status != "verified":
+                    subscription.status = "pending"
+                subscription.requested_at = now
+                subscription.last_error = None
+                requested += 1
+            except Exception as e:
+                subscription.status = "failed"
+                subscription.last_error = str(e)
+                failed += 1
+                print(f"[WebSub] Subscribe failed for {channel_id}: {e}")
+
+    db.commit()
+    if requested or failed:
+        print(f"[WebSub] Subscription requests: {requested} sent, {failed} failed")
+    return {"enabled": True, "requested": requested, "failed": failed}
+
+
+def verify_intent(
+    db: Session,
+    channel_id: str,
+    mode: str,
+    topic: str,
+    challenge: Optional[str],
+    lease_seconds: Optional[int],
+    reason: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Answer the hub's verification GET. Returns the challenge to echo back, or
+    None if this is not a subscription we asked for (the caller answers 404).
+    """
+    subscription = db.query(models.WebSubSubscription).filter(
+        models.WebSubSubscription.channel_id == channel_id
+    ).first()
+    if subscription is None or topic != subscription.topic_url:
+        return None
+
+    now = datetime.utcnow()
+    if mode == "denied":
+        subscription.status = "denied"
+        subscription.last_error = reason or "denied by hub"
+        db.commit()
+        print(f"[WebSub] Hub denied subscription for {channel_id}: {subscription.last_error}")
+        return None
+
+    # We never unsubscribe, so an unsubscribe request is not ours to confirm
+    if mode != "subscribe" or not challenge:
+        return None
+
+    subscription.status = "verified"
+    subscription.verified_at = now
+    subscription.lease_expires_at = now + timedelta(seconds=lease_seconds or LEASE_SECONDS)
+    subscription.last_error = None
+    db.commit()
+    return challenge
+
+
+def signature_valid(secret: str, body: bytes, header: Optional[str]) -> bool:
+    """Check an X-Hub-Signature header ("sha1=<hex digest>" of the body, keyed by our secret)"""
+    if not header or "=" not in header:
+        return False
+    method, digest = header.split("=", 1)
+    if method not in ("sha1", "sha256", "sha384", "sha512"):
+        return False
+    expected = hmac.new(secret.encode(), body, getattr(hashlib, method)).hexdigest()
+    return hmac.compare_digest(expected, digest)
+
+
+async def handle_notification(db: Session, channel_id: str, body: bytes, signature: Optional[str]) -> int:
+    """
+    Process a pushed Atom feed: catalogue its entries and match them against
+    fixtures awaiting highlights. Returns the number of highlights added.
+    """
+    from .channel_catalogue import catalogue_videos
+    from .scheduler import attach_feed_highlights, matches_awaiting_highlights
+    from .youtube_rss_service import get_rss_service
+
+    subscription = db.query(models.WebSubSubscription).filter(
+        models.WebSubSubscription.channel_id == channel_id
+    ).first()
+    if subscription is None:
+        print(f"[WebSub] Notification for unknown channel {channel_id} ignored")
+        return 0
+    # Per the spec, content with a bad signature is acknowledged but dropped
+    if not signature_valid(subscription.secret, body, signature):
+        print(f"[WebSub] Bad signature on notification for {channel_id} ignored")
+        return 0
+
+    subscription.last_notification_at = datetime.utcnow()
+    db.commit()
+
+    rss_service = await get_rss_service()
+    try:
+        # Deleted-entry notifications carry no atom:entry and parse to nothing
+        videos = rss_service._parse_feed(body, channel_id)
+        if not videos:
+            return 0
+        print(f"[WebSub] {len(videos)} pushed entries from {videos[0].get('channel_title') or channel_id}")
+        catalogue_videos(videos, 'websub')
+
+        highlights_found = attach_feed_highlights(
+            db, rss_service, videos, matches_awaiting_highlights(db), source="WebSub"
+        )
+        # Already processed: the fallback RSS poll can skip these
+        rss_service.mark_videos_seen(videos)
+        return highlights_found
+    finally:
+        await rss_service.close()
+
+
+def subscription_states(db: Session) -> List[Dict]:
+    return [
+        {
+            "channel_id": s.channel_id,
+            "status": s.status,
+            "lease_expires_at": s.lease_expires_at,
+            "last_notification_at": s.last_notification_at,
+            "last_error": s.last_error,
+        }
+        for s in db.query(models.WebSubSubscription).order_by(models.WebSubSubscription.channel_id)
+    ]
@@ -2,12 +2,15 @@
 YouTube RSS Feed Service - Fast, quota-free highlight discovery
 Polls YouTube channel RSS feeds every 10-15 minutes for instant highlight detection
 """
-import httpx
+import asyncio
+import hashlib
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, date
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, List, Optional
 import re
 from .config import get_settings
+from .upstream_guard import guarded_client
+from .channel_catalogue import catalogue_videos
 
 settings = get_settings()
 
@@ -103,8 +106,18 @@ class YouTubeRSSService:
         'yt': 'http://www.youtube.com/xml/schemas/2015'
     }
     
+    # How many processed video ids poll cycles remember
+    MAX_SEEN_VIDEOS = 5000
+    
+    # Process-wide, shared by the short-lived service instances: per channel the
+    # last response validators, body hash and parsed videos, so an unchanged feed
+    # is neither downloaded nor parsed again, and the ids already processed by
+    # poll cycles (insertion-ordered so the oldest are dropped first).
+    _feed_cache: Dict[str, Dict] = {}
+    _seen_video_ids: Dict[str, None] = {}
+    
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=10.0)
+        self.client = guarded_client(timeout=10.0)
     
     async def close(self):
         """Close the HTTP client"""
@@ -152,53 +165,161 @@ class YouTubeRSSService:
         """
         Fetch and parse RSS feed for a single channel.
         Returns list of recent videos (typically last 15 videos).
+        
+        Uses a conditional GET against the last response for the channel; an
+        unchanged feed (304, or the same body) returns the cached videos unparsed.
         """
+        videos, _ = await self._fetch_feed(channel_id)
+        return videos
+    
+    async def _fetch_feed(self, channel_id: str):
+        """Returns (videos, changed) where changed is False for an unchanged or failed fetch"""
         rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
+        cached = self._feed_cache.get(channel_id)
+        
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
         
         try:
-            response = await self.client.get(rss_url)
+            response = await self.client.get(rss_url, headers=headers)
+            if response.status_code == 304 and cached:
+                return cached['videos'], False
             response.raise_for_status()
             
-            # Parse XML
-            root = ET.fromstring(response.content)
+            payload_hash = hashlib.sha256(response.content).hexdigest()
+            if cached and cached['hash'] == payload_hash:
+                return cached['videos'], False
             
-            videos = []
+            videos = self._parse_feed(response.content, channel_id)
+            catalogue_videos(videos, 'rss')
+            self._feed_cache[channel_id] = {
+                'etag': response.headers.get('etag'),
+                'last_modified': response.headers.get('last-modified'),
+                'hash': payload_hash,
+                'videos': videos,
+            }
+            return videos, True
+        
+        except Exception as e:
+            print(f"[RSS] Error fetching feed for channel {channel_id}: {e}")
+            return [], False
+    
+    def _parse_feed(self, content: bytes, channel_id: str) -> List[Dict]:
+        root = ET.fromstring(content)
+        
+        videos = []
+        
+        # Find all entry elements (each is a video)
+        for entry in root.findall('atom:entry', self.NAMESPACES):
+            try:
+                # Extract video data
+                video_id_elem = entry.find('yt:videoId', self.NAMESPACES)
+                title_elem = entry.find('atom:title', self.NAMESPACES)
+                published_elem = entry.find('atom:published', self.NAMESPACES)
+                channel_name_elem = entry.find('atom:author/atom:name', self.NAMESPACES)
+                
+                # Media group for thumbnail and description
+                media_group = entry.find('media:group', self.NAMESPACES)
+                description_elem = media_group.find('media:description', self.NAMESPACES) if media_group else None
+                thumbnail_elem = media_group.find('media:thumbnail', self.NAMESPACES) if media_group else None
+                
+                if video_id_elem is not None and title_elem is not None:
+                    video = {
+                        'youtube_video_id': video_id_elem.text,
+                        'title': title_elem.text,
+                        'description': description_elem.text if description_elem is not None else None,
+                        'channel_id': channel_id,
+                        'channel_title': channel_name_elem.text if channel_name_elem is not None else None,
+                        'published_at': published_elem.text if published_elem is not None else None,
+                        'thumbnail_url': thumbnail_elem.get('url') if thumbnail_elem is not None else None,
+                    }
+                    
+                    videos.append(video)
             
-            # Find all entry elements (each is a video)
-            for entry in root.findall('atom:entry', self.NAMESPACES):
+            except Exception as e:
+                print(f"[RSS] Error parsing video entry: {e}")
+                continue
+        
+        return videos
+    
+    def channels_for_leagues(self, league_names: Iterable[str]) -> List[str]:
+        """Distinct channel ids covering the given leagues, in first-seen order"""
+        channels = {}
+        for league_name in league_names:
+            for channel_id in self.CHANNEL_IDS.get(league_name, []):
+                channels[channel_id] = None
+        return list(channels)
+    
+    async def poll_new_videos(self, channel_ids: Iterable[str]) -> List[Dict]:
+        """
+        Fetch each channel once, concurrently, and return only videos that no
+        earlier poll cycle has processed. Call mark_videos_seen() once they have
+        been matched against fixtures.
+        """
+        channel_ids = list(dict.fromkeys(channel_ids))
+        results = await asyncio.gather(*(self._fetch_feed(channel_id) for channel_id in channel_ids))
+        
+        # Unchanged feeds come back as their cached videos, so entries a failed
+        # cycle never marked as seen are still offered again
+        new_videos = [
+            video
+            for videos, _ in results
+            for video in videos
+            if video['youtube_video_id'] not in self._seen_video_ids
+        ]
+        changed_feeds = sum(1 for _, changed in results if changed)
+        
+        print(f"[RSS] Polled {len(channel_ids)} feeds: {changed_feeds} changed, {len(new_videos)} new videos")
+        return new_videos
+    
+    def mark_videos_seen(self, videos: Iterable[Dict]):
+        seen = self._seen_video_ids
+        for video in videos:
+            seen[video['youtube_video_id']] = None
+        while len(seen) > self.MAX_SEEN_VIDEOS:
+            del seen[next(iter(seen))]
+    
+    def match_highlights(
+        self,
+        videos: Iterable[Dict],
+        home_team: str,
+        away_team: str,
+        league_name: str,
+        hours_lookback: int = 24
+    ) -> List[Dict]:
+        """Highlight videos for a match among already-fetched feed entries from the league's channels"""
+        channels = set(self.CHANNEL_IDS.get(league_name, []))
+        cutoff_time = datetime.now() - timedelta(hours=hours_lookback)
+        
+        matches = []
+        for video in videos:
+            if video.get('channel_id') not in channels:
+                continue
+            
+            # Check published time
+            if video.get('published_at'):
                 try:
-                    # Extract video data
-                    video_id_elem = entry.find('yt:videoId', self.NAMESPACES)
-                    title_elem = entry.find('atom:title', self.NAMESPACES)
-                    published_elem = entry.find('atom:published', self.NAMESPACES)
-                    channel_name_elem = entry.find('atom:author/atom:name', self.NAMESPACES)
+                    pub_time = datetime.fromisoformat(video['published_at'].replace('Z', '+00:00'))
+                    # Convert to naive datetime for comparison
+                    pub_time = pub_time.replace(tzinfo=None)
                     
-                    # Media group for thumbnail and description
-                    media_group = entry.find('media:group', self.NAMESPACES)
-                    description_elem = media_group.find('media:description', self.NAMESPACES) if media_group else None
-                    thumbnail_elem = media_group.find('media:thumbnail', self.NAMESPACES) if media_group else None
-                    
-                    if video_id_elem is not None and title_elem is not None:
-                        video = {
-                            'youtube_video_id': video_id_elem.text,
-                            'title': title_elem.text,
-                            'description': description_elem.text if description_elem is not None else None,
-                            'channel_title': channel_name_elem.text if channel_name_elem is not None else None,
-                            'published_at': published_elem.text if published_elem is not None else None,
-                            'thumbnail_url': thumbnail_elem.get('url') if thumbnail_elem is not None else None,
-                        }
-                        
-                        videos.append(video)
-                
-                except Exception as e:
-                    print(f"[RSS] Error parsing video entry: {e}")
-                    continue
+                    if pub_time < cutoff_time:
+                        continue  # Too old
+                except:
+                    pass
             
-            return videos
+            # Check if title matches teams and is a highlight video
+            if self._matches_team_names(video['title'], home_team, away_team):
+                if self._is_highlight_video(video['title'], video.get('description')):
+                    # RSS channels are all official/verified
+                    matches.append(dict(video, is_official=True))
+                    print(f"[RSS] ✓ Found: {video['title']}")
         
-        except Exception as e:
-            print(f"[RSS] Error fetching feed for channel {channel_id}: {e}")
-            return []
+        return matches
     
     def _matches_team_names(self, title: str, home_team: str, away_team: str) -> bool:
         """Check if video title contains both team names (case insensitive)"""
@@ -286,34 +407,9 @@ class YouTubeRSSService:
         
         print(f"[RSS] Searching {len(channels)} channels for {home_team} vs {away_team}")
         
-        all_matches = []
-        cutoff_time = datetime.now() - timedelta(hours=hours_lookback)
-        
-        for channel_id in channels:
-            videos = await self.fetch_channel_feed(channel_id)
-            
-            for video in videos:
-                # Check published time
-                if video.get('published_at'):
-                    try:
-                        pub_time = datetime.fromisoformat(video['published_at'].replace('Z', '+00:00'))
-                        # Convert to naive datetime for comparison
-                        pub_time = pub_time.replace(tzinfo=None)
-                        
-                        if pub_time < cutoff_time:
-                            continue  # Too old
-                    except:
-                        pass
-                
-                # Check if title matches teams and is a highlight video
-                if self._matches_team_names(video['title'], home_team, away_team):
-                    if self._is_highlight_video(video['title'], video.get('description')):
-                        # Add is_official flag based on channel
-                        video['is_official'] = True  # RSS channels are all official/verified
-                        all_matches.append(video)
-                        print(f"[RSS] ✓ Found: {video['title']}")
-        
-        return all_matches
+        feeds = await asyncio.gather(*(self.fetch_channel_feed(channel_id) for channel_id in channels))
+        videos = [video for feed in feeds for video in feed]
+        return self.match_highlights(videos, home_team, away_team, league_name, hours_lookback)
 
 
 async def get_rss_service() -> YouTubeRSSService:
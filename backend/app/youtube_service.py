@@ -1,12 +1,47 @@
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta, date
+from zoneinfo import ZoneInfo
+import json
 import re
+import threading
 from .config import get_settings
+from .upstream_guard import UpstreamUnavailable, get_upstream, guarded_execute
+from .channel_catalogue import catalogue_videos
 
 settings = get_settings()
 
+# Alternate spellings for teams (especially Turkish teams with special chars)
+# Maps normalized team name -> list of acceptable variations in video titles
+TEAM_ALTERNATE_NAMES = {
+    'f.c. kopenhavn': ['f.c. københavn', 'fc kopenhavn', 'kobenhavn', 'copenhagen'],
+    'barcelona': ['barcelona', 'barca', 'barça'],
+    'fatih karagumruk': ['karagumruk', 'karagümrük', 'f. karagumruk'],
+    'caykur rizespor': ['rizespor', 'caykur', 'çaykur'],
+    'istanbul basaksehir': ['basaksehir', 'başakşehir', 'i. basaksehir'],
+    'besiktas': ['besiktas', 'beşiktaş', 'bjk'],
+    'fenerbahce': ['fenerbahce', 'fenerbahçe', 'fener', 'fb'],
+    'galatasaray': ['galatasaray', 'gala', 'gs'],
+    # Italian teams - handle "Inter Milan" vs "Inter"
+    'inter milan': ['inter', 'inter milan', 'internazionale'],
+    'ac milan': ['milan', 'ac milan'],
+    # English teams
+    'manchester united': ['man united', 'man utd', 'manchester united'],
+    'manchester city': ['man city', 'manchester city'],
+    'tottenham hotspur': ['tottenham', 'spurs'],
+    'newcastle united': ['newcastle'],
+    'west ham united': ['west ham'],
+    'aston villa': ['villa', 'aston villa'],
+    # NBA teams - prevent confusion with other sports
+    'boston celtics': ['celtics', 'boston celtics'],
+    'los angeles lakers': ['lakers', 'los angeles lakers'],
+    'golden state warriors': ['warriors', 'golden state warriors'],
+    'denver nuggets': ['nuggets', 'denver nuggets'],
+    'new york knicks': ['knicks', 'new york knicks'],
+    'miami heat': ['heat', 'miami heat'],
+    'chicago bulls': ['bulls', 'chicago bulls'],
+    'brooklyn nets': ['nets', 'brooklyn nets'],
+}
+
 
 class YouTubeQuotaExhaustedError(Exception):
     """Raised when all YouTube API keys have exceeded their quota"""
@@ -185,22 +220,80 @@ class YouTubeService:
         ],
     }
     
+    # YouTube quotas reset at midnight Pacific time
+    QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+    
+    # Parsed discovery document, shared by every client built in this process
+    _discovery_document = None
+    
     def __init__(self):
         self.api_keys = settings.get_youtube_keys_list()
         self.current_key_index = 0
-        self.youtube = None
-        if self.api_keys:
-            self.youtube = build('youtube', 'v3', developerKey=self.api_keys[0])
+        self._quota_day = self._today_in_quota_timezone()
+        self._rotation_lock = threading.Lock()
+        # googleapiclient/httplib2 clients are not thread-safe, so clients are
+        # cached per thread (scheduler loop, FastAPI worker threads) and per key.
+        self._local = threading.local()
     
-    def _rotate_api_key(self):
-        """Switch to next API key when current one is exhausted"""
-        self.current_key_index += 1
-        if self.current_key_index < len(self.api_keys):
-            new_key = self.api_keys[self.current_key_index]
-            self.youtube = build('youtube', 'v3', developerKey=new_key)
-            print(f"Switched to YouTube API key #{self.current_key_index + 1}")
-            return True
-        return False
+    @property
+    def youtube(self):
+        """API client for the current key, or None if no usable key is left"""
+        self._reset_rotation_on_new_quota_day()
+        index = self.current_key_index
+        if index >= len(self.api_keys):
+            return None
+        return self._get_client(self.api_keys[index])
+    
+    def _get_client(self, api_key: str):
+        clients = getattr(self._local, 'clients', None)
+        if clients is None:
+            clients = self._local.clients = {}
+        
+        client = clients.get(api_key)
+        if client is None:
+            # Imported lazily so modules that never call YouTube don't pay for it
+            import httplib2
+            from googleapiclient.discovery import build_from_document
+            client = build_from_document(
+                self._get_discovery_document(),
+                developerKey=api_key,
+                http=httplib2.Http(timeout=get_upstream("youtube-data-api").timeout),
+            )
+            clients[api_key] = client
+        return client
+    
+    @classmethod
+    def _get_discovery_document(cls) -> dict:
+        if cls._discovery_document is None:
+            from googleapiclient.discovery_cache import get_static_doc
+            cls._discovery_document = json.loads(get_static_doc('youtube', 'v3'))
+        return cls._discovery_document
+    
+    def _today_in_quota_timezone(self) -> date:
+        return datetime.now(self.QUOTA_TIMEZONE).date()
+    
+    def _reset_rotation_on_new_quota_day(self):
+        """Go back to the first key once quotas have reset for the day"""
+        today = self._today_in_quota_timezone()
+        if today != self._quota_day:
+            with self._rotation_lock:
+                if today != self._quota_day:
+                    self._quota_day = today
+                    self.current_key_index = 0
+    
+    def _rotate_api_key(self, exhausted_index: Optional[int] = None):
+        """
+        Switch to next API key when current one is exhausted.
+        
+        Pass the index of the key that hit its quota so concurrent callers that
+        fail on the same key only advance the rotation once.
+        """
+        with self._rotation_lock:
+            if exhausted_index is None or exhausted_index == self.current_key_index:
+                self.current_key_index += 1
+                if self.current_key_index < len(self.api_keys):
+                    print(f"Switched to YouTube API key #{self.current_key_index + 1}")
+            return self.current_key_index < len(self.api_keys)
     
     def search_highlights(self, home_team: str, away_team: str, league: str = None, match_date: date = None, max_results: int = 5) -> List[Dict]:
         """
@@ -299,8 +392,17 @@ class YouTubeService:
         Args:
             match_date: Date of the match. Videos published 2 days before to 7 days after are considered.
         """
+        from googleapiclient.errors import HttpError
+        
+        key_index = self.current_key_index
+        youtube = self.youtube
+        if youtube is None:
+            return None
+        
         try:
             videos = []
+            # Every upload the scan sees, for the local channel_videos catalogue
+            scanned = {}
             
             # Normalize team names for matching
             home_lower = home_team.lower()
@@ -348,7 +450,7 @@ class YouTubeService:
                 if next_page_token:
                     request_params['pageToken'] = next_page_token
                     
-                response = self.youtube.playlistItems().list(**request_params).execute()
+                response = guarded_execute(youtube.playlistItems().list(**request_params))
                 pages_fetched += 1
                 
                 # Process items from this page
@@ -357,6 +459,16 @@ class YouTubeService:
                     title_lower = snippet['title'].lower()
                     published_at = snippet.get('publishedAt', '')
                     
+                    scanned[snippet['resourceId']['videoId']] = {
+                        'video_id': snippet['resourceId']['videoId'],
+                        'title': snippet['title'],
+                        'description': snippet.get('description'),
+                        'thumbnail_url': snippet.get('thumbnails', {}).get('high', {}).get('url'),
+                        'channel_id': snippet.get('channelId'),
+                        'channel_title': snippet.get('channelTitle'),
+                        'published_at': published_at or None,
+                    }
+                    
                     # DATE FILTERING: Skip videos outside the date range
                     if match_date and published_at:
                         try:
@@ -421,18 +533,26 @@ class YouTubeService:
                 video_ids = [v['video_id'] for v in videos]
                 if video_ids:
                     videos = self._enrich_video_details(videos, video_ids)
+                for video in videos:
+                    scanned[video['video_id']].update(
+                        (key, video.get(key)) for key in ('duration', 'blocked_countries', 'allowed_countries')
+                    )
             
+            catalogue_videos(scanned.values(), 'playlist')
             return videos[:max_results]
         except HttpError as e:
             # Check if quota exceeded
             if 'quotaExceeded' in str(e):
-                if self._rotate_api_key():
+                if self._rotate_api_key(key_index):
                     # Retry with new key
                     return self._search_channel_playlist(playlist_id, home_team, away_team, match_date, max_results)
                 # All keys exhausted
                 return None
             print(f"Playlist API error: {e}")
             return []
+        except UpstreamUnavailable as e:
+            print(f"Playlist API unavailable: {e}")
+            return []
     
     def _normalize_text(self, text: str) -> str:
         """Normalize text by removing accents and converting to lowercase.
@@ -485,6 +605,21 @@ class YouTubeService:
         
         return team_normalized
     
+    def _alternate_names(self, team_normalized: str) -> List[str]:
+        """Normalized alternate spellings from TEAM_ALTERNATE_NAMES for a normalized team name"""
+        return [
+            self._normalize_text(alt)
+            for main_name, alternates in TEAM_ALTERNATE_NAMES.items()
+            if main_name in team_normalized
+            for alt in alternates
+        ]
+    
+    def title_terms(self, team_full: str, team_unique: str) -> List[str]:
+        """Every normalized string whose presence in a title can satisfy _team_matches_title"""
+        team_normalized = self._normalize_text(team_full)
+        terms = [team_normalized, *self._alternate_names(team_normalized), team_unique]
+        return list(dict.fromkeys(term for term in terms if term))
+    
     def _team_matches_title(self, team_full: str, team_unique: str, title: str) -> bool:
         """Check if a team is mentioned in the video title.
         
@@ -497,49 +632,14 @@ class YouTubeService:
         title_normalized = self._normalize_text(title)
         team_normalized = self._normalize_text(team_full)
         
-        # Alternate spellings for teams (especially Turkish teams with special chars)
-        # Maps normalized team name -> list of acceptable variations in video titles
-        alternate_names = {
-            'f.c. kopenhavn': ['f.c. københavn', 'fc kopenhavn', 'kobenhavn', 'copenhagen'],
-            'barcelona': ['barcelona', 'barca', 'barça'],
-            'fatih karagumruk': ['karagumruk', 'karagümrük', 'f. karagumruk'],
-            'caykur rizespor': ['rizespor', 'caykur', 'çaykur'],
-            'istanbul basaksehir': ['basaksehir', 'başakşehir', 'i. basaksehir'],
-            'besiktas': ['besiktas', 'beşiktaş', 'bjk'],
-            'fenerbahce': ['fenerbahce', 'fenerbahçe', 'fener', 'fb'],
-            'galatasaray': ['galatasaray', 'gala', 'gs'],
-            # Italian teams - handle "Inter Milan" vs "Inter"
-            'inter milan': ['inter', 'inter milan', 'internazionale'],
-            'ac milan': ['milan', 'ac milan'],
-            # English teams
-            'manchester united': ['man united', 'man utd', 'manchester united'],
-            'manchester city': ['man city', 'manchester city'],
-            'tottenham hotspur': ['tottenham', 'spurs'],
-            'newcastle united': ['newcastle'],
-            'west ham united': ['west ham'],
-            'aston villa': ['villa', 'aston villa'],
-            # NBA teams - prevent confusion with other sports
-            'boston celtics': ['celtics', 'boston celtics'],
-            'los angeles lakers': ['lakers', 'los angeles lakers'],
-            'golden state warriors': ['warriors', 'golden state warriors'],
-            'denver nuggets': ['nuggets', 'denver nuggets'],
-            'new york knicks': ['knicks', 'new york knicks'],
-            'miami heat': ['heat', 'miami heat'],
-            'chicago bulls': ['bulls', 'chicago bulls'],
-            'brooklyn nets': ['nets', 'brooklyn nets'],
-        }
-        
         # Best case: full team name appears (normalized)
         if team_normalized in title_normalized:
             return True
         
         # Check for alternate names
-        for main_name, alternates in alternate_names.items():
-            if main_name in team_normalized:
-                for alt in alternates:
-                    alt_normalized = self._normalize_text(alt)
-                    if alt_normalized in title_normalized:
-                        return True
+        for alt_normalized in self._alternate_names(team_normalized):
+            if alt_normalized in title_normalized:
+                return True
         
         # Check for unique identifier (stricter matching)
         # team_unique is already normalized from _get_unique_team_identifier
@@ -557,7 +657,7 @@ class YouTubeService:
     def _search_youtube(self, query: str, max_results: int = 5) -> List[Dict]:
         published_after = (datetime.utcnow() - timedelta(days=7)).isoformat() + 'Z'
         
-        search_response = self.youtube.search().list(
+        search_response = guarded_execute(self.youtube.search().list(
             q=query,
             part='id,snippet',
             type='video',
@@ -566,7 +666,7 @@ class YouTubeService:
             publishedAfter=published_after,
             videoDuration='medium',
             relevanceLanguage='en'
-        ).execute()
+        ))
         
         videos = []
         video_ids = []
@@ -598,11 +698,13 @@ class YouTubeService:
         return videos
     
     def _enrich_video_details(self, videos: List[Dict], video_ids: List[str]) -> List[Dict]:
+        from googleapiclient.errors import HttpError
+        
         try:
-            details_response = self.youtube.videos().list(
+            details_response = guarded_execute(self.youtube.videos().list(
                 part='statistics,contentDetails,status',
                 id=','.join(video_ids)
-            ).execute()
+            ))
             
             details_map = {}
             for item in details_response.get('items', []):
@@ -631,7 +733,7 @@ class YouTubeService:
                 if video['video_id'] in details_map:
                     video.update(details_map[video['video_id']])
             
-        except HttpError:
+        except (HttpError, UpstreamUnavailable):
             pass
         
         return videos
@@ -755,6 +857,9 @@ class YouTubeService:
         Only used if channel playlists don't find anything.
         For FIFA, search specifically for "Extended Highlights".
         """
+        from googleapiclient.errors import HttpError
+        
+        key_index = self.current_key_index
         try:
             # Build search query - for FIFA World Cup, prioritize "Extended Highlights"
             query = f"{home_team} vs {away_team} Extended Highlights"
@@ -770,7 +875,7 @@ class YouTubeService:
                 relevanceLanguage='en'
             )
             
-            response = request.execute()
+            response = guarded_execute(request)
             videos = []
             
             for item in response.get('items', []):
@@ -806,11 +911,14 @@ class YouTubeService:
             
         except HttpError as e:
             if 'quotaExceeded' in str(e):
-                if self._rotate_api_key():
+                if self._rotate_api_key(key_index):
                     return self._search_youtube_direct(home_team, away_team, match_date, max_results)
                 return None
             print(f"YouTube search error: {e}")
             return []
+        except UpstreamUnavailable as e:
+            print(f"YouTube search unavailable: {e}")
+            return []
     
     def _get_mock_highlights(self, home_team: str, away_team: str) -> List[Dict]:
         return [
@@ -837,5 +945,15 @@ class YouTubeService:
         ]
 
 
+_youtube_service: Optional[YouTubeService] = None
+_youtube_service_lock = threading.Lock()
+
+
 def get_youtube_service() -> YouTubeService:
-    return YouTubeService()
+    """Get the process-wide YouTube service"""
+    global _youtube_service
+    if _youtube_service is None:
+        with _youtube_service_lock:
+            if _youtube_service is None:
+                _youtube_service = YouTubeService()
+    return _youtube_service
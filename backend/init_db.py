@@ -5,6 +5,7 @@ This script creates all required tables using SQLAlchemy models
 """
 import sys
 import os
+import re
 
 # Add the backend directory to the path so we can import app
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -23,41 +24,114 @@ try:
 except ImportError:
     print("Warning: Some models could not be imported")
 
+def split_sql_statements(sql_script):
+    """
+    Split a migration file into statements on semicolons, keeping
+    dollar-quoted function bodies ($$ ... $$) intact.
+    """
+    statements = []
+    current = []
+    in_dollar_quote = False
+    
+    for part in re.split(r'(\$\$|;)', sql_script):
+        if part == '$$':
+            in_dollar_quote = not in_dollar_quote
+            current.append(part)
+        elif part == ';' and not in_dollar_quote:
+            statements.append(''.join(current))
+            current = []
+        else:
+            current.append(part)
+    statements.append(''.join(current))
+    
+    # Drop empty and comment-only chunks
+    return [
+        s.strip() for s in statements
+        if any(line.strip() and not line.strip().startswith('--') for line in s.splitlines())
+    ]
+
+# Migrations to run in order. Each runs once per database: applied files are
+# recorded in schema_migrations, so one-off backfills and dedupes in them are
+# not repeated on every start.
+MIGRATIONS = [
+    'add_admin_and_submitted_songs.sql',
+    'add_catalogue_pagination_indexes.sql',
+    'add_music_search_indexes.sql',
+    'add_catalogue_counters.sql',
+    'add_task_queue.sql',
+    'add_league_fetch_ledger.sql',
+    'add_ledger_http_validators.sql',
+    'add_channel_videos.sql',
+    'add_websub_subscriptions.sql',
+    'add_highlight_match_video_unique.sql',
+    'add_match_highlight_counters.sql',
+    'add_teams.sql',
+    'add_user_feed_items.sql',
+    'add_notification_dedupe.sql',
+    'add_push_devices.sql',
+    'add_notification_email_error.sql',
+    'add_notification_push_error.sql'
+]
+
+MIGRATIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        filename VARCHAR(255) PRIMARY KEY,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
 def run_migrations():
-    """Run SQL migrations from migrations folder"""
+    """
+    Run SQL migrations from migrations folder that have not been applied yet.
+    Stops at the first one that fails and re-raises, so a deploy never starts
+    on a half-migrated schema.
+    """
     from pathlib import Path
-    from sqlalchemy import text
     
-    migrations_dir = Path(__file__).parent / 'migrations'
+    if engine.dialect.name != 'postgresql':
+        # The files are PostgreSQL-only; create_all already built the current schema
+        print("   ⏭️  Skipping migrations (PostgreSQL only)")
+        return
     
-    # Migrations to run in order
-    migrations = [
-        'add_admin_and_submitted_songs.sql'
-    ]
+    migrations_dir = Path(__file__).parent / 'migrations'
     
-    for migration_file in migrations:
-        migration_path = migrations_dir / migration_file
-        if migration_path.exists():
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(MIGRATIONS_TABLE_SQL)
+        cursor.execute("SELECT filename FROM schema_migrations")
+        applied = {row[0] for row in cursor.fetchall()}
+        connection.commit()
+        
+        for migration_file in MIGRATIONS:
+            if migration_file in applied:
+                continue
+            migration_path = migrations_dir / migration_file
+            if not migration_path.exists():
+                raise FileNotFoundError(f"Migration file not found: {migration_file}")
             try:
                 with open(migration_path, 'r') as f:
                     sql_script = f.read()
                 
-                connection = engine.raw_connection()
-                cursor = connection.cursor()
-                
-                # Split by semicolon and execute each statement
-                statements = [s.strip() for s in sql_script.split(';') if s.strip()]
-                for statement in statements:
+                # Split into statements and execute each one, then record the
+                # file in the same transaction
+                for statement in split_sql_statements(sql_script):
                     cursor.execute(statement)
-                
+                cursor.execute(
+                    "INSERT INTO schema_migrations (filename) VALUES (%s)", (migration_file,)
+                )
                 connection.commit()
-                cursor.close()
-                connection.close()
                 print(f"   ✅ {migration_file}")
             except Exception as e:
-                print(f"   ⚠️  {migration_file}: {e}")
-        else:
-            print(f"   ⚠️  Migration file not found: {migration_file}")
+                connection.rollback()
+                print(f"   ❌ {migration_file}: {e}")
+                raise
+        
+        if applied >= set(MIGRATIONS):
+            print("   ✨ All migrations already applied")
+        cursor.close()
+    finally:
+        connection.close()
 
 def init_database():
     """Initialize database with all tables"""
@@ -70,21 +144,19 @@ def init_database():
         inspector = inspect(engine)
         existing_tables = inspector.get_table_names()
         
-        if existing_tables:
-            print(f"\n✅ Database already has {len(existing_tables)} tables:")
-            for table in existing_tables:
+        # create_all only creates missing tables, so this also picks up tables for
+        # models added since the database was first initialized. The app itself
+        # no longer creates tables at import time.
+        print(f"\n📝 Ensuring tables exist ({len(existing_tables)} already present)...")
+        Base.metadata.create_all(bind=engine)
+        
+        created_tables = [t.name for t in Base.metadata.sorted_tables if t.name not in existing_tables]
+        if created_tables:
+            print("\n📋 Created tables:")
+            for table in created_tables:
                 print(f"   - {table}")
-            print("\n✨ Skipping table creation - database is already initialized!")
         else:
-            # Create all tables
-            print("\n📝 Creating tables...")
-            Base.metadata.create_all(bind=engine)
-            print("✅ All tables created successfully!")
-            
-            # Print created tables
-            print("\n📋 Created tables:")
-            for table in Base.metadata.sorted_tables:
-                print(f"   - {table.name}")
+            print("✨ All tables already exist")
         
         # Check and insert default leagues if needed
         from sqlalchemy.orm import Session
@@ -0,0 +1,122 @@
+-- PostgreSQL Migration: Incrementally maintained catalogue counters
+-- Replaces per-request COUNT(DISTINCT)/GROUP BY aggregates behind /music/stats,
+-- /music/languages, /api/entertainment/types and playlist song counts.
+-- Counters are kept in step by row triggers, so rows written by import scripts
+-- are counted too. The backfill at the end makes re-running this file a full resync.
+
+CREATE TABLE IF NOT EXISTS catalogue_counters (
+    scope VARCHAR(50) NOT NULL,  -- totals, song_language, song_artist, entertainment_type
+    key VARCHAR(200) NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, key)
+);
+
+ALTER TABLE user_playlists ADD COLUMN IF NOT EXISTS song_count INTEGER NOT NULL DEFAULT 0;
+
+-- Add p_delta to one counter. When p_distinct_key is given, the 'totals' counter of that
+-- name tracks how many keys in the scope are non-zero (e.g. number of distinct languages).
+CREATE OR REPLACE FUNCTION bump_catalogue_counter(
+    p_scope TEXT, p_key TEXT, p_delta INTEGER, p_distinct_key TEXT DEFAULT NULL
+) RETURNS VOID AS $$
+DECLARE
+    new_count INTEGER;
+BEGIN
+    IF p_key IS NULL OR p_delta = 0 THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO catalogue_counters (scope, key, count)
+    VALUES (p_scope, p_key, p_delta)
+    ON CONFLICT (scope, key) DO UPDATE SET count = catalogue_counters.count + EXCLUDED.count
+    RETURNING count INTO new_count;
+
+    IF p_distinct_key IS NOT NULL THEN
+        IF new_count - p_delta <= 0 AND new_count > 0 THEN
+            PERFORM bump_catalogue_counter('totals', p_distinct_key, 1);
+        ELSIF new_count - p_delta > 0 AND new_count <= 0 THEN
+            PERFORM bump_catalogue_counter('totals', p_distinct_key, -1);
+        END IF;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION songs_counters_trigger() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_catalogue_counter('totals', 'songs', -1);
+        PERFORM bump_catalogue_counter('song_language', OLD.language, -1, 'languages');
+        PERFORM bump_catalogue_counter('song_artist', OLD.artist_id::text, -1, 'artists');
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_catalogue_counter('totals', 'songs', 1);
+        PERFORM bump_catalogue_counter('song_language', NEW.language, 1, 'languages');
+        PERFORM bump_catalogue_counter('song_artist', NEW.artist_id::text, 1, 'artists');
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS songs_counters ON songs;
+CREATE TRIGGER songs_counters
+    AFTER INSERT OR DELETE OR UPDATE OF language, artist_id ON songs
+    FOR EACH ROW EXECUTE FUNCTION songs_counters_trigger();
+
+CREATE OR REPLACE FUNCTION entertainment_counters_trigger() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_catalogue_counter('totals', 'entertainment', -1);
+        PERFORM bump_catalogue_counter('entertainment_type', OLD.content_type, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_catalogue_counter('totals', 'entertainment', 1);
+        PERFORM bump_catalogue_counter('entertainment_type', NEW.content_type, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS entertainment_counters ON entertainment;
+CREATE TRIGGER entertainment_counters
+    AFTER INSERT OR DELETE OR UPDATE OF content_type ON entertainment
+    FOR EACH ROW EXECUTE FUNCTION entertainment_counters_trigger();
+
+CREATE OR REPLACE FUNCTION playlist_song_count_trigger() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE user_playlists SET song_count = song_count + 1 WHERE id = NEW.playlist_id;
+    ELSE
+        UPDATE user_playlists SET song_count = song_count - 1 WHERE id = OLD.playlist_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS playlist_song_count ON user_playlist_songs;
+CREATE TRIGGER playlist_song_count
+    AFTER INSERT OR DELETE ON user_playlist_songs
+    FOR EACH ROW EXECUTE FUNCTION playlist_song_count_trigger();
+
+-- Backfill / resync from the source tables
+DELETE FROM catalogue_counters;
+
+INSERT INTO catalogue_counters (scope, key, count)
+SELECT 'totals', 'songs', COUNT(*) FROM songs
+UNION ALL
+SELECT 'totals', 'artists', COUNT(DISTINCT artist_id) FROM songs
+UNION ALL
+SELECT 'totals', 'languages', COUNT(DISTINCT language) FROM songs
+UNION ALL
+SELECT 'totals', 'entertainment', COUNT(*) FROM entertainment;
+
+INSERT INTO catalogue_counters (scope, key, count)
+SELECT 'song_language', language, COUNT(*) FROM songs WHERE language IS NOT NULL GROUP BY language;
+
+INSERT INTO catalogue_counters (scope, key, count)
+SELECT 'song_artist', artist_id::text, COUNT(*) FROM songs WHERE artist_id IS NOT NULL GROUP BY artist_id;
+
+INSERT INTO catalogue_counters (scope, key, count)
+SELECT 'entertainment_type', content_type, COUNT(*) FROM entertainment WHERE content_type IS NOT NULL GROUP BY content_type;
+
+UPDATE user_playlists p SET song_count = (
+    SELECT COUNT(*) FROM user_playlist_songs ps WHERE ps.playlist_id = p.id
+)
@@ -0,0 +1,9 @@
+-- Migration: Indexes for keyset pagination of the music and entertainment catalogues
+-- /music/songs/page pages on songs.id (primary key); entertainment pages on
+-- (COALESCE(created_at, epoch), id) so rows without created_at sort last
+
+DROP INDEX IF EXISTS idx_entertainment_created_at_id;
+DROP INDEX IF EXISTS idx_entertainment_type_created_at_id;
+
+CREATE INDEX IF NOT EXISTS idx_entertainment_page_key ON entertainment((COALESCE(created_at, TIMESTAMP '1970-01-01')) DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_entertainment_type_page_key ON entertainment(content_type, (COALESCE(created_at, TIMESTAMP '1970-01-01')) DESC, id DESC)
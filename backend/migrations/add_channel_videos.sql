@@ -0,0 +1,27 @@
+-- Migration: Local catalogue of highlight channel uploads
+-- Filled by the RSS poller and uploads-playlist scans, read by app/channel_catalogue.py
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS channel_videos (
+    id SERIAL PRIMARY KEY,
+    youtube_video_id VARCHAR(50) NOT NULL UNIQUE,
+    channel_id VARCHAR(50),
+    channel_title VARCHAR(200),
+    title VARCHAR(500) NOT NULL,
+    normalized_title VARCHAR(500) NOT NULL,
+    description TEXT,
+    thumbnail_url VARCHAR(500),
+    published_at TIMESTAMP,
+    duration VARCHAR(20),
+    blocked_countries JSON,
+    allowed_countries JSON,
+    source VARCHAR(20) NOT NULL,
+    first_seen_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_channel_videos_published_at ON channel_videos(published_at);
+
+-- Serves the LIKE '%team%' lookups in find_catalogued_highlights()
+CREATE INDEX IF NOT EXISTS ix_channel_videos_normalized_title_trgm ON channel_videos USING GIN(normalized_title gin_trgm_ops)
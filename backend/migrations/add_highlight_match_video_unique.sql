@@ -0,0 +1,11 @@
+-- Migration: One highlight row per (match, video)
+-- Conflict target for the bulk INSERT ... ON CONFLICT DO NOTHING in app/highlight_store.py
+
+-- Drop duplicates left by concurrent discovery jobs, keeping the oldest row
+DELETE FROM highlights h
+USING highlights older
+WHERE h.match_id = older.match_id
+  AND h.youtube_video_id = older.youtube_video_id
+  AND h.id > older.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_highlights_match_video ON highlights(match_id, youtube_video_id)
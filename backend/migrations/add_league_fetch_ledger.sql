@@ -0,0 +1,14 @@
+-- Migration: Per-(league, date) fetch ledger replacing fetched_dates
+-- One row per ESPN league scoreboard per date, read by app/fetch_ledger.py
+
+CREATE TABLE IF NOT EXISTS league_fetch_ledger (
+    id SERIAL PRIMARY KEY,
+    league_slug VARCHAR(100) NOT NULL,
+    fetch_date DATE NOT NULL,
+    fetched_at TIMESTAMP NOT NULL,
+    payload_hash VARCHAR(64),
+    event_count INTEGER NOT NULL DEFAULT 0,
+    all_final BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_league_fetch_ledger_league_date ON league_fetch_ledger(league_slug, fetch_date)
@@ -0,0 +1,5 @@
+-- Migration: HTTP validators on the fetch ledger for conditional ESPN requests
+-- payload_hash now holds the sha256 of the raw scoreboard response body
+
+ALTER TABLE league_fetch_ledger ADD COLUMN IF NOT EXISTS etag VARCHAR(200);
+ALTER TABLE league_fetch_ledger ADD COLUMN IF NOT EXISTS last_modified VARCHAR(100)
@@ -0,0 +1,21 @@
+-- Migration: Denormalised highlight counters on matches
+-- Kept in step by app/highlight_store.py so feeds and the scheduler don't query highlights per match
+
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS highlight_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS latest_highlight_at TIMESTAMP;
+
+UPDATE matches m
+SET highlight_count = h.highlight_count,
+    latest_highlight_at = h.latest_highlight_at
+FROM (
+    SELECT match_id, COUNT(*) AS highlight_count, MAX(created_at) AS latest_highlight_at
+    FROM highlights
+    GROUP BY match_id
+) h
+WHERE h.match_id = m.id;
+
+CREATE INDEX IF NOT EXISTS ix_matches_with_highlights
+    ON matches(match_date, league_id) WHERE highlight_count > 0;
+
+CREATE INDEX IF NOT EXISTS ix_matches_awaiting_highlights
+    ON matches(match_date) WHERE highlight_count = 0 AND status = 'finished'
@@ -0,0 +1,25 @@
+-- PostgreSQL Migration: Indexed full-text and trigram search for songs and artists
+-- Replaces ILIKE '%term%' scans in /music/songs?search= and /music/artists?search=
+-- Matching is accent-insensitive through an IMMUTABLE unaccent wrapper (unaccent() itself
+-- is only STABLE and cannot be used in index expressions or generated columns)
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text AS
+$$ SELECT public.unaccent('public.unaccent', $1) $$
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+
+-- Weighted document: title ranks above album/movie name
+ALTER TABLE songs ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(f_unaccent(lower(title)), '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(f_unaccent(lower(album)), '')), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_songs_search_vector ON songs USING GIN(search_vector);
+
+-- Trigram indexes serve substring (LIKE '%term%') and fuzzy (%) matches
+CREATE INDEX IF NOT EXISTS idx_songs_title_trgm ON songs USING GIN(f_unaccent(lower(title)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_songs_album_trgm ON songs USING GIN(f_unaccent(lower(album)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_artists_name_trgm ON artists USING GIN(f_unaccent(lower(name)) gin_trgm_ops)
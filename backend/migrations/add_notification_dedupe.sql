@@ -0,0 +1,12 @@
+-- Migration: One notification of each type per user and match
+-- Conflict target for the bulk INSERT ... ON CONFLICT DO NOTHING in app/notifications.py
+
+-- Drop duplicates, keeping the oldest row
+DELETE FROM notifications n
+USING notifications older
+WHERE n.user_id = older.user_id
+  AND n.match_id = older.match_id
+  AND n.type = older.type
+  AND n.id > older.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ux_notifications_user_match_type ON notifications(user_id, match_id, type)
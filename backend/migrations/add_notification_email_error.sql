@@ -0,0 +1,4 @@
+-- Migration: Record permanent email rejections on notifications
+-- Set by the deliver_notifications task for 5xx SMTP replies, so the address is not retried
+
+ALTER TABLE notifications ADD COLUMN IF NOT EXISTS email_error VARCHAR(300)
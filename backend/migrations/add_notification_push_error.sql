@@ -0,0 +1,4 @@
+-- Migration: Record push messages Expo rejected for good on notifications
+-- Set by the deliver_push_notifications task for ticket errors a retry won't fix (e.g. MessageTooBig)
+
+ALTER TABLE notifications ADD COLUMN IF NOT EXISTS push_error VARCHAR(300)
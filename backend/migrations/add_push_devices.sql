@@ -0,0 +1,13 @@
+-- Migration: Expo push tokens for the mobile app
+-- One row per install, registered via POST /api/me/devices and pruned by app/push_delivery.py
+
+CREATE TABLE IF NOT EXISTS push_devices (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    token VARCHAR(255) NOT NULL UNIQUE,
+    platform VARCHAR(20),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_seen_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_push_devices_user_id ON push_devices(user_id)
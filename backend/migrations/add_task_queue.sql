@@ -0,0 +1,20 @@
+-- Migration: Durable task queue for on-demand ingestion and highlight jobs
+-- Workers (run_worker.py) claim rows with SELECT ... FOR UPDATE SKIP LOCKED
+
+CREATE TABLE IF NOT EXISTS task_queue (
+    id SERIAL PRIMARY KEY,
+    task_type VARCHAR(100) NOT NULL,
+    payload JSON,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',  -- queued, running, succeeded, failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMP NOT NULL DEFAULT NOW(),
+    locked_by VARCHAR(100),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    result JSON,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_task_queue_status_run_after ON task_queue(status, run_after)
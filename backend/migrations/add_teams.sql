@@ -0,0 +1,26 @@
+-- Migration: Canonical teams and name aliases
+-- Filled by app/teams.py during ingestion; run POST /api/admin/backfill-teams once
+-- afterwards to resolve team ids for existing matches and favourites
+
+CREATE TABLE IF NOT EXISTS teams (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(200) NOT NULL UNIQUE,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS team_aliases (
+    id SERIAL PRIMARY KEY,
+    team_id INTEGER NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+    alias VARCHAR(200) NOT NULL UNIQUE,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_team_aliases_team_id ON team_aliases(team_id);
+
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS home_team_id INTEGER REFERENCES teams(id);
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS away_team_id INTEGER REFERENCES teams(id);
+ALTER TABLE user_favorite_teams ADD COLUMN IF NOT EXISTS team_id INTEGER REFERENCES teams(id);
+
+CREATE INDEX IF NOT EXISTS ix_matches_home_team_date ON matches(home_team_id, match_date);
+CREATE INDEX IF NOT EXISTS ix_matches_away_team_date ON matches(away_team_id, match_date);
+CREATE INDEX IF NOT EXISTS ix_user_favorite_teams_team_user ON user_favorite_teams(team_id, user_id)
@@ -0,0 +1,15 @@
+-- Migration: Precomputed "my teams" timelines
+-- One row per user and followed match, fanned out by app/user_feed.py
+
+CREATE TABLE IF NOT EXISTS user_feed_items (
+    id SERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    match_id INTEGER NOT NULL REFERENCES matches(id) ON DELETE CASCADE,
+    kind VARCHAR(20) NOT NULL,
+    sort_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT unique_user_feed_match UNIQUE (user_id, match_id)
+);
+
+-- The feed reads one kind at a time: highlights newest first, then fixtures soonest first
+CREATE INDEX IF NOT EXISTS ix_user_feed_items_user_kind_sort ON user_feed_items(user_id, kind, sort_at, id)
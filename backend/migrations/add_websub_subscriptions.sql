@@ -0,0 +1,16 @@
+-- Migration: WebSub (PubSubHubbub) subscriptions for YouTube channel uploads
+-- One row per channel, managed by app/websub.py
+
+CREATE TABLE IF NOT EXISTS websub_subscriptions (
+    id SERIAL PRIMARY KEY,
+    channel_id VARCHAR(50) NOT NULL UNIQUE,
+    topic_url VARCHAR(300) NOT NULL,
+    secret VARCHAR(64) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    requested_at TIMESTAMP,
+    verified_at TIMESTAMP,
+    lease_expires_at TIMESTAMP,
+    last_notification_at TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT NOW()
+)
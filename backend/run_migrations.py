@@ -6,6 +6,7 @@ import sys
 import psycopg2
 from pathlib import Path
 from sqlalchemy import create_engine, text
+from init_db import MIGRATIONS, MIGRATIONS_TABLE_SQL, split_sql_statements
 
 # Get database URL from environment
 DATABASE_URL = os.getenv('DATABASE_URL')
@@ -13,33 +14,43 @@ if not DATABASE_URL:
     print("ERROR: DATABASE_URL environment variable not set")
     sys.exit(1)
 
+def applied_migrations(db_url):
+    """Migration files already recorded in schema_migrations"""
+    engine = create_engine(db_url)
+    with engine.begin() as conn:
+        conn.execute(text(MIGRATIONS_TABLE_SQL))
+        return {row[0] for row in conn.execute(text("SELECT filename FROM schema_migrations"))}
+
 def run_migration(db_url, migration_file):
-    """Run a single migration file"""
+    """Run a single migration file and record it as applied"""
     engine = create_engine(db_url)
     
     with open(migration_file, 'r') as f:
         sql_script = f.read()
     
     with engine.begin() as conn:
-        # Split by semicolon and execute each statement
-        statements = [s.strip() for s in sql_script.split(';') if s.strip()]
+        # Split into statements and execute each one
+        statements = split_sql_statements(sql_script)
         for statement in statements:
             print(f"Executing: {statement[:80]}...")
             conn.execute(text(statement))
+        conn.execute(
+            text("INSERT INTO schema_migrations (filename) VALUES (:filename)"),
+            {"filename": Path(migration_file).name}
+        )
     
     print(f"✓ Successfully ran {Path(migration_file).name}\n")
 
 def main():
     migrations_dir = Path(__file__).parent / 'migrations'
     
-    # List of migrations to run
-    migrations = [
-        'add_admin_and_submitted_songs.sql'
-    ]
-    
     print("Starting database migrations...\n")
+    applied = applied_migrations(DATABASE_URL)
     
-    for migration in migrations:
+    for migration in MIGRATIONS:
+        if migration in applied:
+            print(f"- Already applied: {migration}")
+            continue
         migration_file = migrations_dir / migration
         if migration_file.exists():
             run_migration(DATABASE_URL, migration_file)
@@ -0,0 +1,12 @@
+import asyncio
+import sys
+from app.task_queue import run_worker
+
+async def main():
+    once = "--once" in sys.argv
+    print("Running task queue worker..." + (" (draining queue once)" if once else ""))
+    await run_worker(once=once)
+    print("Done!")
+
+if __name__ == "__main__":
+    asyncio.run(main())
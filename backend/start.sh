@@ -10,14 +10,8 @@ echo "📍 Port: ${PORT:-8000}"
 echo "📍 Database URL: ${DATABASE_URL:0:30}..." # Show only first 30 chars for security
 echo "📍 Python: $(which python)"
 
-# Run database initialization
-echo "📊 Initializing database..."
-if python init_db.py; then
-    echo "✅ Database initialization successful"
-else
-    echo "❌ Database initialization failed"
-    exit 1
-fi
+# Migrations are not run here: init_db.py runs once per deploy as the
+# pre-deploy command (railway.toml) / release phase (Procfile)
 
 # Start the uvicorn server
 echo "🌐 Starting uvicorn server..."
@@ -0,0 +1,29 @@
+"""
+Shared test setup: import the app from the backend directory and point it at a
+throwaway SQLite database instead of whatever DATABASE_URL the shell has.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_dir = tempfile.mkdtemp(prefix="highlights-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+
+import pytest
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created tables, dropped again after the test"""
+    from app import models, models_users  # noqa: F401 - register every table
+    from app.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
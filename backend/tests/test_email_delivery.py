@@ -0,0 +1,155 @@
+"""
+Test cases for pooled SMTP delivery against a local SMTP stand-in.
+Run with: python -m pytest tests/test_email_delivery.py -v
+"""
+import asyncio
+import socketserver
+import threading
+from collections import Counter
+from email.message import EmailMessage
+
+import pytest
+
+from app import email_delivery, scheduler
+from app.config import get_settings
+from app.email_delivery import EmailSender, PermanentEmailError
+from app.models_users import Notification, User
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP: recipients starting with "bad" get 550, ones starting
+    with "flaky" get 451 on their first attempt, everyone else is accepted.
+    """
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        recipient = None
+        self._reply("220 stand-in ready")
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            command = line.split(" ")[0].upper()
+            if command in ("EHLO", "HELO"):
+                self._reply("250 stand-in")
+            elif command in ("MAIL", "RSET", "NOOP"):
+                self._reply("250 ok")
+            elif command == "RCPT":
+                address = line.split(":", 1)[1].strip("<> ")
+                server.rcpt_attempts[address] += 1
+                if address.startswith("bad"):
+                    self._reply("550 no such user")
+                elif address.startswith("flaky") and server.rcpt_attempts[address] == 1:
+                    self._reply("451 try again later")
+                else:
+                    recipient = address
+                    self._reply("250 ok")
+            elif command == "DATA":
+                self._reply("354 end with .")
+                while self.rfile.readline().decode().rstrip("\r\n") != ".":
+                    pass
+                server.delivered.append(recipient)
+                self._reply("250 queued")
+            elif command == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("502 not implemented")
+
+    def _reply(self, line: str):
+        self.wfile.write((line + "\r\n").encode())
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.delivered = []
+    server.rcpt_attempts = Counter()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sender(smtp_server, monkeypatch):
+    monkeypatch.setattr(email_delivery, "RETRY_BASE_SECONDS", 0)
+    sender = EmailSender("127.0.0.1", smtp_server.server_address[1], security="none", timeout=5)
+    yield sender
+    sender.close()
+
+
+def _message(to_address: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "alerts@example.test"
+    message["To"] = to_address
+    message["Subject"] = "Highlights are ready"
+    message.set_content("Watch them now.")
+    return message
+
+
+def test_batch_reuses_one_connection(sender, smtp_server):
+    first = {i: _message(f"user{i}@example.test") for i in range(3)}
+    second = {i: _message(f"user{i}@example.test") for i in range(3, 5)}
+
+    sent, failed = asyncio.run(sender.send_batch(first))
+    sent_again, failed_again = asyncio.run(sender.send_batch(second))
+
+    assert (sorted(sent), failed) == ([0, 1, 2], {})
+    assert (sorted(sent_again), failed_again) == ([3, 4], {})
+    assert len(smtp_server.delivered) == 5
+    assert smtp_server.connections == 1
+
+
+def test_transient_rejection_is_retried(sender, smtp_server):
+    messages = {1: _message("flaky@example.test"), 2: _message("user@example.test")}
+
+    sent, failed = asyncio.run(sender.send_batch(messages))
+
+    assert sorted(sent) == [1, 2]
+    assert failed == {}
+    assert smtp_server.rcpt_attempts["flaky@example.test"] == 2
+    assert smtp_server.rcpt_attempts["user@example.test"] == 1
+
+
+def test_permanent_rejection_is_not_retried(sender, smtp_server):
+    messages = {1: _message("bad@example.test"), 2: _message("user@example.test")}
+
+    sent, failed = asyncio.run(sender.send_batch(messages))
+
+    assert sent == [2]
+    assert isinstance(failed[1], PermanentEmailError)
+    assert smtp_server.rcpt_attempts["bad@example.test"] == 1
+    assert smtp_server.delivered == ["user@example.test"]
+
+
+def test_deliver_notifications_flags_rejected_addresses(db, sender, smtp_server, monkeypatch):
+    monkeypatch.setattr(get_settings(), "smtp_user", "alerts@example.test")
+    monkeypatch.setattr(get_settings(), "smtp_security", "none")
+    monkeypatch.setattr(scheduler, "get_email_sender", lambda: sender)
+    good = User(email="user@example.test")
+    bad = User(email="bad@example.test")
+    db.add_all([good, bad])
+    db.commit()
+    notifications = [
+        Notification(user_id=user.id, type="highlights_available", title="Highlights: A vs B")
+        for user in (good, bad)
+    ]
+    db.add_all(notifications)
+    db.commit()
+    ids = [notification.id for notification in notifications]
+
+    result = asyncio.run(scheduler.deliver_notifications(ids))
+    db.expire_all()
+
+    assert result == {"emailed": 1, "rejected": 1}
+    assert notifications[0].email_sent and notifications[0].email_error is None
+    assert not notifications[1].email_sent
+    assert "550" in notifications[1].email_error
+    # Neither is picked up again by a retried task
+    assert asyncio.run(scheduler.deliver_notifications(ids)) == {"emailed": 0, "rejected": 0}
+    assert smtp_server.rcpt_attempts["bad@example.test"] == 1
@@ -0,0 +1,238 @@
+"""
+Test cases for Expo push delivery against a stub push API, and the device endpoints.
+Run with: python -m pytest tests/test_push_delivery.py -v
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models, push_delivery
+from app.database import get_db
+from app.main import app
+from app.models_users import Notification, PushDevice, User
+from app.routers.auth import get_current_user
+from app.upstream_guard import GuardedTransport
+
+
+class _StubExpo:
+    """
+    Records every request. Tokens containing "dead" are answered with
+    DeviceNotRegistered, ones containing "huge" with MessageTooBig and ones in
+    rate_limited with MessageRateExceeded; requests numbered in fail_requests
+    get a 503.
+    """
+
+    def __init__(self, fail_requests=(), receipts=None):
+        self.batches = []
+        self.fail_requests = set(fail_requests)
+        self.rate_limited = set()
+        self.receipts = receipts or {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if request.url.path.endswith("/getReceipts"):
+            return httpx.Response(200, json={"data": {
+                receipt_id: self.receipts.get(receipt_id, {"status": "ok"}) for receipt_id in body["ids"]
+            }})
+        self.batches.append(body)
+        if len(self.batches) in self.fail_requests:
+            return httpx.Response(503)
+        tickets = []
+        for message in body:
+            if "dead" in message["to"]:
+                tickets.append({"status": "error", "message": "not registered",
+                                "details": {"error": "DeviceNotRegistered"}})
+            elif "huge" in message["to"]:
+                tickets.append({"status": "error", "message": "too big",
+                                "details": {"error": "MessageTooBig"}})
+            elif message["to"] in self.rate_limited:
+                tickets.append({"status": "error", "message": "slow down",
+                                "details": {"error": "MessageRateExceeded"}})
+            else:
+                tickets.append({"status": "ok", "id": f"receipt-{message['to']}"})
+        return httpx.Response(200, json={"data": tickets})
+
+
+@pytest.fixture
+def expo(monkeypatch):
+    stub = _StubExpo()
+    monkeypatch.setattr(push_delivery, "guarded_client", lambda **kwargs: httpx.AsyncClient(
+        transport=GuardedTransport(httpx.MockTransport(stub)), **kwargs
+    ))
+    return stub
+
+
+def _user_with_devices(db, email, tokens):
+    user = User(email=email)
+    db.add(user)
+    db.commit()
+    db.add_all(PushDevice(user_id=user.id, token=token) for token in tokens)
+    db.commit()
+    return user
+
+
+def _notify(db, users):
+    notifications = [Notification(user_id=user.id, type="highlights_available", title="Highlights: A vs B")
+                     for user in users]
+    db.add_all(notifications)
+    db.commit()
+    return notifications
+
+
+def _queued_receipts(db):
+    task = db.query(models.QueuedTask).filter(models.QueuedTask.task_type == "check_push_receipts").one()
+    return task.payload["receipts"]
+
+
+def test_messages_are_sent_in_batches_of_100(db, expo):
+    users = [_user_with_devices(db, f"user{i}@example.test", [f"ExponentPushToken[{i}]"]) for i in range(150)]
+    notifications = _notify(db, users)
+
+    result = asyncio.run(push_delivery.dispatch_push_notifications(db, [n.id for n in notifications]))
+    db.expire_all()
+
+    assert [len(batch) for batch in expo.batches] == [100, 50]
+    assert result == {"messages": 150, "accepted": 150, "rejected": 0, "tokens_pruned": 0}
+    assert all(notification.push_sent for notification in notifications)
+    assert len(_queued_receipts(db)) == 150
+
+
+def test_push_sent_waits_for_every_message_of_a_notification(db, expo, monkeypatch):
+    monkeypatch.setattr(push_delivery, "EXPO_BATCH_SIZE", 2)
+    expo.fail_requests = {2}
+    first = _user_with_devices(db, "first@example.test", ["ExponentPushToken[a]"])
+    straddling = _user_with_devices(db, "straddling@example.test",
+                                    ["ExponentPushToken[b1]", "ExponentPushToken[b2]"])
+    last = _user_with_devices(db, "last@example.test", ["ExponentPushToken[c]"])
+    notifications = _notify(db, [first, straddling, last])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(push_delivery.dispatch_push_notifications(db, [n.id for n in notifications]))
+    db.expire_all()
+
+    # The first batch answered one of the straddling notification's two messages
+    assert [n.push_sent for n in notifications] == [True, False, False]
+    # Accepted tickets are still checked even though the task failed
+    assert set(_queued_receipts(db).values()) == {"ExponentPushToken[a]", "ExponentPushToken[b1]"}
+
+    # The retry only sends what is still unmarked, and marks it all in one go
+    expo.fail_requests = set()
+    result = asyncio.run(push_delivery.dispatch_push_notifications(db, [n.id for n in notifications]))
+    db.expire_all()
+
+    assert result["messages"] == 3
+    assert [n.push_sent for n in notifications] == [True, True, True]
+
+
+def test_unregistered_tickets_prune_tokens(db, expo):
+    user = _user_with_devices(db, "user@example.test",
+                              ["ExponentPushToken[live]", "ExponentPushToken[dead]"])
+    notification, = _notify(db, [user])
+
+    result = asyncio.run(push_delivery.dispatch_push_notifications(db, [notification.id]))
+    db.expire_all()
+
+    assert result == {"messages": 2, "accepted": 1, "rejected": 0, "tokens_pruned": 1}
+    assert [device.token for device in db.query(PushDevice)] == ["ExponentPushToken[live]"]
+    # An unregistered device does not hold the notification back
+    assert notification.push_sent
+    assert _queued_receipts(db) == {"receipt-ExponentPushToken[live]": "ExponentPushToken[live]"}
+
+
+def test_retryable_ticket_errors_fail_the_task(db, expo):
+    ok = _user_with_devices(db, "ok@example.test", ["ExponentPushToken[ok]"])
+    limited = _user_with_devices(db, "limited@example.test", ["ExponentPushToken[limited]"])
+    notifications = _notify(db, [ok, limited])
+    expo.rate_limited = {"ExponentPushToken[limited]"}
+
+    with pytest.raises(push_delivery.TransientPushError):
+        asyncio.run(push_delivery.dispatch_push_notifications(db, [n.id for n in notifications]))
+    db.expire_all()
+
+    assert [n.push_sent for n in notifications] == [True, False]
+
+    # The task queue's retry only sends the one still pending
+    expo.rate_limited = set()
+    result = asyncio.run(push_delivery.dispatch_push_notifications(db, [n.id for n in notifications]))
+    db.expire_all()
+
+    assert result["messages"] == 1
+    assert [n.push_sent for n in notifications] == [True, True]
+
+
+def test_permanent_ticket_errors_are_recorded(db, expo):
+    user = _user_with_devices(db, "user@example.test", ["ExponentPushToken[huge]"])
+    notification, = _notify(db, [user])
+
+    result = asyncio.run(push_delivery.dispatch_push_notifications(db, [notification.id]))
+    db.expire_all()
+
+    assert result == {"messages": 1, "accepted": 0, "rejected": 1, "tokens_pruned": 0}
+    assert not notification.push_sent
+    assert notification.push_error == "MessageTooBig"
+    # Not picked up again by a retried task
+    assert asyncio.run(push_delivery.dispatch_push_notifications(db, [notification.id]))["messages"] == 0
+    assert len(expo.batches) == 1
+
+
+def test_unregistered_receipts_prune_tokens(db, expo):
+    _user_with_devices(db, "user@example.test", ["ExponentPushToken[a]", "ExponentPushToken[b]"])
+    expo.receipts = {"r-b": {"status": "error", "details": {"error": "DeviceNotRegistered"}}}
+
+    result = asyncio.run(push_delivery.check_receipts(db, {
+        "r-a": "ExponentPushToken[a]",
+        "r-b": "ExponentPushToken[b]",
+    }))
+
+    assert result == {"receipts": 2, "errors": 1, "tokens_pruned": 1}
+    assert [device.token for device in db.query(PushDevice)] == ["ExponentPushToken[a]"]
+
+
+@pytest.fixture
+def client(db):
+    user = User(email="user@example.test")
+    other = User(email="other@example.test")
+    db.add_all([user, other])
+    db.commit()
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    try:
+        yield TestClient(app), user, other
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_register_and_unregister_device(db, client):
+    client, user, other = client
+    token = "ExponentPushToken[abc]"
+
+    response = client.post("/api/me/devices", json={"token": token, "platform": "ios"})
+    assert response.status_code == 200
+    assert (response.json()["user_id"], response.json()["platform"]) == (user.id, "ios")
+
+    # Registering again keeps one row and the known platform
+    again = client.post("/api/me/devices", json={"token": token})
+    assert again.json()["id"] == response.json()["id"]
+    assert again.json()["platform"] == "ios"
+
+    assert client.post("/api/me/devices", json={"token": "not-a-token"}).status_code == 400
+
+    assert client.delete(f"/api/me/devices/{token}").status_code == 200
+    assert client.delete(f"/api/me/devices/{token}").status_code == 404
+    assert db.query(PushDevice).count() == 0
+
+
+def test_registered_token_moves_to_the_signed_in_user(db, client):
+    client, user, other = client
+    token = "ExponentPushToken[shared]"
+    db.add(PushDevice(user_id=other.id, token=token, platform="android"))
+    db.commit()
+
+    response = client.post("/api/me/devices", json={"token": token})
+
+    assert response.json()["user_id"] == user.id
+    assert response.json()["platform"] == "android"
+    assert db.query(PushDevice).count() == 1
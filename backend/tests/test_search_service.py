@@ -0,0 +1,26 @@
+"""
+Test cases for search term tokenization.
+Run with: python -m pytest tests/test_search_service.py -v
+"""
+from app.search_service import _tokenize
+
+
+def test_latin_terms_split_on_whitespace_and_punctuation():
+    assert _tokenize("Tum Hi Ho, (Aashiqui-2)") == ["tum", "hi", "ho", "aashiqui", "2"]
+
+
+def test_accents_stay_in_the_word():
+    assert _tokenize("Beyoncé Déjà vu") == ["beyoncé", "déjà", "vu"]
+
+
+def test_devanagari_vowel_signs_stay_in_the_word():
+    assert _tokenize("तुम ही हो") == ["तुम", "ही", "हो"]
+
+
+def test_tamil_vowel_signs_and_virama_stay_in_the_word():
+    assert _tokenize("கண்ணே கலைமானே") == ["கண்ணே", "கலைமானே"]
+
+
+def test_underscores_and_empty_terms():
+    assert _tokenize("a_b") == ["a", "b"]
+    assert _tokenize("  ,;  ") == []
@@ -0,0 +1,173 @@
+"""
+Test cases for WebSub subscription handling and pushed notifications.
+Run with: python -m pytest tests/test_websub.py -v
+"""
+import asyncio
+import hashlib
+import hmac
+from datetime import date, datetime, timedelta
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from app import models, websub
+from app.config import get_settings
+from app.upstream_guard import GuardedTransport
+
+CHANNEL_ID = "UCG5qGWdu8nIRZqJ_GgDwQ-w"  # Premier League Official
+SECRET = "s3cret"
+
+
+@pytest.fixture
+def subscription(db):
+    row = models.WebSubSubscription(
+        channel_id=CHANNEL_ID,
+        topic_url=websub.TOPIC_URL.format(channel_id=CHANNEL_ID),
+        secret=SECRET,
+        status="pending",
+    )
+    db.add(row)
+    db.commit()
+    return row
+
+
+def _sign(body: bytes, secret: str = SECRET) -> str:
+    return "sha1=" + hmac.new(secret.encode(), body, hashlib.sha1).hexdigest()
+
+
+def test_verify_intent_echoes_challenge_and_records_lease(db, subscription):
+    challenge = websub.verify_intent(db, CHANNEL_ID, "subscribe", subscription.topic_url, "abc123", 3600)
+
+    assert challenge == "abc123"
+    db.refresh(subscription)
+    assert subscription.status == "verified"
+    lease = subscription.lease_expires_at - subscription.verified_at
+    assert lease == timedelta(seconds=3600)
+
+
+def test_verify_intent_records_denial(db, subscription):
+    result = websub.verify_intent(db, CHANNEL_ID, "denied", subscription.topic_url, None, None, "topic not allowed")
+
+    assert result is None
+    db.refresh(subscription)
+    assert subscription.status == "denied"
+    assert subscription.last_error == "topic not allowed"
+
+
+def test_verify_intent_rejects_unknown_topic_and_channel(db, subscription):
+    other_topic = websub.TOPIC_URL.format(channel_id="UCsomeoneelse")
+
+    assert websub.verify_intent(db, CHANNEL_ID, "subscribe", other_topic, "abc", 3600) is None
+    assert websub.verify_intent(db, "UCsomeoneelse", "subscribe", other_topic, "abc", 3600) is None
+    assert websub.verify_intent(db, CHANNEL_ID, "unsubscribe", subscription.topic_url, "abc", None) is None
+    db.refresh(subscription)
+    assert subscription.status == "pending"
+
+
+def test_signature_valid():
+    body = b"<feed/>"
+
+    assert websub.signature_valid(SECRET, body, _sign(body))
+    assert websub.signature_valid(
+        SECRET, body, "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest()
+    )
+    assert not websub.signature_valid(SECRET, body, _sign(body, "wrong"))
+    assert not websub.signature_valid(SECRET, body + b" ", _sign(body))
+    assert not websub.signature_valid(SECRET, body, "md5=" + hashlib.md5(body).hexdigest())
+    assert not websub.signature_valid(SECRET, body, None)
+    assert not websub.signature_valid(SECRET, body, "garbage")
+
+
+def _atom_feed(video_id: str, title: str, published: datetime) -> bytes:
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">
+  <link rel="hub" href="https://pubsubhubbub.appspot.com"/>
+  <title>YouTube video feed</title>
+  <entry>
+    <id>yt:video:{video_id}</id>
+    <yt:videoId>{video_id}</yt:videoId>
+    <yt:channelId>{CHANNEL_ID}</yt:channelId>
+    <title>{title}</title>
+    <link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>
+    <author><name>Premier League</name></author>
+    <published>{published.isoformat()}+00:00</published>
+    <updated>{published.isoformat()}+00:00</updated>
+  </entry>
+</feed>""".encode()
+
+
+@pytest.fixture
+def awaiting_match(db):
+    league = models.League(name="Premier League", slug="premier-league")
+    db.add(league)
+    db.commit()
+    match = models.Match(
+        league_id=league.id, home_team="Arsenal", away_team="Chelsea",
+        home_score=2, away_score=1, match_date=date.today(), status="finished",
+    )
+    db.add(match)
+    db.commit()
+    return match
+
+
+def test_handle_notification_attaches_signed_push(db, subscription, awaiting_match):
+    body = _atom_feed("vid00000001", "Arsenal vs Chelsea | Highlights", datetime.utcnow())
+
+    added = asyncio.run(websub.handle_notification(db, CHANNEL_ID, body, _sign(body)))
+
+    assert added == 1
+    highlight = db.query(models.Highlight).filter(models.Highlight.match_id == awaiting_match.id).one()
+    assert highlight.youtube_video_id == "vid00000001"
+    assert db.query(models.ChannelVideo).filter(models.ChannelVideo.source == "websub").count() == 1
+    db.refresh(subscription)
+    assert subscription.last_notification_at is not None
+
+
+def test_handle_notification_drops_bad_signature(db, subscription, awaiting_match):
+    body = _atom_feed("vid00000001", "Arsenal vs Chelsea | Highlights", datetime.utcnow())
+
+    added = asyncio.run(websub.handle_notification(db, CHANNEL_ID, body, _sign(body, "forged")))
+
+    assert added == 0
+    assert db.query(models.Highlight).count() == 0
+    assert db.query(models.ChannelVideo).count() == 0
+
+
+def test_renew_subscriptions_against_stub_hub(db, monkeypatch):
+    failing_channel = "UCfailingchannel"
+    requests = []
+
+    def hub(request: httpx.Request) -> httpx.Response:
+        form = {key: values[0] for key, values in parse_qs(request.content.decode()).items()}
+        requests.append(form)
+        if failing_channel in form["hub.topic"]:
+            return httpx.Response(500, text="hub error")
+        return httpx.Response(202)
+
+    monkeypatch.setattr(get_settings(), "websub_callback_url", "https://api.example.test/api/websub/callback")
+    monkeypatch.setattr(websub, "subscription_channel_ids", lambda: [CHANNEL_ID, failing_channel])
+    monkeypatch.setattr(websub, "guarded_client", lambda **kwargs: httpx.AsyncClient(
+        transport=GuardedTransport(httpx.MockTransport(hub)), **kwargs
+    ))
+
+    result = asyncio.run(websub.renew_subscriptions(db))
+
+    assert result == {"enabled": True, "requested": 1, "failed": 1}
+    ok = db.query(models.WebSubSubscription).filter(models.WebSubSubscription.channel_id == CHANNEL_ID).one()
+    assert ok.status == "pending"
+    assert requests[0]["hub.mode"] == "subscribe"
+    assert requests[0]["hub.topic"] == ok.topic_url
+    assert requests[0]["hub.callback"] == f"https://api.example.test/api/websub/callback?channel_id={CHANNEL_ID}"
+    assert requests[0]["hub.secret"] == ok.secret
+    failed = db.query(models.WebSubSubscription).filter(
+        models.WebSubSubscription.channel_id == failing_channel
+    ).one()
+    assert failed.status == "failed"
+    assert "500" in failed.last_error
+
+    # A verified lease far from expiry is left alone; the failed one is retried
+    websub.verify_intent(db, CHANNEL_ID, "subscribe", ok.topic_url, "c", websub.LEASE_SECONDS)
+    requests.clear()
+    asyncio.run(websub.renew_subscriptions(db))
+    assert [form["hub.topic"] for form in requests] == [failed.topic_url]